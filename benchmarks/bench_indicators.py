@@ -0,0 +1,107 @@
+"""Technical indicators benchmark.
+
+Computes every indicator of common.indicators on synthesized minute candles (a
+million rows by default, about two years of minutes) and prints time of each.
+Simple moving average and RSI are compared with plain Python loops over part of
+the series. Fails (exit code 1) when all indicators together take longer than
+target.
+
+    python benchmarks/bench_indicators.py [--rows 1000000] [--target 2.0]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from moonbag.common import indicators  # noqa: E402
+
+TARGET = 2.0  # seconds for all indicators of --rows candles
+LOOP_ROWS = 100_000  # python loops are measured on this many rows and scaled
+
+
+def synthesize(rows, seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 30_000 * np.exp(rng.normal(0, 0.0005, rows).cumsum())
+    spread = np.abs(rng.normal(0, 0.0005, rows)) * close
+    return pd.DataFrame(
+        {
+            "time": 1_600_000_000 + 60 * np.arange(rows, dtype="int64"),
+            "open": np.concatenate([[close[0]], close[:-1]]),
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+        }
+    )
+
+
+def loop_sma(close, window=20):
+    out = [float("nan")] * len(close)
+    for i in range(window - 1, len(close)):
+        out[i] = sum(close[i - window + 1 : i + 1]) / window
+    return out
+
+
+def loop_rsi(close, period=14):
+    gain = loss = 0.0
+    out = [float("nan")] * len(close)
+    for i in range(1, len(close)):
+        change = close[i] - close[i - 1]
+        gain += (max(change, 0) - gain) / period
+        loss += (max(-change, 0) - loss) / period
+        if i >= period:
+            out[i] = 100 - 100 / (1 + gain / loss) if loss else 100.0
+    return out
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--target", type=float, default=TARGET)
+    args = parser.parse_args()
+
+    df = synthesize(args.rows)
+    close, high, low = df["close"], df["high"], df["low"]
+    cases = {
+        "sma": (indicators.sma, close, 20),
+        "ema": (indicators.ema, close, 20),
+        "rsi": (indicators.rsi, close, 14),
+        "macd": (indicators.macd, close),
+        "bollinger": (indicators.bollinger, close, 20),
+        "atr": (indicators.atr, high, low, close, 14),
+        "volatility": (indicators.volatility, close, 30, 365 * 24 * 60),
+        "add_indicators": (indicators.add_indicators, df, 365 * 24 * 60),
+    }
+    print(f"{args.rows} minute candles")
+    total = 0.0
+    for name, (func, *func_args) in cases.items():
+        elapsed = min(timed(func, *func_args) for _ in range(3))
+        if name != "add_indicators":
+            total += elapsed
+        print(f"  {name:<15} {elapsed * 1000:8.1f}ms")
+
+    scale = args.rows / LOOP_ROWS
+    values = close.to_list()[:LOOP_ROWS]
+    for name, func in (("sma", loop_sma), ("rsi", loop_rsi)):
+        elapsed = timed(func, values) * scale
+        print(f"  {name:<15} {elapsed * 1000:8.1f}ms  python loop (scaled)")
+
+    print(f"  {'all':<15} {total * 1000:8.1f}ms")
+    if total > args.target:
+        print(f"\nFAILED: indicators took more than {args.target:.1f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
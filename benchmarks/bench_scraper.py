@@ -0,0 +1,237 @@
+"""CoinGecko scraping benchmark.
+
+Parses html of scraped CoinGecko pages with full BeautifulSoup tree (as it was done
+before) and with selective table parser, and runs Overview views on them with
+network replaced by the page (first and cached call). Pages are read from
+fixtures directory (<page>.html, e.g. saved from
+https://www.coingecko.com/en/categories), missing ones are synthesized with
+realistic size and layout. Synthesized pages only approximate real ones, so save
+real pages to the fixtures directory for numbers that match production. Then shows
+how view time depends on `-n` and on number of rows on page. Fails (exit code 1)
+when both parsers don't return the same rows.
+
+    python benchmarks/bench_scraper.py [--fixtures DIR] [--rows 100] [--runs 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bs4 import BeautifulSoup  # noqa: E402
+from moonbag.gecko import gecko  # noqa: E402
+from moonbag.gecko.scraper import clear_views, parse_table, views_size  # noqa: E402
+
+# page name -> (url, Overview method, cells of synthesized row)
+PAGES = {
+    "categories": (
+        "https://www.coingecko.com/en/categories",
+        "get_top_crypto_categories",
+        lambda i: [
+            i,
+            "Decentralized Finance",
+            "1.2%",
+            "-0.5%",
+            "7.1%",
+            "$1,234,567",
+            "$98,765",
+            120,
+        ],
+    ),
+    "recently_added": (
+        "https://www.coingecko.com/en/coins/recently_added",
+        "get_recently_added_coins",
+        lambda i: [
+            f"Coin {i}",
+            f"C{i}",
+            "Buy",
+            "$0.0123",
+            "1.2%",
+            "-3.4%",
+            "$12,345",
+            "$678",
+            "2 days ago",
+        ],
+    ),
+    "stablecoins": (
+        "https://www.coingecko.com/en/stablecoins",
+        "get_stable_coins",
+        lambda i: [
+            i,
+            f"Stable {i}",
+            f"USD{i}",
+            "$1.00",
+            "$123,456",
+            42,
+            "$9,876,543",
+            "0.1%",
+        ],
+    ),
+    "yield_farms": (
+        "https://www.coingecko.com/en/yield-farming",
+        "get_yield_farms",
+        lambda i: [
+            i,
+            f"Farm {i}",
+            "Pool",
+            1,
+            "CertiK",
+            "ETH",
+            "USDC",
+            "x",
+            "$1,000,000",
+            "10%",
+            "0.01%",
+            "a",
+            "b",
+        ],
+    ),
+    "top_dexes": (
+        "https://www.coingecko.com/en/dex",
+        "get_top_dexes",
+        lambda i: [
+            i,
+            f"Dex {i}",
+            "(v2)",
+            "$1,234,567",
+            120,
+            400,
+            "1.2M",
+            "ETH/USDC$1,234",
+            "12.3%",
+        ],
+    ),
+    "nft": (
+        "https://www.coingecko.com/en/nft",
+        "get_top_nfts",
+        lambda i: [
+            i,
+            f"NFT {i}",
+            f"N{i}",
+            "Buy",
+            "$1.23",
+            "1.2%",
+            "-3.4%",
+            "7.1%",
+            "$12,345",
+            "$678,910",
+        ],
+    ),
+}
+
+
+def synthesize(cells, rows, seed=0) -> str:
+    """Page with table of `rows` rows and bulk of CoinGecko page around it:
+    inline scripts, navigation, svg icons, footer"""
+    rnd = random.Random(seed)
+    noise = "".join(
+        f'<div class="tw-flex nav-{i}"><a href="/en/x/{i}"><svg viewBox="0 0 24 24">'
+        f'<path d="M{rnd.random():.6f} {rnd.random():.6f}"/></svg>Item {i}</a></div>\n'
+        for i in range(1500)
+    )
+    script = "<script>window.__DATA__ = %s;</script>\n" % (
+        "[" + ",".join(str(rnd.random()) for _ in range(20000)) + "]"
+    )
+    body = []
+    for i in range(1, rows + 1):
+        row = cells(i)
+        tds = "\n".join(
+            (
+                f'<td class="td-{j}">\n<a href="/en/coins/coin-{i}">{c}</a>\n</td>'
+                if j == 1
+                else f'<td class="td-{j}">\n<span data-v="{c}">{c}</span>\n</td>'
+            )
+            for j, c in enumerate(row)
+        )
+        body.append(f"<tr>\n{tds}\n</tr>")
+    table = "<table><thead><tr><th>#</th></tr></thead><tbody>\n%s\n</tbody></table>" % (
+        "\n".join(body)
+    )
+    return (
+        f"<html><head>{script}</head><body>{noise}<main>{table}</main>"
+        f"<footer>{noise}</footer>{script}</body></html>"
+    )
+
+
+def soup_table(html):
+    rows = BeautifulSoup(html, features="lxml").find("tbody").find_all("tr")
+    return [r.text for r in rows], [r.find("a")["href"] for r in rows]
+
+
+def median_time(func, *args, runs=5) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run_view(method, html, cached=False, n=None):
+    if not cached:
+        clear_views()
+    response = mock.Mock(text=html)
+    with mock.patch.object(gecko.transport, "get", return_value=response):
+        return getattr(gecko.Overview(), method)(n=n)
+
+
+def scaling(runs):
+    """Time of categories view by page size (rows) and `n`"""
+    url, method, cells = PAGES["categories"]
+    limits = [5, 20, 100, None]
+    print("\ncategories view by rows on page and -n")
+    print(f"{'rows':>8}" + "".join(f"{'n=' + str(n):>10}" for n in limits))
+    for rows in (100, 1000, 5000):
+        html = synthesize(cells, rows)
+        times = [
+            median_time(run_view, method, html, False, n, runs=runs) for n in limits
+        ]
+        print(f"{rows:>8}" + "".join(f"{t * 1000:>8.1f}ms" for t in times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--fixtures", default=os.path.join(ROOT, "benchmarks", "fixtures")
+    )
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'page':<16}{'size':>9}{'soup':>10}{'table':>10}{'view':>10}{'cached':>10}")
+    for page, (url, method, cells) in PAGES.items():
+        path = os.path.join(args.fixtures, f"{page}.html")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                html = f.read()
+        else:
+            html = synthesize(cells, args.rows)
+
+        table = parse_table(html)
+        if (table.texts, table.links) != soup_table(html):
+            print(f"{page}: selective parser returned different rows")
+            failed = True
+        old = median_time(soup_table, html, runs=args.runs)
+        new = median_time(parse_table, html, runs=args.runs)
+        view = median_time(run_view, method, html, runs=args.runs)
+        cached = median_time(run_view, method, html, True, runs=args.runs)
+        print(
+            f"{page:<16}{len(html) / 1024:>7.0f}kB{old * 1000:>8.1f}ms"
+            f"{new * 1000:>8.1f}ms{view * 1000:>8.1f}ms{cached * 1000:>8.2f}ms"
+        )
+
+    print(f"\ncached views: {views_size() / 1024:.0f}kB")
+    scaling(args.runs)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Fuzzy coin search benchmark.
+
+Builds fuzzy index over synthesized list of coin ids (size of CoinGecko list and
+bigger) and measures median time of `similar` lookup, compared with difflib that was
+used before. Fails (exit code 1) when median lookup is above target.
+
+    python benchmarks/bench_similar.py [--coins 10000] [--target 0.005]
+"""
+
+import argparse
+import difflib
+import os
+import random
+import statistics
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from moonbag.common.fuzzy import FuzzyIndex  # noqa: E402
+
+TARGET = 0.005  # seconds per lookup
+QUERIES = ["bitcoin", "etherium", "uniswp", "doge", "polkadot", "shib", "xrp", "aave"]
+
+
+def synthesize(count, seed=0) -> list:
+    rnd = random.Random(seed)
+    words = [
+        "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(3, 9)))
+        for _ in range(2000)
+    ]
+    suffixes = ["", "-token", "-finance", "-protocol", "-2", "-dao", "-swap"]
+    ids = {q for q in QUERIES}
+    while len(ids) < count:
+        parts = rnd.randint(1, 2)
+        ids.add("-".join(rnd.choices(words, k=parts)) + rnd.choice(suffixes))
+    return sorted(ids)
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coins", type=int, default=10000)
+    parser.add_argument("--target", type=float, default=TARGET)
+    args = parser.parse_args()
+
+    failed = False
+    for count in (args.coins, args.coins * 5):
+        coins = synthesize(count)
+        build = timed(FuzzyIndex, coins)
+        index = FuzzyIndex(coins)
+        lookups = [timed(index.matches, q, 10) for q in QUERIES for _ in range(5)]
+        median = statistics.median(lookups)
+        old = statistics.median(
+            timed(difflib.get_close_matches, q, coins, 10) for q in QUERIES[:3]
+        )
+        print(
+            f"{count:>7} coins  index build {build:.3f}s  lookup median {median * 1000:.2f}ms"
+            f"  max {max(lookups) * 1000:.2f}ms  (difflib {old * 1000:.0f}ms)"
+        )
+        failed = failed or (count == args.coins and median > args.target)
+
+    if failed:
+        print(f"\nFAILED: lookup is above target {args.target * 1000:.1f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
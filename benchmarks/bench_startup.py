@@ -0,0 +1,73 @@
+"""Cold start benchmark of moonbag terminal.
+
+Starts `moon.py` in fresh interpreter, answers the first prompt with `q` and measures
+wall time till process exits. Fails (exit code 1) when median is above target.
+Additionally measures how long it takes to import each submenu.
+
+    python benchmarks/bench_startup.py [--runs 10] [--target 0.5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGET = 0.5  # seconds from start of interpreter to first prompt (and exit)
+
+MENUS = [
+    "moonbag.onchain.ethereum.menu",
+    "moonbag.onchain.terraluna.menu",
+    "moonbag.cryptocompare.menu",
+    "moonbag.gecko.coin_menu",
+    "moonbag.gecko.overview_menu",
+    "moonbag.paprika.menu",
+    "moonbag.discover.menu",
+]
+
+
+def timed_run(args, stdin=None) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, *args],
+        input=stdin,
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True,
+        text=True,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--target", type=float, default=TARGET)
+    args = parser.parse_args()
+
+    baseline = statistics.median(timed_run(["-c", "pass"]) for _ in range(args.runs))
+    startup = [timed_run(["moon.py"], stdin="q\n") for _ in range(args.runs)]
+    median = statistics.median(startup)
+
+    print(f"python -c pass       median {baseline:.3f}s")
+    print(
+        f"moon.py first prompt median {median:.3f}s  min {min(startup):.3f}s  "
+        f"max {max(startup):.3f}s  (target {args.target:.3f}s)"
+    )
+    print("\nfirst use of submenu (import time):")
+    for module in MENUS:
+        elapsed = statistics.median(
+            timed_run(["-c", f"import {module}"]) for _ in range(3)
+        )
+        print(f"  {module:<35} {elapsed:.3f}s")
+
+    if median > args.target:
+        print(f"\nFAILED: startup {median:.3f}s is above target {args.target:.3f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,12 @@ import sys
 import os
 import argparse
 import logging
+import datetime
+import importlib
 from argparse import ArgumentError
-from moonbag.common import LOGO, MOON
-from moonbag.onchain.ethereum import menu as eth_menu
-from moonbag.onchain.terraluna import menu as terra_menu
-from moonbag.cryptocompare import menu as cc_menu
-from moonbag.gecko import coin_menu as coin_menu
-from moonbag.gecko import overview_menu as overview_menu
-from moonbag.paprika import menu as paprika_menu
-from moonbag.discover import menu as disc_menu
+from inspect import signature
+from moonbag.common import LOGO, MOON, print_table
+from moonbag.common.cache import get_cache
 
 logger = logging.getLogger("main-menu")
 
@@ -33,23 +30,104 @@ def help():
     print("   ethereum       explore on-chain data for ethereum [Ethplorer]")
     print("   terra          explore on-chain data for terra  [TerraAPI]")
     print("")
+    print("Other        ")
+    print("   cache          show local cache stats or clear it: cache [stats|clear]")
+    print("   health         show state of providers (circuit breakers)")
+    print("")
 
 
-mapper = {
-    "ethereum" : eth_menu.main,
-    "terra" : terra_menu.main,
-    "compare" : cc_menu.main,
-    "gecko_coin" : coin_menu.main,
-    "gecko_view" : overview_menu.main,
-    "paprika" : paprika_menu.main,
-    "discover" : disc_menu.main,
+def cache_view(args):
+    parser = argparse.ArgumentParser(
+        prog="cache", add_help=True, description="Show stats or clear local cache"
+    )
+    parser.add_argument(
+        "action",
+        nargs="?",
+        choices=["stats", "clear"],
+        default="stats",
+        help="stats or clear",
+    )
+    parser.add_argument(
+        "--expired",
+        action="store_true",
+        default=False,
+        help="clear only expired entries",
+    )
+    parsy, _ = parser.parse_known_args(args)
+    import pandas as pd
+
+    cache = get_cache()
+    if parsy.action == "clear":
+        removed = cache.clear(expired_only=parsy.expired)
+        print(f"Removed {removed} entries from cache\n")
+        return
+    df = pd.Series(cache.stats()).to_frame().reset_index()
+    df.columns = ["Metric", "Value"]
+    print_table(df)
+
+
+def health_view(args):
+    parser = argparse.ArgumentParser(
+        prog="health",
+        add_help=True,
+        description="Show state of circuit breakers of all used hosts",
+    )
+    parser.add_argument(
+        "-e",
+        "--events",
+        action="store",
+        dest="events",
+        type=int,
+        default=10,
+        help="number of last state changes to show",
+    )
+    parsy, _ = parser.parse_known_args(args)
+    import pandas as pd
+    from moonbag.common.transport import get_session
+
+    breakers = get_session().breakers
+    status = breakers.status()
+    if not status:
+        print("No requests were made yet\n")
+        return
+    print_table(pd.DataFrame(status).fillna(""))
+
+    events = list(breakers.events)[-parsy.events :] if parsy.events > 0 else []
+    if events:
+        df = pd.DataFrame(events).fillna("")
+        df["time"] = df["time"].apply(
+            lambda x: datetime.datetime.fromtimestamp(x).strftime("%H:%M:%S")
+        )
+        print("State changes:")
+        print_table(df)
+
+
+def lazy_menu(module):
+    """Menu modules (and pandas, praw, provider clients they use) are imported
+    when menu is entered for the first time, so main prompt shows up quickly"""
+
+    def main():
+        return importlib.import_module(module).main()
+
+    return main
 
 
+mapper = {
+    "ethereum" : lazy_menu("moonbag.onchain.ethereum.menu"),
+    "terra" : lazy_menu("moonbag.onchain.terraluna.menu"),
+    "compare" : lazy_menu("moonbag.cryptocompare.menu"),
+    "gecko_coin" : lazy_menu("moonbag.gecko.coin_menu"),
+    "gecko_view" : lazy_menu("moonbag.gecko.overview_menu"),
+    "paprika" : lazy_menu("moonbag.paprika.menu"),
+    "discover" : lazy_menu("moonbag.discover.menu"),
+    "cache" : cache_view,
+    "health" : health_view,
+
 }
 
 
 def main():
-    choices = ["help", "exit", "quit", "r", "q", "terra", "ethereum", "paprika","gecko_coin", "gecko_view", "compare", "discover"]
+    choices = ["help", "exit", "quit", "r", "q", "terra", "ethereum", "paprika","gecko_coin", "gecko_view", "compare", "discover", "cache", "health"]
     if sys.platform == "win32":
         os.system("")
 
@@ -106,6 +184,12 @@ def main():
         if view is None:
             continue
         elif callable(view):
+            if len(signature(view).parameters) > 0:
+                try:
+                    view(others)
+                except SystemExit:
+                    print("")
+                continue
             print(f"Going to {cmd}")
             menu = view()
         else:
@@ -1,4 +1,3 @@
-import pandas as pd
 from tabulate import tabulate
 
 
@@ -16,7 +15,9 @@ LOGO = """
 """
 
 
-def print_table(df: pd.DataFrame, floatfmt=".4f", tablefmt="psql"):  # pragma: no cover
+def print_table(df: "pd.DataFrame", floatfmt=".4f", tablefmt="psql"):  # pragma: no cover
+    import pandas as pd  # imported here to keep startup of main menu fast
+
     if not isinstance(df, pd.DataFrame):
         raise TypeError("Please use data frame as an input!")
     print(
@@ -0,0 +1,142 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from moonbag.common.transport import get_host
+
+logger = logging.getLogger("aio")
+
+MAX_WORKERS = 32  # threads that execute blocking http calls
+HOST_CONCURRENCY = 4  # default number of concurrent calls to single host
+
+# Number of concurrent calls allowed per host
+HOST_LIMITS = {
+    "min-api.cryptocompare.com": 8,
+    "api.coingecko.com": 4,
+    "www.coingecko.com": 4,
+    "api.coinpaprika.com": 8,
+    "api.ethplorer.io": 2,
+    "fcd.terra.dev": 4,
+    "api.thegraph.com": 4,
+    "graphql.bitquery.io": 2,
+    "api.pushshift.io": 4,
+}
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="moonbag")
+
+# semaphores are bound to event loop, so they are kept per loop
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def host_semaphore(host: str) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphores = _semaphores.setdefault(loop, {})
+    if host not in semaphores:
+        semaphores[host] = asyncio.BoundedSemaphore(
+            HOST_LIMITS.get(host, HOST_CONCURRENCY)
+        )
+    return semaphores[host]
+
+
+async def run_blocking(func, *args, host=None, **kwargs):
+    """Run blocking function in worker thread. If host is given, at most
+    HOST_LIMITS[host] calls to that host are executed at the same time"""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    if host is None:
+        return await loop.run_in_executor(_executor, call)
+    async with host_semaphore(host):
+        return await loop.run_in_executor(_executor, call)
+
+
+def run(coro):
+    """Run coroutine from synchronous code and return its result"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Already inside running loop (e.g. notebook), so run it in separate thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+async def gather_calls(func, calls, host=None, return_exceptions=False):
+    """Call func concurrently for every element of calls.
+    Element can be tuple of positional args, dict of kwargs or single argument"""
+    tasks = []
+    for call in calls:
+        if isinstance(call, dict):
+            tasks.append(run_blocking(func, host=host, **call))
+        elif isinstance(call, tuple):
+            tasks.append(run_blocking(func, *call, host=host))
+        else:
+            tasks.append(run_blocking(func, call, host=host))
+    return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+
+def fan_out(func, calls, host=None, return_exceptions=False, partial=False) -> list:
+    """Synchronous version of gather_calls. Results are returned in order of calls.
+    With partial=True failed calls (e.g. the ones that hit command deadline) are
+    logged and left out, exception is raised only when every call failed"""
+    results = run(gather_calls(func, calls, host, return_exceptions or partial))
+    if not partial:
+        return results
+    failed = [r for r in results if isinstance(r, Exception)]
+    for e in failed:
+        logger.warning(f"{getattr(func, '__name__', func)} failed: {e!r}")
+    if failed and len(failed) == len(results):
+        raise failed[0]
+    return [r for r in results if not isinstance(r, Exception)]
+
+
+def _async_name(name: str) -> str:
+    stripped = name.lstrip("_")
+    return name[: len(name) - len(stripped)] + "a" + stripped
+
+
+def _host_of(instance, args, host):
+    if host:
+        return host
+    if args and isinstance(args[0], str) and args[0].startswith("http"):
+        return get_host(args[0])
+    base_url = getattr(instance, "BASE_URL", None)
+    return get_host(base_url) if base_url else None
+
+
+def _make_async(method, host, bound=True):
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        func = functools.partial(method, self) if bound else method
+        return await run_blocking(
+            func, *args, host=_host_of(self, args, host), **kwargs
+        )
+
+    return wrapper
+
+
+def async_methods(prefixes=("_get_",), host=None):
+    """Class decorator that adds async version of every method that starts with one
+    of prefixes, e.g. `_get_price` -> `_aget_price`, `run_query` -> `arun_query`.
+
+    Async methods run synchronous ones in worker threads and share per host
+    concurrency limits, so they can be awaited together with asyncio.gather.
+    Host is taken from `host` argument, url passed as first argument or BASE_URL.
+    """
+
+    def decorator(cls):
+        for name in dir(cls):
+            if not name.startswith(tuple(prefixes)):
+                continue
+            method = getattr(cls, name)
+            async_name = _async_name(name)
+            if callable(method) and not hasattr(cls, async_name):
+                bound = not isinstance(
+                    inspect.getattr_static(cls, name), (staticmethod, classmethod)
+                )
+                setattr(cls, async_name, _make_async(method, host, bound))
+        return cls
+
+    return decorator
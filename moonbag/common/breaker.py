@@ -0,0 +1,171 @@
+import collections
+import logging
+import os
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger("breaker")
+
+# consecutive failures after which host is cut off
+FAILURE_THRESHOLD = int(os.getenv("MOONBAG_BREAKER_THRESHOLD", "5"))
+# seconds after which open circuit lets single probe request through
+RECOVERY_TIMEOUT = float(os.getenv("MOONBAG_BREAKER_RECOVERY", "60"))
+MAX_EVENTS = 100  # number of remembered state changes
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpen(requests.exceptions.ConnectionError):
+    """Host is marked as unavailable, request wasn't sent"""
+
+
+class CircuitBreaker:
+    """Circuit breaker of single host.
+
+    closed - requests go through, consecutive failures are counted.
+    open - after `failure_threshold` failures in a row requests are rejected
+        immediately for `recovery_timeout` seconds.
+    half-open - after that time single probe request is let through, its success
+        closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        host,
+        failure_threshold=FAILURE_THRESHOLD,
+        recovery_timeout=RECOVERY_TIMEOUT,
+        clock=time.time,
+        on_change=None,
+    ):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.total_failures = 0
+        self.total_calls = 0
+        self.opened_at = None
+        self.last_error = None
+        self._state = CLOSED
+        self._probing = False
+        self._clock = clock
+        self._on_change = on_change
+        self._lock = threading.Lock()
+
+    def _set_state(self, state):
+        if state == self._state:
+            return
+        logger.warning(f"{self.host}: circuit {self._state} -> {state}")
+        if self._on_change:
+            self._on_change(self.host, self._state, state, self.last_error)
+        self._state = state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (
+                self._state == OPEN
+                and self._clock() - self.opened_at >= self.recovery_timeout
+            ):
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Check if request can be sent. In half-open state only one probe is allowed
+        at a time"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if self._clock() - self.opened_at < self.recovery_timeout:
+                    return False
+                self._set_state(HALF_OPEN)
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.total_calls += 1
+            self.failures = 0
+            self._probing = False
+            self._set_state(CLOSED)
+
+    def release(self):
+        """End probe without result, e.g. when request was cut short by caller"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self.total_calls += 1
+            self.total_failures += 1
+            self.failures += 1
+            self.last_error = error
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._probing = False
+                self.opened_at = self._clock()
+                self._set_state(OPEN)
+
+    def retry_in(self) -> float:
+        """Seconds till open circuit lets probe request through"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self.opened_at + self.recovery_timeout - self._clock())
+
+
+class Breakers:
+    """Circuit breakers of all hosts used in session, created on first request"""
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD):
+        self.failure_threshold = failure_threshold
+        self.thresholds = {}
+        self.events = collections.deque(maxlen=MAX_EVENTS)
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def configure_host(self, host, failure_threshold):
+        self.thresholds[host] = failure_threshold
+
+    def _record_event(self, host, old, new, error):
+        self.events.append(
+            {
+                "time": time.time(),
+                "host": host,
+                "from": old,
+                "to": new,
+                "error": error,
+            }
+        )
+
+    def get(self, host) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(
+                    host,
+                    self.thresholds.get(host, self.failure_threshold),
+                    on_change=self._record_event,
+                )
+            return self._breakers[host]
+
+    def status(self) -> list:
+        """State of every host's circuit as list of dicts"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [
+            {
+                "host": b.host,
+                "state": b.state,
+                "calls": b.total_calls,
+                "failures": b.total_failures,
+                "failures_in_row": b.failures,
+                "retry_in": round(b.retry_in(), 1),
+                "last_error": b.last_error,
+            }
+            for b in breakers
+        ]
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+logger = logging.getLogger("cache")
+
+DATA_DIR = os.getenv("MOONBAG_DATA_DIR") or os.path.join(
+    os.path.expanduser("~"), ".moonbag"
+)
+CACHE_ENABLED = os.getenv("MOONBAG_CACHE", "1") not in ("0", "false", "False")
+CACHE_FILE = "http_cache.sqlite"
+MAX_CACHE_SIZE = 256 * 1024 * 1024  # bytes of compressed bodies kept on disk
+
+
+def data_path(*parts) -> str:
+    """Path to file in moonbag data directory, directory is created if missing"""
+    path = os.path.join(DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def load_json(path):
+    """Read json file, None if it's missing or broken"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.info(f"Couldn't read {path}: {e}")
+        return None
+
+
+def dump_json(path, data):
+    """Write json file atomically, readers never see half written file"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def make_key(method: str, url: str, body=None, headers=None) -> str:
+    """Cache key of request. `url` should already contain encoded query string,
+    `headers` are (name, value) pairs that change response, e.g. credentials"""
+    digest = hashlib.sha1(f"{method.upper()} {url}".encode("utf-8"))
+    if body:
+        digest.update(body if isinstance(body, bytes) else str(body).encode("utf-8"))
+    for name, value in sorted((n.lower(), str(v)) for n, v in headers or ()):
+        digest.update(f"\n{name}: {value}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """SQLite backed cache of http responses.
+
+    Bodies are stored zlib compressed, every entry has own expiration time.
+    When total size of stored bodies exceeds `max_size`, least recently used
+    entries are removed.
+    """
+
+    def __init__(self, path=None, max_size=MAX_CACHE_SIZE):
+        self.path = path or data_path(CACHE_FILE)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                size INTEGER,
+                raw_size INTEGER,
+                created REAL,
+                expires REAL,
+                accessed REAL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+
+    def get(self, key, allow_stale=False):
+        """Return cached entry as dict or None. Expired entries are returned only
+        with allow_stale=True"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, created, expires FROM responses "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or (row[5] < now and not allow_stale):
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+
+        url, status, headers, body, created, expires = row
+        return {
+            "url": url,
+            "status": status,
+            "headers": json.loads(headers),
+            "body": zlib.decompress(body),
+            "created": created,
+            "expires": expires,
+            "stale": expires < now,
+        }
+
+    def set(self, key, url, status, headers, body, ttl):
+        now = time.time()
+        compressed = zlib.compress(body or b"")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    url,
+                    status,
+                    json.dumps(dict(headers or {})),
+                    compressed,
+                    len(compressed),
+                    len(body or b""),
+                    now,
+                    now + ttl,
+                    now,
+                ),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+        if not total or total <= self.max_size:
+            return
+        to_remove = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        ):
+            to_remove.append((key,))
+            total -= size
+            if total <= self.max_size:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", to_remove)
+        logger.debug(f"Evicted {len(to_remove)} entries from cache")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size, raw_size = self._conn.execute(
+                "SELECT COUNT(*), SUM(size), SUM(raw_size) FROM responses"
+            ).fetchone()
+            expired = self._conn.execute(
+                "SELECT COUNT(*) FROM responses WHERE expires < ?", (time.time(),)
+            ).fetchone()[0]
+        return {
+            "path": self.path,
+            "entries": entries,
+            "expired_entries": expired,
+            "size_mb": round((size or 0) / 1024**2, 2),
+            "uncompressed_size_mb": round((raw_size or 0) / 1024**2, 2),
+            "max_size_mb": round(self.max_size / 1024**2, 2),
+            "session_hits": self.hits,
+            "session_misses": self.misses,
+        }
+
+    def clear(self, expired_only=False) -> int:
+        with self._lock:
+            if expired_only:
+                cursor = self._conn.execute(
+                    "DELETE FROM responses WHERE expires < ?", (time.time(),)
+                )
+            else:
+                cursor = self._conn.execute("DELETE FROM responses")
+            self._conn.execute("VACUUM")
+        return cursor.rowcount
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResponseCache:
+    """Return shared response cache, create it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
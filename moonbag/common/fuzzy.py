@@ -0,0 +1,65 @@
+import heapq
+import re
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+NGRAM = 3
+
+
+def _clean(text) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", str(text).lower()).strip()
+
+
+def ngrams(text, n=NGRAM) -> set:
+    """Character n-grams of text. Text is padded, so short strings and word starts
+    also produce n-grams (`btc` -> `  b`, ` bt`, `btc`, `tc `)"""
+    text = " " * (n - 1) + _clean(text) + " "
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+
+class FuzzyIndex:
+    """Inverted index of character n-grams for fuzzy lookups in lists of coin names.
+
+    Index is built once for given list of keys, every search only touches keys that
+    share at least one n-gram with query. Candidates are ranked by Dice coefficient
+    of n-gram sets, ties go to keys closer in length to query and then to keys
+    earlier in list (so list order can express priority, e.g. market cap rank).
+    """
+
+    def __init__(self, keys: Iterable[str], n=NGRAM):
+        self.n = n
+        self.keys = list(keys)
+        self._sizes = []
+        self._lengths = []
+        self._postings = {}
+        for position, key in enumerate(self.keys):
+            grams = ngrams(key, n)
+            self._sizes.append(len(grams))
+            self._lengths.append(len(_clean(key)))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(position)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def search(self, query, limit=10, cutoff=0.3) -> List[Tuple[int, float]]:
+        """Positions of best matching keys with their similarity score (0-1)"""
+        grams = ngrams(query, self.n)
+        if not grams:
+            return []
+        common = Counter()
+        for gram in grams:
+            common.update(self._postings.get(gram, ()))
+
+        size, length = len(grams), len(_clean(query))
+        scored = []
+        for position, shared in common.items():
+            score = 2 * shared / (size + self._sizes[position])
+            if score >= cutoff:
+                scored.append((-score, abs(self._lengths[position] - length), position))
+        best = heapq.nsmallest(limit, scored)
+        return [(position, round(-score, 4)) for score, _, position in best]
+
+    def matches(self, query, limit=10, cutoff=0.3) -> List[str]:
+        """Best matching keys, best first"""
+        return [self.keys[i] for i, _ in self.search(query, limit, cutoff)]
@@ -0,0 +1,235 @@
+import logging
+import re
+import threading
+import time
+from moonbag.common import cache
+from moonbag.gecko.registry import get_registry
+
+logger = logging.getLogger("identity")
+
+IDS_FILE = "coin_ids.json"
+REFRESH_INTERVAL = 24 * 60 * 60  # map older than that is rebuilt in background
+ADDRESS_PLATFORM = "ethereum"  # platform of contract addresses used by Ethplorer
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+def _cc_name(coin: dict) -> str:
+    # FullName has form "Ethereum (ETH)"
+    return coin.get("CoinName") or re.sub(
+        r"\s*\([^)]*\)$", "", coin.get("FullName", "")
+    )
+
+
+class IdentityMap:
+    """Cross reference of coin identifiers used by providers.
+
+    Every coin is identified by CoinGecko id and mapped to Coinpaprika id
+    (`eth-ethereum`), CryptoCompare symbol and numeric Id (`ETH`, 7605) and contract
+    addresses of its tokens (`platforms` from CoinGecko coin list). Map is built from
+    coin list endpoints of providers, kept on disk and rebuilt in background once a day,
+    so resolving identifiers never needs extra requests. Until it's built only
+    identifiers known to coin registry (CoinGecko ids, symbols, names, contracts)
+    are resolved.
+
+    Lookups accept any form: gecko id, symbol, name, paprika id, CryptoCompare Id
+    or contract address. When identifier can't be mapped, methods return None.
+    """
+
+    def __init__(self, path=None, max_age=REFRESH_INTERVAL, registry=None):
+        self.path = path or cache.data_path(IDS_FILE)
+        self.max_age = max_age
+        self.registry = registry or get_registry()
+        self.updated = None
+        self._coins = None  # gecko id -> {"paprika": .., "cc_symbol": .., "cc_id": ..}
+        self._cc_symbols = {}  # CryptoCompare symbol -> Id
+        self._index = {}  # any lowercase identifier -> gecko id
+        self._lock = threading.Lock()
+        self._refreshing = None
+
+    def _load(self):
+        if self._coins is not None:
+            return
+        with self._lock:
+            if self._coins is not None:
+                return
+            data = cache.load_json(self.path) or {
+                "updated": 0,
+                "coins": {},
+                "cryptocompare": {},
+            }
+            self._build_index(data)
+
+        if self.max_age is not None and time.time() - self.updated > self.max_age:
+            self.refresh()
+
+    def _build_index(self, data):
+        index = {}
+        for coin in self.registry.coins():
+            for address in (coin.get("platforms") or {}).values():
+                if address:
+                    index[address.lower()] = coin["id"]
+        for gecko_id, ids in data["coins"].items():
+            if ids.get("paprika"):
+                index[ids["paprika"].lower()] = gecko_id
+            if ids.get("cc_id"):
+                index[str(ids["cc_id"])] = gecko_id
+        self._coins = data["coins"]
+        self._cc_symbols = data["cryptocompare"]
+        self._index = index
+        self.updated = data["updated"]
+
+    @staticmethod
+    def build(gecko_coins, paprika_coins, cc_coins) -> dict:
+        """Match coins of other providers with CoinGecko ones. Coins are matched by
+        symbol, when symbol is ambiguous also by name"""
+        by_symbol = {}
+        for coin in gecko_coins:
+            by_symbol.setdefault(coin["symbol"].lower(), []).append(coin)
+
+        def match(symbol, name):
+            candidates = by_symbol.get(str(symbol).lower(), [])
+            named = [c for c in candidates if _normalize(c["name"]) == _normalize(name)]
+            if len(named) == 1:
+                return named[0]["id"]
+            if len(candidates) == 1:
+                return candidates[0]["id"]
+            return None
+
+        coins = {}
+        for coin in paprika_coins:
+            gecko_id = match(coin.get("symbol"), coin.get("name"))
+            if gecko_id and coin.get("is_active", True):
+                coins.setdefault(gecko_id, {}).setdefault("paprika", coin["id"])
+        cryptocompare = {}
+        for coin in cc_coins.values():
+            symbol, cc_id = coin.get("Symbol"), coin.get("Id")
+            if not symbol or not cc_id:
+                continue
+            cryptocompare[symbol] = int(cc_id)
+            gecko_id = match(symbol, _cc_name(coin))
+            if gecko_id:
+                ids = coins.setdefault(gecko_id, {})
+                ids.setdefault("cc_symbol", symbol)
+                ids.setdefault("cc_id", int(cc_id))
+        return {"updated": time.time(), "coins": coins, "cryptocompare": cryptocompare}
+
+    def _fetch(self):
+        from moonbag.paprika._client import Client
+        from moonbag.cryptocompare._client import CryptoCompareClient
+        from moonbag.common.keys import CC_API_KEY
+
+        paprika = Client()._get_coins()
+        cc = {}
+        if CC_API_KEY:
+            cc = CryptoCompareClient(CC_API_KEY)._get_all_coins_list().get("Data") or {}
+        return paprika, cc
+
+    def _refresh(self):
+        try:
+            paprika, cc = self._fetch()
+            data = self.build(self.registry.coins(), paprika, cc)
+            cache.dump_json(self.path, data)
+            with self._lock:
+                self._build_index(data)
+            logger.info(f"Coin identity map rebuilt, {len(data['coins'])} coins")
+        except Exception as e:
+            logger.warning(f"Coin identity map refresh failed: {e}")
+
+    def refresh(self, block=False):
+        """Rebuild map from providers coin lists. By default in background thread"""
+        if self._refreshing is not None and self._refreshing.is_alive():
+            thread = self._refreshing
+        else:
+            thread = threading.Thread(
+                target=self._refresh, name="identity", daemon=True
+            )
+            self._refreshing = thread
+            thread.start()
+        if block:
+            thread.join()
+
+    def gecko_id(self, query) -> str or None:
+        self._load()
+        query = str(query).strip().lower()
+        if query in self.registry:
+            return query
+        if query in self._index:
+            return self._index[query]
+        candidates = self.registry.candidates(query)
+        return candidates[0] if candidates else None
+
+    def ids(self, query) -> dict:
+        """All known identifiers of coin"""
+        gecko_id = self.gecko_id(query)
+        if gecko_id is None:
+            return {}
+        coin = self.registry.get(gecko_id) or {}
+        return {
+            "gecko": gecko_id,
+            "symbol": coin.get("symbol"),
+            "name": coin.get("name"),
+            **self._coins.get(gecko_id, {}),
+            "platforms": {k: v for k, v in (coin.get("platforms") or {}).items() if v},
+        }
+
+    def paprika_id(self, query) -> str or None:
+        self._load()
+        query = str(query).strip()
+        gecko_id = self.gecko_id(query)
+        return self._coins.get(gecko_id, {}).get("paprika")
+
+    def cryptocompare_symbol(self, query) -> str or None:
+        self._load()
+        query = str(query).strip()
+        if query.upper() in self._cc_symbols:
+            return query.upper()
+        return self._coins.get(self.gecko_id(query), {}).get("cc_symbol")
+
+    def cryptocompare_id(self, query) -> int or None:
+        self._load()
+        query = str(query).strip()
+        if query.isdigit():
+            return int(query)
+        if query.upper() in self._cc_symbols:
+            return self._cc_symbols[query.upper()]
+        return self._coins.get(self.gecko_id(query), {}).get("cc_id")
+
+    def contract(self, query, platform=ADDRESS_PLATFORM) -> str or None:
+        query = str(query).strip()
+        if query.lower().startswith("0x"):
+            return query
+        gecko_id = self.gecko_id(query)
+        coin = self.registry.get(gecko_id) if gecko_id else None
+        return ((coin or {}).get("platforms") or {}).get(platform) or None
+
+
+_identity = None
+_identity_lock = threading.Lock()
+
+
+def get_identity() -> IdentityMap:
+    """Return shared identity map, create it on first use"""
+    global _identity
+    if _identity is None:
+        with _identity_lock:
+            if _identity is None:
+                _identity = IdentityMap()
+    return _identity
+
+
+def to_paprika(query) -> str:
+    """Coinpaprika id for any identifier, unknown ones are passed unchanged"""
+    return get_identity().paprika_id(query) or query
+
+
+def to_cryptocompare(query) -> str:
+    """CryptoCompare symbol for any identifier, unknown ones are passed unchanged"""
+    return get_identity().cryptocompare_symbol(query) or query
+
+
+def to_contract(query) -> str:
+    """Ethereum contract address for any identifier, unknown ones are passed unchanged"""
+    return get_identity().contract(query) or query
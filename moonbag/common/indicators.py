@@ -0,0 +1,115 @@
+"""Technical indicators of price series.
+
+Every indicator takes numpy arrays (or pandas Series) of candles in time order and
+returns float64 arrays of the same length, NaN where there is not enough history
+yet. Kernels are vectorised: moving averages come from cumulative sums, deviations
+and exponential averages from pandas rolling and ewm, there are no Python loops
+over candles.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _values(values) -> np.ndarray:
+    return np.asarray(values, dtype="float64")
+
+
+def _ewm(values, alpha) -> np.ndarray:
+    return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def rolling_sum(values, window: int) -> np.ndarray:
+    """Sum of last `window` values, from difference of cumulative sums. Windows
+    with a NaN are NaN, like pandas rolling. NaNs are summed as zeros and counted
+    separately, so one missing value doesn't spoil all later sums"""
+    values = _values(values)
+    out = np.full(len(values), np.nan)
+    if window <= len(values):
+        missing = np.isnan(values)
+        sums = np.concatenate([[0.0], np.cumsum(np.where(missing, 0.0, values))])
+        gaps = np.concatenate([[0], np.cumsum(missing)])
+        out[window - 1 :] = sums[window:] - sums[:-window]
+        out[window - 1 :][gaps[window:] - gaps[:-window] > 0] = np.nan
+    return out
+
+
+def sma(values, window=20) -> np.ndarray:
+    """Simple moving average"""
+    values = _values(values)
+    # centering keeps cumulative sums small, so long series don't lose precision
+    center = np.nanmean(values) if len(values) else 0.0
+    return rolling_sum(values - center, window) / window + center
+
+
+def rolling_std(values, window=20) -> np.ndarray:
+    """Population standard deviation of last `window` values. Sum of squares would
+    lose precision by cancellation, so pandas rolling (compensated sums) is used"""
+    series = pd.Series(_values(values))
+    return series.rolling(window).std(ddof=0).to_numpy()
+
+
+def ema(values, span=20) -> np.ndarray:
+    """Exponential moving average, alpha = 2 / (span + 1)"""
+    return _ewm(_values(values), 2 / (span + 1))
+
+
+def rsi(close, period=14) -> np.ndarray:
+    """Relative strength index with Wilder smoothing, 0-100"""
+    change = np.diff(_values(close), prepend=np.nan)
+    gain = _ewm(np.clip(change, 0, None), 1 / period)
+    loss = _ewm(np.clip(-change, 0, None), 1 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100 - 100 / (1 + gain / loss)
+    out[:period] = np.nan
+    return out
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """MACD line, its signal line and histogram"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close, window=20, k=2.0):
+    """Middle (SMA), upper and lower Bollinger band"""
+    middle = sma(close, window)
+    width = k * rolling_std(close, window)
+    return middle, middle + width, middle - width
+
+
+def true_range(high, low, close) -> np.ndarray:
+    high, low, close = _values(high), _values(low), _values(close)
+    previous = np.concatenate([[np.nan], close[:-1]])
+    ranges = np.stack([high - low, np.abs(high - previous), np.abs(low - previous)])
+    return np.nanmax(ranges, axis=0)
+
+
+def atr(high, low, close, period=14) -> np.ndarray:
+    """Average true range with Wilder smoothing"""
+    out = _ewm(true_range(high, low, close), 1 / period)
+    out[: period - 1] = np.nan
+    return out
+
+
+def volatility(close, window=30, periods_per_year=365) -> np.ndarray:
+    """Annualized rolling standard deviation of log returns"""
+    returns = np.diff(np.log(_values(close)), prepend=np.nan)
+    out = rolling_std(returns, window) * np.sqrt(periods_per_year)
+    out[:window] = np.nan
+    return out
+
+
+def add_indicators(df: pd.DataFrame, periods_per_year=365) -> pd.DataFrame:
+    """Frame of candles (open, high, low, close) with columns of all indicators"""
+    close = df["close"].to_numpy(dtype="float64")
+    df = df.copy()
+    df["sma_20"] = sma(close, 20)
+    df["ema_20"] = ema(close, 20)
+    df["rsi_14"] = rsi(close, 14)
+    df["macd"], df["macd_signal"], df["macd_hist"] = macd(close)
+    _, df["bb_upper"], df["bb_lower"] = bollinger(close)
+    df["atr_14"] = atr(df["high"], df["low"], close, 14)
+    df["volatility"] = volatility(close, 30, periods_per_year)
+    return df
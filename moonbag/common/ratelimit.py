@@ -0,0 +1,162 @@
+import datetime
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger("ratelimit")
+
+# host: (requests per second, burst size)
+RATE_LIMITS = {
+    "min-api.cryptocompare.com": (10, 20),
+    "api.coingecko.com": (0.8, 10),
+    "www.coingecko.com": (1, 5),
+    "api.coinpaprika.com": (8, 10),
+    "api.ethplorer.io": (2, 2),
+    "fcd.terra.dev": (5, 10),
+    "api.thegraph.com": (5, 10),
+    "graphql.bitquery.io": (1, 5),
+    "api.pushshift.io": (1, 4),
+}
+
+RESET_HEADERS = ("X-RateLimit-Reset", "X-Ratelimit-Reset", "RateLimit-Reset")
+REMAINING_HEADERS = (
+    "X-RateLimit-Remaining",
+    "X-Ratelimit-Remaining",
+    "RateLimit-Remaining",
+)
+
+
+class TokenBucket:
+    """Thread safe token bucket.
+
+    Every caller reserves a token under the lock and then sleeps outside of it until
+    its reservation is due. Tokens may go below zero, which means callers are queued,
+    so concurrent callers are served in order of arrival instead of racing for tokens.
+    """
+
+    def __init__(self, rate: float, burst: int, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = max(self._updated, now)
+
+    def reserve(self) -> float:
+        """Take token and return number of seconds caller has to wait before use"""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(0.0, self._updated - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def acquire(self, timeout=None) -> bool:
+        """Wait for token. With timeout, gives up and returns False when token
+        wouldn't be available in time"""
+        wait = self.reserve()
+        if timeout is not None and wait > timeout:
+            with self._lock:
+                self._tokens += 1
+            return False
+        if wait > 0:
+            logger.debug(f"Rate limit, waiting {wait:.2f}s")
+            self._sleep(wait)
+        return True
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for given number of seconds (e.g. after 429)"""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + seconds)
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(self._clock())
+            return self._tokens
+
+
+def _header(headers, names):
+    for name in names:
+        if name in headers:
+            return headers[name]
+    return None
+
+
+def retry_after(headers) -> float or None:
+    """Seconds to wait according to Retry-After or rate limit headers, None if no
+    waiting is requested"""
+    value = headers.get("Retry-After")
+    if value is not None:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                date = parsedate_to_datetime(value)
+                now = datetime.datetime.now(date.tzinfo)
+                return max(0.0, (date - now).total_seconds())
+            except (TypeError, ValueError):
+                return None
+
+    remaining = _header(headers, REMAINING_HEADERS)
+    reset = _header(headers, RESET_HEADERS)
+    if remaining is None or reset is None:
+        return None
+    try:
+        remaining, reset = float(remaining), float(reset)
+    except ValueError:
+        return None
+    if remaining > 0:
+        return None
+    # reset is either epoch timestamp or number of seconds till reset
+    if reset > 1e9:
+        reset = reset - time.time()
+    return max(0.0, reset)
+
+
+class RateLimiter:
+    """Token buckets per host, configured with RATE_LIMITS"""
+
+    def __init__(self, limits=None):
+        self.limits = RATE_LIMITS if limits is None else limits
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host) -> TokenBucket or None:
+        if host not in self.limits:
+            return None
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(*self.limits[host])
+            return self._buckets[host]
+
+    def acquire(self, host, timeout=None) -> bool:
+        bucket = self.bucket(host)
+        return bucket.acquire(timeout) if bucket else True
+
+    def observe(self, host, response) -> float or None:
+        """Read rate limit headers of response. If provider asks us to slow down,
+        pause host bucket and return number of seconds of the pause"""
+        wait = retry_after(response.headers)
+        if wait is None and response.status_code == 429:
+            bucket = self.bucket(host)
+            wait = 1 / bucket.rate if bucket else 1.0
+        if wait is None:
+            return None
+        logger.info(f"{host} asked to slow down for {wait:.2f}s")
+        bucket = self.bucket(host)
+        if bucket is not None:
+            bucket.pause(wait)
+        return wait
@@ -0,0 +1,115 @@
+import contextlib
+import contextvars
+import logging
+import os
+import random
+import time
+
+import requests
+
+logger = logging.getLogger("retries")
+
+# Time budget of single command in seconds, shared by all http calls the command makes
+COMMAND_DEADLINE = float(os.getenv("MOONBAG_DEADLINE", "30"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+# absolute time.monotonic() value after which calls should give up, None = no limit
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Time budget of the command was used up"""
+
+
+@contextlib.contextmanager
+def deadline(seconds):
+    """Run block with time budget. Budget is kept in context variable, so it's visible
+    to every http call made inside the block, also in worker threads started with
+    aio.run_blocking. Nested deadline can only shorten outer one."""
+    if seconds is None:
+        yield
+        return
+    new = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(new if current is None else min(current, new))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float or None:
+    """Seconds left till deadline or None if there is no deadline"""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return current - time.monotonic()
+
+
+def clamp_timeout(timeout):
+    """Shorten requests timeout (number or (connect, read) tuple) so it doesn't reach
+    past deadline. Raises DeadlineExceeded when there is no time left"""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("Command deadline exceeded")
+    if timeout is None:
+        return left
+    if isinstance(timeout, tuple):
+        return tuple(left if t is None else min(t, left) for t in timeout)
+    return min(timeout, left)
+
+
+class RetryPolicy:
+    """When and how long to wait before repeating failed http call.
+
+    Delays grow exponentially (base_delay * multiplier ** attempt, capped at max_delay)
+    and with jitter=True random value from 0 to that delay is used ("full jitter"),
+    so clients that failed together don't retry together.
+    """
+
+    def __init__(
+        self,
+        tries=3,
+        base_delay=0.5,
+        max_delay=5.0,
+        multiplier=2.0,
+        jitter=True,
+        statuses=RETRY_STATUSES,
+        exceptions=RETRY_EXCEPTIONS,
+    ):
+        self.tries = tries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.statuses = statuses
+        self.exceptions = exceptions
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.multiplier**attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def retry_status(self, status: int) -> bool:
+        return status in self.statuses
+
+    def retry_exception(self, exc: Exception) -> bool:
+        return isinstance(exc, self.exceptions) and not isinstance(
+            exc, DeadlineExceeded
+        )
+
+    @staticmethod
+    def sleep(delay: float) -> bool:
+        """Sleep before next attempt. Returns False without sleeping when next attempt
+        wouldn't start before deadline"""
+        left = remaining()
+        if left is not None and delay >= left:
+            return False
+        time.sleep(delay)
+        return True
+
+
+DEFAULT_POLICY = RetryPolicy()
@@ -0,0 +1,91 @@
+import copy
+import functools
+import logging
+import threading
+
+logger = logging.getLogger("singleflight")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls.
+
+    First caller of given key executes function, callers that come with the same key
+    while it's running wait for it and get its result (or exception) instead of
+    repeating the work. When `copy_result` is set and somebody waited, every caller
+    gets own deep copy, so callers can modify returned dicts and lists safely.
+    """
+
+    def __init__(self, copy_result=False):
+        self.copy_result = copy_result
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            logger.debug(f"Joined in-flight call {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result) if self.copy_result else call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        if self.copy_result and call.waiters:
+            return copy.deepcopy(call.result)
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+def _make_key(func, args, kwargs):
+    key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        key = repr(key)
+    return key
+
+
+def coalesce(func=None, *, copy_result=True):
+    """Decorator that shares result of function between concurrent calls with
+    the same arguments. For methods `self` is part of the key, so only calls
+    on the same instance are coalesced"""
+
+    def decorator(func):
+        flights = SingleFlight(copy_result=copy_result)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return flights.do(_make_key(func, args, kwargs), func, *args, **kwargs)
+
+        wrapper.flights = flights
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
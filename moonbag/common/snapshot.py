@@ -0,0 +1,139 @@
+import datetime as dt
+import logging
+import os
+import pickle
+import threading
+import time
+import pandas as pd
+from moonbag.common import cache
+
+logger = logging.getLogger("snapshot")
+
+
+class Snapshot:
+    """DataFrame of slow or heavy endpoint kept in moonbag data directory.
+
+    `frame()` returns stored snapshot immediately. When it's older than `max_age`
+    it's refreshed in background thread and swapped in when ready, `schedule()`
+    keeps refreshing it for the whole session. Only when there is no snapshot
+    at all the caller waits for `_fetch_initial` (by default full `_fetch`).
+    Subclasses implement `_fetch`, or `fetch` function is passed.
+    """
+
+    def __init__(self, name, fetch=None, max_age=10 * 60, path=None):
+        self.name = name
+        self.path = path or cache.data_path(f"{name}.pkl")
+        self.max_age = max_age
+        self.updated = None
+        self._fetch_func = fetch
+        self._frame = None
+        self._lock = threading.Lock()
+        self._refreshing = None
+        self._scheduler = None
+        self._stopped = threading.Event()
+
+    def _fetch(self) -> pd.DataFrame:
+        return self._fetch_func()
+
+    def _fetch_initial(self):
+        """Frame and its time used when there is no snapshot yet. Time 0 marks partial
+        frame, that is refreshed right away"""
+        return self._fetch(), time.time()
+
+    def _store(self, df, updated):
+        self._frame, self.updated = df, updated
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump({"updated": updated, "frame": df}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Couldn't save {self.name} snapshot: {e}")
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+            self._frame, self.updated = data["frame"], data["updated"]
+        except Exception as e:
+            logger.info(f"No {self.name} snapshot: {e}")
+
+    def _fetch_refresh(self):
+        """Frame and its time stored by refresh, time 0 marks partial frame"""
+        return self._fetch(), time.time()
+
+    def _refresh(self):
+        try:
+            df, updated = self._fetch_refresh()
+            with self._lock:
+                self._store(df, updated)
+            logger.info(f"{self.name} snapshot refreshed, {len(df)} rows")
+        except Exception as e:
+            logger.warning(f"{self.name} refresh failed: {e}")
+
+    def refresh(self, block=False):
+        """Fetch data again. By default it's done in background thread"""
+        if self._refreshing is not None and self._refreshing.is_alive():
+            thread = self._refreshing
+        else:
+            thread = threading.Thread(target=self._refresh, name=self.name, daemon=True)
+            self._refreshing = thread
+            thread.start()
+        if block:
+            thread.join()
+
+    @property
+    def stale(self) -> bool:
+        if self.max_age is None or self.updated is None:
+            return False
+        return time.time() - self.updated > self.max_age
+
+    def frame(self) -> pd.DataFrame:
+        """Latest snapshot, fetched only when there is none"""
+        with self._lock:
+            if self._frame is None:
+                self._load()
+        if self._frame is None and self._refreshing is not None:
+            self._refreshing.join()  # first fetch is already running in background
+        with self._lock:
+            if self._frame is None:
+                self._store(*self._fetch_initial())
+            df = self._frame
+        if self.stale:
+            self.refresh()
+        return df
+
+    def as_of(self) -> str:
+        """Time of snapshot for views, e.g. 'as of 2021-06-09 12:00 UTC'"""
+        if not self.updated:
+            return "as of now (partial, refreshing)"
+        moment = dt.datetime.fromtimestamp(self.updated, dt.timezone.utc)
+        return f"as of {moment:%Y-%m-%d %H:%M} UTC"
+
+    def _run_schedule(self, interval, stopped):
+        while not stopped.is_set():
+            with self._lock:
+                if self._frame is None:
+                    self._load()
+            if self._frame is None or self.stale:
+                self.refresh(block=True)
+            stopped.wait(interval)
+
+    def schedule(self, interval=60):
+        """Keep snapshot fresh in background until `stop()`, it's checked every
+        `interval` seconds"""
+        if self._scheduler is None or not self._scheduler.is_alive():
+            self._stopped = threading.Event()
+            self._scheduler = threading.Thread(
+                target=self._run_schedule,
+                args=(interval, self._stopped),
+                name=f"{self.name}-schedule",
+                daemon=True,
+            )
+            self._scheduler.start()
+
+    def stop(self):
+        """Stop scheduled refreshes, refresh that is already running is finished"""
+        if self._scheduler is not None:
+            self._stopped.set()
+            self._scheduler = None
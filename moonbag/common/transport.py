@@ -0,0 +1,287 @@
+import logging
+import re
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.sessions import merge_setting
+from requests.structures import CaseInsensitiveDict
+from moonbag.common import cache, retries
+from moonbag.common.ratelimit import RateLimiter
+from moonbag.common.breaker import Breakers, CircuitOpen
+from moonbag.common.singleflight import SingleFlight
+
+logger = logging.getLogger("transport")
+
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) in seconds
+POOL_CONNECTIONS = 20  # how many host pools are kept alive at once
+POOL_MAXSIZE = 10  # how many keep-alive connections are kept per host
+
+# Per host overrides. Hosts that we hit with many parallel requests get bigger pools,
+# hosts that are known to be slow get longer read timeouts, flaky ones are cut off
+# after fewer failures.
+HOSTS = {
+    "min-api.cryptocompare.com": dict(pool_maxsize=16),
+    "api.coingecko.com": dict(pool_maxsize=16, timeout=(5, 60)),
+    "www.coingecko.com": dict(pool_maxsize=8),
+    "api.coinpaprika.com": dict(pool_maxsize=16),
+    "api.ethplorer.io": dict(pool_maxsize=4),
+    "fcd.terra.dev": dict(pool_maxsize=4),
+    "api.thegraph.com": dict(pool_maxsize=4, timeout=(5, 60), failure_threshold=3),
+    "graphql.bitquery.io": dict(pool_maxsize=4, timeout=(5, 60), failure_threshold=3),
+    "defipulse.com": dict(failure_threshold=2),
+}
+
+# requests with these methods are coalesced when the same one is already in flight
+COALESCED_METHODS = ("GET", "HEAD")
+
+# (compiled url pattern, ttl in seconds), filled by provider modules with register_ttls
+_TTLS = []
+# host -> function telling whether successful response can be cached, some apis
+# report errors (e.g. rate limits) in body of 200 responses
+_CACHEABLE = {}
+CACHED_HEADERS = ("Content-Type", "Date")
+# request headers that are part of cache key, responses to different credentials
+# must not be shared
+KEY_HEADERS = re.compile(r"auth|key|token|cookie", re.IGNORECASE)
+
+
+def get_host(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+def register_ttls(base_url: str, ttls: dict):
+    """Register cache time to live for endpoints of given api.
+    Keys are endpoint paths, `{}` matches single path segment like in ENDPOINTS tables,
+    e.g. {"/coins/{}/events": 3600}"""
+    for path, ttl in ttls.items():
+        path = "/".join(filter(None, [base_url.rstrip("/"), path.strip("/")]))
+        pattern = "[^/]+".join(re.escape(part) for part in path.split("{}"))
+        _TTLS.append((re.compile(pattern + "/?$"), ttl))
+
+
+def get_ttl(url: str):
+    url = url.split("?")[0]
+    for pattern, ttl in _TTLS:
+        if pattern.match(url):
+            return ttl
+    return None
+
+
+def register_cacheable(base_url: str, cacheable):
+    """Register `cacheable(response) -> bool` check of 200 responses of given api,
+    rejected ones are returned to caller but not stored in cache"""
+    _CACHEABLE[get_host(base_url)] = cacheable
+
+
+def is_cacheable(response) -> bool:
+    if response.status_code != 200:
+        return False
+    cacheable = _CACHEABLE.get(get_host(response.url or ""))
+    return cacheable is None or cacheable(response)
+
+
+def _build_response(request, entry) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response._content = entry["body"]
+    response.url = request.url
+    response.request = request
+    response.reason = "OK"
+    response.from_cache = True
+    return response
+
+
+class MoonSession(requests.Session):
+    """requests.Session shared by all provider clients.
+
+    Keeps keep-alive connection pools per host, so repeated commands reuse
+    already opened TLS connections, and applies default timeouts to every call.
+    Responses of endpoints with registered ttl (or called with `ttl=` argument)
+    are served from persistent response cache. Requests that go to network are
+    throttled by per host token buckets (see ratelimit.RATE_LIMITS), failed ones are
+    repeated according to retry policy and every call respects deadline of running
+    command (see retries.deadline). Hosts that keep failing are cut off by circuit
+    breakers, while circuit is open cached responses are served even if expired.
+    Concurrent identical GET requests (and requests of cached endpoints) share
+    single upstream call.
+    """
+
+    def __init__(
+        self,
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        timeout=DEFAULT_TIMEOUT,
+        hosts=None,
+    ):
+        super().__init__()
+        self.timeout = timeout
+        self.host_timeouts = {}
+        self.limiter = RateLimiter()
+        self.retry_policy = retries.DEFAULT_POLICY
+        self.breakers = Breakers()
+        self._flights = SingleFlight()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+        for host, options in (HOSTS if hosts is None else hosts).items():
+            self.configure_host(host, **options)
+
+    def configure_host(
+        self, host, pool_maxsize=None, timeout=None, failure_threshold=None
+    ):
+        """Set dedicated pool size, default timeout and/or circuit breaker failure
+        threshold for given host"""
+        if pool_maxsize:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+            self.mount(f"https://{host}/", adapter)
+            self.mount(f"http://{host}/", adapter)
+        if timeout:
+            self.host_timeouts[host] = timeout
+        if failure_threshold:
+            self.breakers.configure_host(host, failure_threshold)
+
+    def _send(self, method, url, **kwargs) -> requests.Response:
+        """Wait for rate limit token and send request. Connection errors, timeouts and
+        retryable statuses are repeated with backoff (or as long as Retry-After asks)
+        while there are tries and time left. Every attempt is reported to circuit
+        breaker of the host, when circuit is open CircuitOpen is raised. Timeouts
+        shortened by command deadline aren't counted as failures of the host"""
+        host = get_host(url)
+        circuit = self.breakers.get(host)
+        policy = self.retry_policy
+        timeout = kwargs.pop("timeout")
+        response = None
+        for attempt in range(policy.tries):
+            if not self.limiter.acquire(host, retries.remaining()):
+                raise retries.DeadlineExceeded(f"Command deadline exceeded ({host})")
+            attempt_timeout = retries.clamp_timeout(timeout)
+            if not circuit.allow():
+                if response is not None:
+                    return response
+                raise CircuitOpen(
+                    f"{host} is unavailable, next try in {circuit.retry_in():.0f}s"
+                )
+            try:
+                response = super().request(
+                    method, url, timeout=attempt_timeout, **kwargs
+                )
+            except requests.exceptions.RequestException as e:
+                if attempt_timeout != timeout and isinstance(
+                    e, requests.exceptions.Timeout
+                ):
+                    circuit.release()  # timeout shortened by command deadline
+                else:
+                    circuit.record_failure(repr(e))
+                left = retries.remaining()
+                if left is not None and left <= 0:
+                    raise retries.DeadlineExceeded(
+                        f"Command deadline exceeded ({host})"
+                    ) from e
+                if (
+                    not policy.retry_exception(e)
+                    or attempt == policy.tries - 1
+                    or not policy.sleep(policy.backoff(attempt))
+                ):
+                    raise
+                logger.info(f"{host}: {e!r}, retrying")
+                continue
+            except BaseException:
+                circuit.release()  # e.g. KeyboardInterrupt, probe can't stay taken
+                raise
+
+            if response.status_code >= 500:
+                circuit.record_failure(f"status {response.status_code}")
+            else:
+                circuit.record_success()
+            wait = self.limiter.observe(host, response)
+            if not policy.retry_status(response.status_code) or attempt == (
+                policy.tries - 1
+            ):
+                return response
+            if not policy.sleep(max(wait or 0, policy.backoff(attempt))):
+                return response
+            logger.info(f"{host}: status {response.status_code}, retrying")
+        return response
+
+    def _fetch(self, method, url, prepared, key, ttl, **kwargs) -> requests.Response:
+        """Send request, store successful response in cache when ttl is given"""
+        try:
+            response = self._send(method, url, **kwargs)
+        except CircuitOpen:
+            # host is down, expired response is better than nothing
+            entry = cache.get_cache().get(key, allow_stale=True) if ttl else None
+            if entry is None:
+                raise
+            logger.warning(f"{get_host(url)} is unavailable, using stale response")
+            return _build_response(prepared, entry)
+
+        if ttl and is_cacheable(response):
+            headers = {
+                h: response.headers[h] for h in CACHED_HEADERS if h in response.headers
+            }
+            cache.get_cache().set(
+                key, url.split("?")[0], 200, headers, response.content, ttl
+            )
+        return response
+
+    def request(self, method, url, ttl=None, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.host_timeouts.get(get_host(url), self.timeout)
+
+        if ttl is None:
+            ttl = get_ttl(url)
+        ttl = ttl if cache.CACHE_ENABLED else None
+        coalesce = method.upper() in COALESCED_METHODS and not kwargs.get("stream")
+        if not ttl and not coalesce:
+            return self._send(method, url, **kwargs)
+
+        prepared = requests.Request(
+            method.upper(),
+            url,
+            headers=merge_setting(
+                kwargs.get("headers"), self.headers, dict_class=CaseInsensitiveDict
+            ),
+            params=kwargs.get("params"),
+            data=kwargs.get("data"),
+            json=kwargs.get("json"),
+            auth=kwargs.get("auth") or self.auth,
+        ).prepare()
+        headers = [(h, v) for h, v in prepared.headers.items() if KEY_HEADERS.search(h)]
+        key = cache.make_key(method, prepared.url, prepared.body, headers)
+        if ttl:
+            entry = cache.get_cache().get(key)
+            if entry is not None:
+                return _build_response(prepared, entry)
+
+        # identical requests that are already on the way share single response
+        return self._flights.do(
+            key, self._fetch, method, url, prepared, key, ttl, **kwargs
+        )
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> MoonSession:
+    """Return shared session, create it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = MoonSession()
+    return _session
+
+
+def get(url, params=None, **kwargs) -> requests.Response:
+    return get_session().get(url, params=params, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs) -> requests.Response:
+    return get_session().post(url, data=data, json=json, **kwargs)
@@ -109,9 +109,18 @@ BASE_PARSER_ARGUMENTS = {
 
 
 class MoonParser(argparse.ArgumentParser):
-    list_of_arguments = ["help", "dest", "required", "type", "choices", "default"]
+    list_of_arguments = [
+        "help",
+        "dest",
+        "required",
+        "type",
+        "choices",
+        "default",
+        "nargs",
+    ]
 
     def _modify_default_dict_of_arguments(self, dct: dict, **kwargs):
+        dct = dict(dct)  # defaults are shared by all parsers
         if kwargs:
             for argument in self.list_of_arguments:
                 if argument in kwargs:
@@ -1,5 +1,7 @@
-import requests
-from retry import retry
+import re
+from moonbag.common import transport
+from moonbag.common.aio import async_methods
+from moonbag.common.identity import get_identity, to_cryptocompare
 
 ENDPOINTS = {
     "PRICE_MULTI_FULL": "/data/pricemultifull",
@@ -39,7 +41,49 @@ ENDPOINTS = {
     "EXCHANGES_INFO": "/data/exchanges/general",
 }
 
+# max length of comma separated symbols accepted by /data/pricemultifull
+FSYMS_MAX_LENGTH = 300
+TSYMS_MAX_LENGTH = 100
+
+# errors, rate limits included, come as 200 with {"Response": "Error", ...}
+ERROR_RESPONSE = re.compile(rb'"Response"\s*:\s*"Error"')
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# How long responses of given ENDPOINTS are kept in local cache.
+# Endpoints that are not listed here are never cached.
+CACHE_TTL = {
+    "PRICE_MULTI_FULL": 30,
+    "HISTO_DAY": HOUR,
+    "HISTO_HOUR": 5 * MINUTE,
+    "HISTO_MINUTE": MINUTE,
+    "TOP_BY_MARKET_CAP": 5 * MINUTE,
+    "TOP_EXCHANGES_FULL_DATA": 5 * MINUTE,
+    "TOP_LIST_PAIR_VOLUME": 5 * MINUTE,
+    "TOP_LIST_OF_PAIRS": 5 * MINUTE,
+    "EXCHANGE_TOP_SYMBOLS": 5 * MINUTE,
+    "ALL_COINS_LIST": 24 * HOUR,
+    "LATEST_COIN_SOCIAL_STATS": HOUR,
+    "HISTO_DAY_SOCIAL_STATS": 6 * HOUR,
+    "DAILY_SYMBOL_VOLUME": HOUR,
+    "HOURLY_SYMBOL_VOLUME": 5 * MINUTE,
+    "LATEST_BLOCKCHAIN_DATA": HOUR,
+    "HISTO_BLOCKCHAIN_DATA": 6 * HOUR,
+    "NEWS": 5 * MINUTE,
+    "WALLETS": 24 * HOUR,
+    "GAMBLING": 24 * HOUR,
+    "MINING_CONTRACTS": 24 * HOUR,
+    "MINING_COMPANIES": 24 * HOUR,
+    "RECOMMENDED": 24 * HOUR,
+    "FEEDS": 24 * HOUR,
+    "BLOCKCHAIN_COINS": 24 * HOUR,
+    "EXCHANGES_PAIRS": 6 * HOUR,
+    "EXCHANGES_INFO": 6 * HOUR,
+}
+
 
+@async_methods()
 class CryptoCompareClient:
     BASE_URL = "https://min-api.cryptocompare.com"
     COMPARE_URL = "https://www.cryptocompare.com"
@@ -47,7 +91,6 @@ class CryptoCompareClient:
     def __init__(self, api_key):
         self.api_key = api_key
 
-    @retry(tries=2, delay=3, max_delay=5)
     def _make_request(self, endpoint, payload=None, **kwargs):
         """You can use either endpoint key or endpoint value from dictionary ENDPOINTS
         All of request will be handled"""
@@ -65,8 +108,14 @@ class CryptoCompareClient:
             payload = {}
         if kwargs:
             payload.update(kwargs)
+        # coins can be given by any identifier (gecko id, name, contract...)
+        for key in ("fsym", "fsyms"):
+            if payload.get(key):
+                payload[key] = ",".join(
+                    to_cryptocompare(s) for s in str(payload[key]).split(",")
+                )
         headers = {"authorization": "Apikey " + self.api_key}
-        req = requests.get(url, params=payload, headers=headers)
+        req = transport.get(url, params=payload, headers=headers)
         return req.json()
 
     def _get_price(self, symbol="BTC", currency="USD", **kwargs):
@@ -118,10 +167,24 @@ class CryptoCompareClient:
         }
         return self._make_request(endpoint, payload, **kwargs)
 
-    # TODO --> Add mappings that use can use either coinId, symbol, or name for requests
+    def _symbol_ids(self) -> dict:
+        """CryptoCompare symbol -> Id from the coin list"""
+        data = self._get_all_coins_list().get("Data") or {}
+        return {c["Symbol"]: c["Id"] for c in data.values() if c.get("Symbol")}
+
+    def _coin_id(self, coin):
+        """CryptoCompare numeric Id of coin given by Id, symbol, name or other id"""
+        coin_id = get_identity().cryptocompare_id(coin)
+        if coin_id is None:
+            # identity map may still be built in background, coin list is at hand
+            coin_id = self._symbol_ids().get(str(coin).strip().upper())
+        if coin_id is None:
+            raise ValueError(f"Couldn't find CryptoCompare Id of coin {coin}")
+        return int(coin_id)
+
     def _get_latest_social_coin_stats(self, coin_id=7605, **kwargs):
         endpoint = ENDPOINTS["LATEST_COIN_SOCIAL_STATS"]
-        payload = {"coinId": int(coin_id)}
+        payload = {"coinId": self._coin_id(coin_id)}
         return self._make_request(endpoint, payload, **kwargs)
 
     def _get_historical_social_stats(
@@ -129,7 +192,7 @@ class CryptoCompareClient:
     ):
         endpoint = ENDPOINTS["HISTO_DAY_SOCIAL_STATS"]
         payload = {
-            "coinId": int(coin_id),
+            "coinId": self._coin_id(coin_id),
             "limit": limit,
             "aggregate": aggregate,
         }
@@ -324,3 +387,13 @@ class CryptoCompareClient:
         endpoint = ENDPOINTS["RECOMMENDED"]
         payload = {"tsym": symbol}
         return self._make_request(endpoint, payload, **kwargs)
+
+
+transport.register_ttls(
+    CryptoCompareClient.BASE_URL,
+    {ENDPOINTS[endpoint]: ttl for endpoint, ttl in CACHE_TTL.items()},
+)
+transport.register_cacheable(
+    CryptoCompareClient.BASE_URL,
+    lambda response: not ERROR_RESPONSE.search(response.content[:512]),
+)
@@ -1,56 +1,125 @@
 import pandas as pd
 import os
-from moonbag.cryptocompare._client import CryptoCompareClient
+from moonbag.cryptocompare._client import (
+    CryptoCompareClient,
+    FSYMS_MAX_LENGTH,
+    TSYMS_MAX_LENGTH,
+)
 from moonbag.common.keys import CC_API_KEY
 from moonbag.common.utils import wrap_text_in_df
-from moonbag.cryptocompare.utils import create_dct_mapping_from_df
+from moonbag.common.identity import to_cryptocompare
+from moonbag.common.fuzzy import FuzzyIndex
+from moonbag.cryptocompare.utils import create_dct_mapping_from_df, chunk_symbols
+from moonbag.common import aio, indicators
+from moonbag.cryptocompare import history, resample
+from moonbag.cryptocompare.store import get_candle_store
 import logging
 import textwrap
+from functools import cached_property
 
 logger = logging.getLogger("cmc")
 
+INDICATORS_WARMUP = 100  # extra candles, so indicators of the first shown are settled
+YEAR = 365 * 24 * 60 * 60
+
+# numeric fields of /data/pricemultifull RAW data shown by price views
+PRICE_COLUMNS = [
+    "PRICE",
+    "MEDIAN",
+    "VOLUMEDAY",
+    "VOLUME24HOUR",
+    "OPENDAY",
+    "OPEN24HOUR",
+    "HIGH24HOUR",
+    "LOW24HOUR",
+    "MKTCAP",
+    "SUPPLY",
+    "TOTALVOLUME24H",
+    "CHANGEDAY",
+    "CHANGEPCTDAY",
+    "CHANGEHOUR",
+    "CHANGEPCTHOUR",
+    "CHANGE24HOUR",
+    "CHANGEPCT24HOUR",
+]
+
 
 class CryptoCompare(CryptoCompareClient):
     def __init__(self, api_key=CC_API_KEY):
         super().__init__(api_key)
         self.api_key = api_key
+
+    @cached_property
+    def coin_list(self) -> pd.DataFrame:
+        """All coins listed on CryptoCompare, downloaded on first use"""
         try:
-            self.coin_list = self.get_all_coins_list()
-            self.coin_mapping = create_dct_mapping_from_df(
-                self.coin_list, "Symbol", "Id"
-            )
-        except TypeError:
+            return self.get_all_coins_list()
+        except (TypeError, KeyError):
             logger.warning("Wrong API KEY, Please ")
+            return pd.DataFrame(columns=["Id", "Symbol", "FullName"])
+
+    @cached_property
+    def coin_mapping(self) -> dict:
+        return create_dct_mapping_from_df(self.coin_list, "Symbol", "Id")
+
+    def _symbol_ids(self) -> dict:
+        return self.coin_mapping
+
+    @cached_property
+    def coin_names(self) -> dict:
+        return create_dct_mapping_from_df(self.coin_list, "Symbol", "FullName")
+
+    @cached_property
+    def symbol_index(self) -> FuzzyIndex:
+        return FuzzyIndex(self.coin_names)
+
+    @cached_property
+    def name_index(self) -> FuzzyIndex:
+        return FuzzyIndex(self.coin_names.values())
 
     def get_price(self, symbol="BTC", currency="USD", **kwargs):
+        symbol = to_cryptocompare(symbol)
         data = self._get_price(symbol, currency, **kwargs)
         if "Response" in data and data["Response"] == "Error":
             return pd.DataFrame()
         data = data["RAW"][symbol][currency]
-        columns = [
-            "FROMSYMBOL",
-            "TOSYMBOL",
-            "PRICE",
-            "MEDIAN",
-            "VOLUMEDAY",
-            "VOLUME24HOUR",
-            "OPENDAY",
-            "OPEN24HOUR",
-            "HIGH24HOUR",
-            "LOW24HOUR",
-            "MKTCAP",
-            "SUPPLY",
-            "TOTALVOLUME24H",
-            "CHANGEDAY" "CHANGEPCTDAY",
-            "CHANGEHOUR" "CHANGEPCTHOUR",
-            "CHANGE24HOUR",
-            "CHANGEPCT24HOUR",
-        ]
+        columns = ["FROMSYMBOL", "TOSYMBOL"] + PRICE_COLUMNS
         data = {k: v for k, v in data.items() if k in columns}
         df = pd.Series(data).to_frame().reset_index()
         df.columns = ["Metric", "Value"]
         return df
 
+    def get_price_matrix(self, symbols, currencies=("USD",), **kwargs):
+        """Prices of many coins in many currencies as float64 frame indexed by
+        (fsym, tsym). Symbols are split into chunks within limits of
+        /data/pricemultifull and chunks are fetched concurrently. Pairs unknown to
+        CryptoCompare are left out"""
+        symbols = list(dict.fromkeys(to_cryptocompare(s).upper() for s in symbols))
+        currencies = list(dict.fromkeys(c.upper() for c in currencies))
+        calls = [
+            dict(symbol=fsyms, currency=tsyms, relaxedValidation="true", **kwargs)
+            for fsyms in chunk_symbols(symbols, FSYMS_MAX_LENGTH)
+            for tsyms in chunk_symbols(currencies, TSYMS_MAX_LENGTH)
+        ]
+        results = aio.fan_out(
+            self._get_price, calls, host="min-api.cryptocompare.com", partial=True
+        )
+        raw = {}
+        for data in results:
+            for fsym, quotes in (data.get("RAW") or {}).items():
+                for tsym, values in quotes.items():
+                    raw[fsym, tsym] = [values.get(c) for c in PRICE_COLUMNS]
+
+        index = pd.MultiIndex.from_product(
+            [symbols, currencies], names=["fsym", "tsym"]
+        )
+        empty = [None] * len(PRICE_COLUMNS)
+        df = pd.DataFrame(
+            [raw.get(pair, empty) for pair in index], index=index, columns=PRICE_COLUMNS
+        )
+        df = df.apply(pd.to_numeric, errors="coerce").astype("float64")
+        return df.dropna(how="all")
+
     def get_top_list_by_market_cap(self, currency="USD", limit=100, **kwargs):
         limit = 10 if limit < 10 else limit
         data = self._get_top_list_by_market_cap(currency, limit, **kwargs)["Data"]
@@ -257,44 +326,98 @@ class CryptoCompare(CryptoCompareClient):
         data = self._get_all_coins_list(summary, **kwargs)["Data"]
         return pd.DataFrame(data).T[["Id", "Symbol", "FullName"]]
 
-    def get_historical_day_prices(
-        self, symbol="BTC", currency="USD", limit=365, **kwargs
+    def get_historical_ohlcv(
+        self, symbol="BTC", currency="USD", interval="day", limit=365, end=None, **kwargs
     ):
-        data = self._get_historical_day_prices(symbol, currency, limit, **kwargs)[
-            "Data"
-        ]
-        df = pd.DataFrame(data)
-        df.drop(
-            ["volumefrom", "conversionType", "conversionSymbol"], axis=1, inplace=True
-        )
+        """`limit` candles of pair (any number of them) ending at `end` timestamp,
+        with int64 epoch time and float64 OHLCV columns. See history.backfill.
+        Latest candles (no `end`) of CCCAGG data are served from local candle store,
+        which fetches only candles it doesn't have yet. Other requests (exchange,
+        aggregate ...) passed in kwargs go to API directly"""
+        fetch = {
+            "day": self._get_historical_day_prices,
+            "hour": self._get_historical_hour_prices,
+            "minute": self._get_historical_minutes_prices,
+        }[interval]
+
+        def fetch_window(to_ts, window):
+            data = fetch(symbol, currency, window, toTs=to_ts, **kwargs)
+            if data.get("Response") == "Error":
+                raise ValueError(data.get("Message"))
+            return data["Data"]
+
+        if end is None and not kwargs:  # store keeps only default series of pair
+            symbol, currency = to_cryptocompare(symbol), currency.upper()
+            return get_candle_store().load(
+                fetch_window, symbol, currency, interval, limit
+            )
+        return history.backfill(fetch_window, interval, limit, end)
+
+    def get_ohlcv(self, symbol="BTC", currency="USD", interval="1h", limit=100):
+        """`limit` candles of any interval (15m, 4h, 1w ...). They are built locally
+        from candles of the coarsest CryptoCompare interval that divides it (day,
+        hour or minute, see resample.source_interval), those go through the candle
+        store, so API is called only for candles that are not stored yet"""
+        seconds = resample.parse_interval(interval)
+        source = resample.source_interval(seconds)
+        ratio = seconds // history.INTERVALS[source]
+        df = self.get_historical_ohlcv(symbol, currency, source, (limit + 1) * ratio)
+        if ratio > 1:
+            df = resample.resample(df, seconds)
+        return df.tail(limit).reset_index(drop=True)
+
+    @staticmethod
+    def _prices_view(df):
+        df.drop(["volumefrom"], axis=1, inplace=True)
         df["time"] = pd.to_datetime(df["time"], unit="s")
         return df
 
+    def _historical_prices(self, symbol, currency, interval, limit, **kwargs):
+        df = self.get_historical_ohlcv(symbol, currency, interval, limit, **kwargs)
+        return self._prices_view(df)
+
+    def get_historical_prices(
+        self, symbol="BTC", currency="USD", interval="1h", limit=100
+    ):
+        return self._prices_view(self.get_ohlcv(symbol, currency, interval, limit))
+
+    def get_indicators(self, symbol="BTC", currency="USD", interval="1d", limit=100):
+        """Technical indicators of last `limit` candles, see common.indicators"""
+        seconds = resample.parse_interval(interval)
+        df = self.get_ohlcv(symbol, currency, interval, limit + INDICATORS_WARMUP)
+        df = indicators.add_indicators(df, periods_per_year=YEAR / seconds)
+        df = df.tail(limit).reset_index(drop=True)
+        df["time"] = pd.to_datetime(df["time"], unit="s")
+        return df[
+            [
+                "time",
+                "close",
+                "sma_20",
+                "ema_20",
+                "rsi_14",
+                "macd",
+                "macd_signal",
+                "bb_upper",
+                "bb_lower",
+                "atr_14",
+                "volatility",
+            ]
+        ]
+
+    def get_historical_day_prices(
+        self, symbol="BTC", currency="USD", limit=365, **kwargs
+    ):
+        return self._historical_prices(symbol, currency, "day", limit, **kwargs)
+
     def get_historical_hour_prices(
         self, symbol="BTC", currency="USD", limit=60 * 24, **kwargs
     ):
-        data = self._get_historical_hour_prices(symbol, currency, limit, **kwargs)[
-            "Data"
-        ]
-        df = pd.DataFrame(data)
-        df.drop(
-            ["volumefrom", "conversionType", "conversionSymbol"], axis=1, inplace=True
-        )
-        df["time"] = pd.to_datetime(df["time"], unit="s")
-        return df
+        return self._historical_prices(symbol, currency, "hour", limit, **kwargs)
 
     def get_historical_minutes_prices(
         self, symbol="BTC", currency="USD", limit=60 * 24, **kwargs
     ):
-        data = self._get_historical_minutes_prices(symbol, currency, limit, **kwargs)[
-            "Data"
-        ]
-        df = pd.DataFrame(data)
-        df.drop(
-            ["volumefrom", "conversionType", "conversionSymbol"], axis=1, inplace=True
-        )
-        df["time"] = pd.to_datetime(df["time"], unit="s")
-        return df
+        return self._historical_prices(symbol, currency, "minute", limit, **kwargs)
 
     def get_daily_exchange_volume(
         self, currency="USD", exchange="CCCAGG", limit=365, **kwargs
@@ -0,0 +1,56 @@
+import logging
+import time
+import numpy as np
+import pandas as pd
+from moonbag.common import aio
+
+logger = logging.getLogger("cryptocompare-history")
+
+MAX_LIMIT = 2000  # max candles of one /data/histo* request
+# seconds of one candle of histo endpoints
+INTERVALS = {"minute": 60, "hour": 60 * 60, "day": 24 * 60 * 60}
+PRICES = ["open", "high", "low", "close"]
+VOLUMES = ["volumefrom", "volumeto"]
+COLUMNS = ["time"] + PRICES + VOLUMES
+
+
+def windows(end: int, points: int, step: int, limit=MAX_LIMIT) -> list:
+    """(toTs, limit) of requests that together return `points` candles ending at
+    `end`. Endpoint returns limit + 1 candles, the one at toTs included"""
+    end -= end % step
+    calls = []
+    while points > 0:
+        size = min(points, limit)
+        calls.append((end, size - 1))
+        end -= size * step
+        points -= size
+    return calls
+
+
+def to_frame(records: list) -> pd.DataFrame:
+    """Candles sorted by time without duplicates: int64 epoch seconds and float64
+    prices and volumes. Empty candles from before the pair was traded are dropped"""
+    df = pd.DataFrame.from_records(records, columns=COLUMNS)
+    df = df.astype({"time": "int64", **{c: "float64" for c in PRICES + VOLUMES}})
+    df = df[df[PRICES].to_numpy().any(axis=1)]
+    df = df.drop_duplicates("time", keep="last").sort_values("time")
+    return df.reset_index(drop=True)
+
+
+def backfill(fetch_window, interval="day", points=365, end=None) -> pd.DataFrame:
+    """`points` candles of `interval` ending at `end` (epoch seconds, default now).
+
+    History longer than one request is split into windows of MAX_LIMIT candles
+    walking `toTs` backwards, windows are fetched concurrently (per host limits and
+    rate limiting apply) and stitched into one frame. `fetch_window(to_ts, limit)`
+    returns list of candles of one request.
+    """
+    step = INTERVALS[interval]
+    end = int(time.time() if end is None else end)
+    calls = windows(end, points, step)
+    results = aio.fan_out(fetch_window, calls, host="min-api.cryptocompare.com")
+    df = to_frame([candle for window in results for candle in window])
+    gaps = np.count_nonzero(np.diff(df["time"].to_numpy()) != step)
+    if gaps:
+        logger.info(f"{gaps} gaps in {interval} candles")
+    return df
@@ -3,6 +3,7 @@ import sys
 import os
 from moonbag.cryptocompare.cryptocomp import CryptoCompare
 import argparse
+import asyncio
 import logging
 from moonbag.common import LOGO, MOON, print_table
 import pandas as pd
@@ -13,7 +14,10 @@ from moonbag.cryptocompare.utils import (
     print_no_api_key_msg,
 )
 from inspect import signature
+from requests.exceptions import RequestException
 from moonbag.common.utils import MoonParser
+from moonbag.common.retries import deadline, COMMAND_DEADLINE
+from moonbag.common import aio
 
 
 logger = logging.getLogger("compare-menu")
@@ -35,6 +39,7 @@ class Controller:
             "price_day": self.show_day_prices,
             "price_hour": self.show_hour_prices,
             "price_minute": self.show_minute_prices,
+            "indicators": self.show_indicators,
             "orders": self.show_top_orders,
             "top_symbols_ex": self.show_exchanges_by_top_symbol,
             "pair_volume": self.show_top_list_pair_volume,
@@ -81,7 +86,8 @@ class Controller:
             "   orders_snap       show  order book for given pair and exchange. LUNA/BTC,Binance [CryptoCompare]"
         )
         print(
-            "   price             show latest price info for given pair like BTC/USD [CryptoCompare]"
+            "   price             show latest price info for given pair like BTC/USD, "
+            "or many pairs: -c BTC ETH -t USD EUR [CryptoCompare]"
         )
         print(
             "   price_day         show historical prices with 1 day interval [CryptoCompare]"
@@ -92,6 +98,13 @@ class Controller:
         print(
             "   price_minute      show historical prices with 1 min interval [CryptoCompare]"
         )
+        print(
+            "                     other intervals with -i, e.g. price_hour -c BTC -i 4h"
+        )
+        print(
+            "   indicators        show SMA, EMA, RSI, MACD, Bollinger bands, ATR and "
+            "volatility, e.g. -c BTC -i 4h [CryptoCompare]"
+        )
 
         print(
             "   volume_day        show daily volume for given pair. Default: BTC/USD [CryptoCompare]"
@@ -134,13 +147,18 @@ class Controller:
         return
 
     @staticmethod
-    def _get_prices(args):
+    def _get_prices(args, many=False):
+        """Coin, currency and limit, or lists of coins and currencies when `many`"""
         parser = MoonParser(prog="prices", add_help=True, description="get prices")
-        parser.add_coin_argument(required=True)
-        parser.add_to_symbol_argument()
-        parser.add_limit_argument(
-            default=100,
-        )
+        if many:
+            parser.add_coin_argument(nargs="+", help="symbols, names or ids of coins")
+            parser.add_to_symbol_argument(nargs="+", default=["USD"])
+        else:
+            parser.add_coin_argument(required=True)
+            parser.add_to_symbol_argument()
+            parser.add_limit_argument(
+                default=100,
+            )
         parsy, _ = parser.parse_known_args(args)
         return parsy
 
@@ -153,15 +171,22 @@ class Controller:
         )
         parser.add_coin_argument(
             default=7605,
-            help="symbol or id of coin. Default 7605 - > ETH",
+            help="symbol, name, id or contract of coin. Default 7605 - > ETH",
         )
         parsy, _ = parser.parse_known_args(args)
         return parsy
 
     def show_prices(self, args):
-        parsy = self._get_prices(args)
+        parsy = self._get_prices(args, many=True)
+        symbols = [s for arg in parsy.symbol for s in arg.split(",") if s]
+        currencies = [c for arg in parsy.tosymbol for c in arg.split(",") if c]
         try:
-            prices = self.client.get_price(parsy.symbol, parsy.tosymbol)
+            if len(symbols) == 1 and len(currencies) == 1:
+                prices = self.client.get_price(symbols[0], currencies[0])
+            else:
+                prices = self.client.get_price_matrix(symbols, currencies)
+                columns = ["PRICE", "CHANGEPCT24HOUR", "VOLUME24HOUR", "MKTCAP"]
+                prices = prices[columns].reset_index()
         except ValueError as e:
             print(f"{e}, To check list of coins use command: coins ")
             return
@@ -184,13 +209,16 @@ class Controller:
         )
 
         parsy, others = parser.parse_known_args(args)
-        coin_df = self.client.coin_list
-        coins = dict(zip(coin_df["Symbol"], coin_df["FullName"]))
+        coins = self.client.coin_names
 
         if parsy.key == "name":
-            res = get_closes_matches_by_name(parsy.symbol, coins)
+            res = get_closes_matches_by_name(
+                parsy.symbol, coins, self.client.name_index
+            )
         else:
-            res = get_closes_matches_by_symbol(parsy.symbol, coins)
+            res = get_closes_matches_by_symbol(
+                parsy.symbol, coins, self.client.symbol_index
+            )
         if res:
             df = pd.Series(res).to_frame().reset_index()
             df.columns = ["Symbol", "Name"]
@@ -258,41 +286,61 @@ class Controller:
             return
         print_table(df)
 
-    def show_day_prices(self, args):
-        parsy = self._get_prices(args)
+    @staticmethod
+    def _get_historical_prices(args):
+        parser = MoonParser(prog="prices", add_help=True, description="get prices")
+        parser.add_coin_argument(required=True)
+        parser.add_to_symbol_argument()
+        parser.add_limit_argument(
+            default=None,
+            help="Number of candles, longer history is fetched in parts",
+        )
+        parser.add_argument(
+            "-i",
+            "--interval",
+            dest="interval",
+            type=str,
+            default=None,
+            help="Interval of candles e.g. 15m, 4h, 1d, 1w. Built from stored candles",
+        )
+        parsy, _ = parser.parse_known_args(args)
+        return parsy
+
+    def _show_historical_prices(self, args, interval, limit, name):
+        parsy = self._get_historical_prices(args)
+        interval = parsy.interval or interval
         try:
-            prices = self.client.get_historical_day_prices(
-                parsy.symbol, parsy.tosymbol, parsy.limit
+            prices = self.client.get_historical_prices(
+                parsy.symbol, parsy.tosymbol, interval, parsy.limit or limit
             )
         except ValueError as e:
             print(f"{e}, ")
             return
-        print(f"Day prices for {parsy.symbol}/{parsy.tosymbol}")
+        name = f"{interval} candles" if parsy.interval else name
+        print(f"{name} for {parsy.symbol}/{parsy.tosymbol}")
         print_table(prices)
 
+    def show_day_prices(self, args):
+        self._show_historical_prices(args, "1d", 100, "Day prices")
+
     def show_hour_prices(self, args):
-        parsy = self._get_prices(args)
-        try:
-            prices = self.client.get_historical_hour_prices(
-                parsy.symbol, parsy.tosymbol
-            )
-        except ValueError as e:
-            print(f"{e}, ")
-            return
-        print(f"Hour prices for {parsy.symbol}/{parsy.tosymbol}")
-        print_table(prices)
+        self._show_historical_prices(args, "1h", 60 * 24, "Hour prices")
 
     def show_minute_prices(self, args):
-        parsy = self._get_prices(args)
+        self._show_historical_prices(args, "1m", 60 * 24, "Minute prices")
+
+    def show_indicators(self, args):
+        parsy = self._get_historical_prices(args)
+        interval = parsy.interval or "1d"
         try:
-            prices = self.client.get_historical_minutes_prices(
-                parsy.symbol, parsy.tosymbol
+            df = self.client.get_indicators(
+                parsy.symbol, parsy.tosymbol, interval, parsy.limit or 100
             )
         except ValueError as e:
             print(f"{e}, ")
             return
-        print(f"Minute prices for {parsy.symbol}/{parsy.tosymbol}")
-        print_table(prices)
+        print(f"{interval} indicators for {parsy.symbol}/{parsy.tosymbol}")
+        print_table(df)
 
     def show_trading_signals(self, args):
         parser = MoonParser(
@@ -425,17 +473,28 @@ class Controller:
         if not parsy:
             return
 
-        if parsy.symbol.upper() not in self.client.blockchain_coins_list:
+        async def fetch():
+            # both calls are independent, so we fetch them at once
+            return await asyncio.gather(
+                aio.run_blocking(lambda: self.client.blockchain_coins_list),
+                aio.run_blocking(
+                    self.client.get_latest_blockchain_data, parsy.symbol
+                ),
+                return_exceptions=True,
+            )
+
+        coins, df = aio.run(fetch())
+        if isinstance(coins, Exception) or parsy.symbol.upper() not in coins:
             print(
                 f"{parsy.symbol} not found in blockchain data list. Use onchain "
                 f"to see available coins for onchain data"
             )
             return
-        try:
-            df = self.client.get_latest_blockchain_data(parsy.symbol)
-        except ValueError as e:
-            print(f"{e}")
+        if isinstance(df, ValueError):
+            print(f"{df}")
             return
+        elif isinstance(df, Exception):
+            raise df
         print_table(df)
 
     def show_histo_blockchain_data(self, args):
@@ -532,36 +591,20 @@ class Controller:
 
     def show_latest_socials(self, args):
         parsy = self._show_socials(args)
-        if isinstance(parsy.symbol, str) and parsy.symbol.isalpha():
-            coin_id = self.client.coin_mapping.get(parsy.symbol.upper())
-            if coin_id:
-                df = self.client.get_latest_social_coin_stats(coin_id=coin_id)
-            else:
-                print(
-                    f"Could'nt find coin {parsy.symbol}. To see list of coins use coins command"
-                )
-                return
-        elif isinstance(parsy.symbol, int) or parsy.symbol.isdigit():
-            df = self.client.get_latest_social_coin_stats(coin_id=int(parsy.symbol))
-        else:
-            df = pd.DataFrame()
+        try:
+            df = self.client.get_latest_social_coin_stats(coin_id=parsy.symbol)
+        except ValueError as e:
+            print(f"{e}. To see list of coins use coins command")
+            return
         print_table(df)
 
     def show_histo_socials(self, args):
         parsy = self._show_socials(args)
-        if isinstance(parsy.symbol, str) and parsy.symbol.isalpha():
-            coin_id = self.client.coin_mapping.get(parsy.symbol.upper())
-            if coin_id:
-                df = self.client.get_historical_social_stats(coin_id=coin_id)
-            else:
-                print(
-                    f"Could'nt find coin {parsy.symbol}. To see list of coins use coins command"
-                )
-                return
-        elif isinstance(parsy.symbol, int) or parsy.symbol.isdigit():
-            df = self.client.get_historical_social_stats(coin_id=int(parsy.symbol))
-        else:
-            df = pd.DataFrame()
+        try:
+            df = self.client.get_historical_social_stats(coin_id=parsy.symbol)
+        except ValueError as e:
+            print(f"{e}. To see list of coins use coins command")
+            return
         print_table(df, floatfmt=".0f")
 
 
@@ -600,10 +643,15 @@ def main():
             elif callable(
                 view
             ):  # If function takes params return func(args), else func()
-                if len(signature(view).parameters) > 0:
-                    view(others)
-                else:
-                    view()
+                with deadline(COMMAND_DEADLINE):
+                    if len(signature(view).parameters) > 0:
+                        view(others)
+                    else:
+                        view()
+
+        except RequestException as e:
+            print(f"{e}\n")
+            continue
 
         except ArgumentError:
             print("The command selected doesn't exist")
@@ -0,0 +1,56 @@
+import re
+import numpy as np
+import pandas as pd
+from moonbag.cryptocompare.history import INTERVALS
+
+UNITS = {"m": 60, "h": 60 * 60, "d": 24 * 60 * 60, "w": 7 * 24 * 60 * 60}
+WEEK_ORIGIN = 4 * UNITS["d"]  # 1970-01-05, weeks start on Monday like exchanges do
+
+
+def parse_interval(interval: str) -> int:
+    """Seconds of interval like 15m, 4h, 1d, 1w"""
+    match = re.fullmatch(r"(\d*)([mhdw])", interval.strip().lower())
+    seconds = int(match.group(1) or 1) * UNITS[match.group(2)] if match else 0
+    if not seconds:
+        raise ValueError(f"Wrong interval {interval}, use e.g. 15m, 1h, 4h, 1d, 1w")
+    return seconds
+
+
+def source_interval(seconds: int) -> str:
+    """Coarsest CryptoCompare interval that candles of `seconds` can be built from"""
+    for name in ("day", "hour", "minute"):
+        if seconds % INTERVALS[name] == 0:
+            return name
+    raise ValueError(f"Interval of {seconds} seconds isn't multiple of minute")
+
+
+def resample(df: pd.DataFrame, seconds: int, origin=None) -> pd.DataFrame:
+    """Aggregate sorted candles into candles of `seconds`: first open, max high,
+    min low, last close and summed volumes of every group. Groups are found with
+    one pass of np.diff and reduced with ufunc.reduceat, there are no loops over
+    rows. Time of candle is start of its period counted from `origin`"""
+    if origin is None:
+        origin = WEEK_ORIGIN if seconds % UNITS["w"] == 0 else 0
+    times = df["time"].to_numpy(dtype="int64")
+    if not len(times):
+        return df.copy()
+    buckets = (times - origin) // seconds
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    ends = np.append(starts[1:], len(times)) - 1
+
+    columns = {"time": buckets[starts] * seconds + origin}
+    for name in df.columns:
+        if name == "time":
+            continue
+        values = df[name].to_numpy(dtype="float64")
+        if name == "open":
+            columns[name] = values[starts]
+        elif name == "close":
+            columns[name] = values[ends]
+        elif name == "high":
+            columns[name] = np.fmax.reduceat(values, starts)
+        elif name == "low":
+            columns[name] = np.fmin.reduceat(values, starts)
+        else:  # volumes
+            columns[name] = np.add.reduceat(values, starts)
+    return pd.DataFrame(columns)
@@ -0,0 +1,177 @@
+import logging
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from moonbag.common import cache
+from moonbag.cryptocompare.history import INTERVALS, backfill
+
+logger = logging.getLogger("cryptocompare-store")
+
+# one candle on disk, files are plain arrays of these read with np.memmap
+CANDLE = np.dtype(
+    [
+        ("time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volumefrom", "<f8"),
+        ("volumeto", "<f8"),
+    ]
+)
+INDEX_FILE = "index.json"
+
+
+def to_records(df: pd.DataFrame) -> np.ndarray:
+    records = np.empty(len(df), dtype=CANDLE)
+    for name in CANDLE.names:
+        records[name] = df[name].to_numpy()
+    return records
+
+
+def to_frame(records: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({name: np.array(records[name]) for name in CANDLE.names})
+
+
+class CandleStore:
+    """Candles of (fsym, tsym, interval) kept in moonbag data directory.
+
+    Every series is an append-only file of closed candles. `load` fetches only
+    candles newer than the last stored one (the high-water mark), plus older ones
+    when longer history is asked for than was stored so far. The open candle is
+    always fetched and never stored, because it changes until its period ends.
+    Files are read with np.memmap, so only requested part of series is loaded.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.path.dirname(cache.data_path("candles", INDEX_FILE))
+        os.makedirs(self.root, exist_ok=True)
+        self._locks = {}  # series key -> lock, network calls are made without it
+        self._lock = threading.Lock()
+
+    def path(self, fsym, tsym, interval) -> str:
+        return os.path.join(self.root, f"{fsym}_{tsym}_{interval}.bin")
+
+    def read(self, fsym, tsym, interval) -> np.ndarray:
+        """Stored candles, memory mapped"""
+        path = self.path(fsym, tsym, interval)
+        try:
+            count = os.path.getsize(path) // CANDLE.itemsize  # ignore torn write
+        except OSError:
+            count = 0
+        if not count:
+            return np.empty(0, dtype=CANDLE)
+        return np.memmap(path, dtype=CANDLE, mode="r", shape=(count,))
+
+    def append(self, fsym, tsym, interval, records: np.ndarray) -> int:
+        """Add candles newer than the last stored one, return how many were added"""
+        stored = self.read(fsym, tsym, interval)
+        if len(stored):
+            records = records[records["time"] > stored["time"][-1]]
+        if len(records):
+            with open(self.path(fsym, tsym, interval), "ab") as f:
+                f.write(np.ascontiguousarray(records).tobytes())
+        return len(records)
+
+    def _replace(self, fsym, tsym, interval, records: np.ndarray):
+        path = self.path(fsym, tsym, interval)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(np.ascontiguousarray(records).tobytes())
+        os.replace(tmp, path)
+
+    def _covered(self) -> dict:
+        """Series name -> time since which history was fetched. Stored candles can
+        start later, when pair wasn't traded before"""
+        return cache.load_json(os.path.join(self.root, INDEX_FILE)) or {}
+
+    def _set_covered(self, name, since):
+        with self._lock:
+            covered = self._covered()
+            covered[name] = since
+            cache.dump_json(os.path.join(self.root, INDEX_FILE), covered)
+
+    def _key_lock(self, key) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def load(self, fetch_window, fsym, tsym, interval, points, now=None):
+        """`points` latest candles of pair, the last one is open (current) candle.
+        `fetch_window(to_ts, limit)` makes one request, see history.backfill.
+
+        Stored series stays contiguous: candles missing since the high-water mark
+        are fetched with the new ones, unless the gap is longer than `points`, then
+        the old series is dropped and stored again from `since`."""
+        step = INTERVALS[interval]
+        now = int(time.time() if now is None else now)
+        current = now - now % step
+        since = current - (points - 1) * step
+        key = (fsym.upper(), tsym.upper(), interval)
+        name = "_".join(key)
+        lock = self._key_lock(key)
+
+        with lock:
+            covered = self._covered().get(name)
+            stored = self.read(*key)
+        reset = len(stored) and (since - int(stored["time"][-1])) // step > points
+        if reset or not len(stored):
+            first, last, covered = None, since - step, None
+        else:
+            first, last = int(stored["time"][0]), int(stored["time"][-1])
+            covered = first if covered is None else covered
+
+        older = None
+        if first is not None and since < covered:
+            older = backfill(
+                fetch_window, interval, (covered - since) // step, covered - step
+            )
+        fresh = backfill(
+            fetch_window, interval, max(1, (current - last) // step), current
+        )
+        fresh = fresh[fresh["time"] > last]
+
+        with lock:
+            if reset:
+                self._replace(*key, np.empty(0, dtype=CANDLE))
+            stored = self.read(*key)
+            if older is not None and len(stored):
+                older = older[older["time"] < stored["time"][0]]
+                self._replace(*key, np.concatenate([to_records(older), stored]))
+                logger.info(f"{len(older)} older candles of {key} stored")
+            closed = to_records(fresh[fresh["time"] < current])
+            stored = self.read(*key)
+            if len(stored):
+                closed = closed[closed["time"] > stored["time"][-1]]
+                times = np.concatenate([stored["time"][-1:], closed["time"]])
+            else:
+                times = closed["time"]
+            # never store a hole (missing candles, or other call reset the series),
+            # only candles before the first one are stored, all are returned
+            holes = np.flatnonzero(np.diff(times) != step)
+            if len(holes):
+                logger.info(f"Candles of {key} not contiguous, {len(holes)} holes")
+                closed = closed[: holes[0] + (0 if len(stored) else 1)]
+            self.append(*key, closed)
+            self._set_covered(name, since if covered is None else min(covered, since))
+            stored = self.read(*key)
+
+        start = np.searchsorted(stored["time"], since)
+        df = pd.concat([to_frame(stored[start:]), fresh], ignore_index=True)
+        df = df.drop_duplicates("time", keep="last").sort_values("time")
+        return df[df["time"] >= since].reset_index(drop=True)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_candle_store() -> CandleStore:
+    """Return shared candle store, create it on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CandleStore()
+    return _store
@@ -1,35 +1,36 @@
 import pandas as pd
-import difflib
 import logging
 import argparse
+from moonbag.common.fuzzy import FuzzyIndex
 
 
 logger = logging.getLogger("cryptocompare-utils")
 
-# TODO Make those algorithms better for name
-def get_closes_matches_by_name(name: str, coins: dict):  # pragma: no cover
-    sim = difflib.get_close_matches(name, list(coins.values()), 10, cutoff=0.3)
-    res = {}
-    try:
-        for s in sim:
-            for k, v in coins.items():
-                if s == v:
-                    res[k] = v
-                else:
-                    continue
-    except TypeError as e:
-        logger.log(2, e)
-    return res
-
-
-def get_closes_matches_by_symbol(symbol: str, coins: dict):  # pragma: no cover
-    sim = difflib.get_close_matches(symbol.upper(), list(coins.keys()), 10, cutoff=0.5)
-    try:
-        res = {s: coins.get(s) for s in sim}
-    except TypeError as e:
-        logger.log(2, e)
-        res = {}
-    return res
+def get_closes_matches_by_name(name: str, coins: dict, index: FuzzyIndex = None):
+    """Coins (symbol: name) with names closest to given one. Pass prebuilt index of
+    coins names (in the same order as coins) to avoid building it on every call"""
+    symbols = list(coins)
+    index = index or FuzzyIndex(coins.values())
+    return {symbols[i]: index.keys[i] for i, _ in index.search(name, 10, cutoff=0.3)}
+
+
+def get_closes_matches_by_symbol(symbol: str, coins: dict, index: FuzzyIndex = None):
+    """Coins (symbol: name) with symbols closest to given one"""
+    index = index or FuzzyIndex(coins)
+    return {s: coins.get(s) for s in index.matches(symbol.upper(), 10, cutoff=0.5)}
+
+
+def chunk_symbols(symbols: list, max_length: int) -> list:
+    """Split symbols into comma separated strings not longer than max_length"""
+    chunks, chunk = [], ""
+    for symbol in symbols:
+        if chunk and len(chunk) + 1 + len(symbol) > max_length:
+            chunks.append(chunk)
+            chunk = ""
+        chunk = f"{chunk},{symbol}" if chunk else symbol
+    if chunk:
+        chunks.append(chunk)
+    return chunks
 
 
 def create_dct_mapping_from_df(df, col1, col2):
@@ -1,24 +1,32 @@
 import datetime
 from moonbag.common.utils import created_date
-import requests
+from moonbag.common import transport
+from moonbag.common.aio import async_methods
+from moonbag.common.breaker import CircuitOpen
 import pandas as pd
 from moonbag.common.keys import BIT_QUERY_API
 import logging
 
 
+@async_methods(prefixes=("run_query",))
 class GraphClient:
     UNI = "https://api.thegraph.com/subgraphs/name/uniswap/uniswap-v2"
     BQ = "https://graphql.bitquery.io"
     CMP = "https://api.thegraph.com/subgraphs/name/graphprotocol/compound-v2"
+    CACHE_TTL = 5 * 60
 
     @staticmethod
     def run_query(
         url, query
     ):  # A simple function to use requests.post to make the API call. Note the json= section.
         headers = {"x-api-key" : BIT_QUERY_API}
-        request = requests.post(url, json={"query": query},
-                                headers=headers
-                                )
+        try:
+            request = transport.post(url, json={"query": query},
+                                    headers=headers
+                                    )
+        except CircuitOpen as e:
+            print(e)
+            return None
         if request.status_code == 200:
             return request.json()["data"]
         else:
@@ -261,3 +269,9 @@ class GraphClient:
         df["timestamp"] = df["timestamp"].apply(lambda x: created_date(int(x)))
         df.columns = ["amountUSD", "timestamp", "token0", "token1"]
         return df[["timestamp", "token0", "token1", "amountUSD", "timestamp"]]
+
+
+transport.register_ttls(
+    "https://api.thegraph.com/subgraphs/name", {"{}/{}": GraphClient.CACHE_TTL}
+)
+transport.register_ttls(GraphClient.BQ, {"": GraphClient.CACHE_TTL})
@@ -1,6 +1,7 @@
-import requests
+from moonbag.common import transport
 import pandas as pd
 import cachetools.func
+from functools import cached_property
 from moonbag.common.utils import table_formatter
 from moonbag.discover.defi.utils import get_slug_mappings
 
@@ -8,13 +9,11 @@ from moonbag.discover.defi.utils import get_slug_mappings
 class LLama:
     URL = "https://api.llama.fi/"
     ENDPOINTS = {"protocols": "protocols", "protocol": "protocol/"}
-
-    def __init__(self):
-        self._symbols = get_slug_mappings(self._get_protocols())
+    CACHE_TTL = {"protocols": 10 * 60, "protocol/{}": 10 * 60}
 
     @cachetools.func.ttl_cache(maxsize=128, ttl=10 * 60)
     def _get_protocols(self):
-        resp = requests.get(self.URL + self.ENDPOINTS.get("protocols"))
+        resp = transport.get(self.URL + self.ENDPOINTS.get("protocols"))
         resp.raise_for_status()
         return resp.json()
 
@@ -41,9 +40,9 @@ class LLama:
         df["chains"] = df["chains"].apply(lambda x: ",".join(x))
         return df
 
-    @property
+    @cached_property
     def symbols(self):
-        return self._symbols
+        return get_slug_mappings(self._get_protocols())
 
     @cachetools.func.ttl_cache(maxsize=128, ttl=10 * 60)
     def _get_protocol(self, protocol: str):
@@ -60,7 +59,7 @@ class LLama:
                 f"Wrong protocol name\nPlease chose protocol name from list\n{self.symbols}"
             )
 
-        resp = requests.get(self.URL + self.ENDPOINTS.get("protocol") + protocol)
+        resp = transport.get(self.URL + self.ENDPOINTS.get("protocol") + protocol)
         resp.raise_for_status()
         return resp.json()
 
@@ -79,3 +78,6 @@ class LLama:
         df = pd.json_normalize(data)
         df["date"] = pd.to_datetime(df["date"], unit="s")
         return df
+
+
+transport.register_ttls(LLama.URL, LLama.CACHE_TTL)
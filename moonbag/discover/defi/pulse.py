@@ -1,11 +1,19 @@
-import requests
+from moonbag.common import transport
+from moonbag.common.breaker import CircuitOpen
 from bs4 import BeautifulSoup
 import pandas as pd
 from moonbag.common import print_table
 
+URL = "https://defipulse.com/"
+transport.register_ttls(URL, {"": 10 * 60})
+
 
 def get_dpi():
-    req = requests.get("https://defipulse.com/")
+    try:
+        req = transport.get(URL)
+    except CircuitOpen as e:
+        print(e)
+        return pd.DataFrame()
     result = req.content.decode("utf8")
     soup = BeautifulSoup(result, features="lxml")
     table = soup.find("tbody").find_all("tr")
@@ -4,13 +4,15 @@ import os
 import argparse
 import logging
 import time
+from functools import cached_property
 
 from moonbag.common import LOGO, MOON, print_table
 from argparse import ArgumentError
 from inspect import signature
+from requests.exceptions import RequestException
 from moonbag.common.utils import MoonParser
+from moonbag.common.retries import deadline, COMMAND_DEADLINE
 from moonbag.discover.defi import graph, llama, pulse
-from moonbag.discover.reddit_client import reddit
 from moonbag.discover.others import wales
 from moonbag.discover.others import fng, funding, fourchan, cryptopanic
 
@@ -19,7 +21,6 @@ logger = logging.getLogger("discover-menu")
 
 class Controller:
     def __init__(self):
-        self.reddit = reddit.Reddit()
         self.graph = graph.GraphClient()
         self.parser = argparse.ArgumentParser(prog="discover", add_help=False)
         self.parser.add_argument("cmd")
@@ -42,6 +43,13 @@ class Controller:
             "uni_swaps": self.show_last_swaps_uni,
         }
 
+    @cached_property
+    def reddit(self):
+        # praw and psaw are heavy, so they are imported with first reddit command
+        from moonbag.discover.reddit_client import reddit
+
+        return reddit.Reddit()
+
     @staticmethod
     def help():
         print("Main commands:")
@@ -465,13 +473,18 @@ def main():
             elif callable(
                 view
             ):  # If function takes params return func(args), else func()
-                if len(signature(view).parameters) > 0:
-                    view(others)
-                else:
-                    view()
+                with deadline(COMMAND_DEADLINE):
+                    if len(signature(view).parameters) > 0:
+                        view(others)
+                    else:
+                        view()
             else:
                 print("Command not found")
 
+        except RequestException as e:
+            print(f"{e}\n")
+            continue
+
         except ArgumentError:
             print("The command selected doesn't exist")
             print("\n")
@@ -1,8 +1,7 @@
 import time
 import pandas as pd
 import textwrap
-import requests
-from requests.adapters import HTTPAdapter
+from moonbag.common import transport
 from moonbag.common import print_table
 from moonbag.common.keys import CRYPTO_PANIC_API
 
@@ -12,8 +11,7 @@ class CryptoPanic:
 
     def __init__(self):
         self.api_key = CRYPTO_PANIC_API or ""
-        self.s = requests.Session()
-        self.s.mount(self.BASE_URL, HTTPAdapter(max_retries=5))
+        self.s = transport.get_session()
 
     @staticmethod
     def parse_post(post):
@@ -33,7 +31,7 @@ class CryptoPanic:
 
         url = f"{self.BASE_URL}/posts/?auth_token={self.api_key}" + f"&kind={kind}"
         print(f"Fetching page: 0")
-        first_page = requests.get(url).json()
+        first_page = self.s.get(url).json()
 
         if first_page == {
             "status": "Incomplete",
@@ -53,7 +51,7 @@ class CryptoPanic:
             print(f"Fetching page: {counter}")
             try:
                 time.sleep(0.1)
-                res = requests.get(next_page).json()
+                res = self.s.get(next_page).json()
                 for post in res["results"]:
                     results.append(self.parse_post(post))
                 next_page = res.get("next")
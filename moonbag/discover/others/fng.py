@@ -1,5 +1,5 @@
 import pandas as pd
-import requests
+from moonbag.common import transport
 import datetime
 
 # https://github.com/RaidasGrisk/reddit-coin-app/blob/master/app/main.py
@@ -10,7 +10,7 @@ def get_fng(limit=60):
     if not isinstance(limit, int) and limit < 1:
         limit = 30
     url = f"https://api.alternative.me/fng/?limit={limit}"
-    data = requests.get(url=url).json()["data"]
+    data = transport.get(url).json()["data"]
     df = pd.DataFrame(data)[["timestamp", "value_classification", "value"]]
     df["timestamp"] = df["timestamp"].apply(
         lambda x: datetime.datetime.fromtimestamp((int(x)))
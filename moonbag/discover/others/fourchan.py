@@ -1,7 +1,7 @@
 import pandas as pd
 import datetime
 import textwrap
-import requests
+from moonbag.common import transport
 import numpy as np
 import re
 
@@ -12,7 +12,7 @@ def html_clearer(text):
 
 
 def get_last_4chans():
-    r = requests.get("https://a.4cdn.org/biz/catalog.json").json()
+    r = transport.get("https://a.4cdn.org/biz/catalog.json").json()
     data = []
     for item in r:
         threads = item["threads"]
@@ -1,11 +1,11 @@
 import pandas as pd
-import requests
+from moonbag.common import transport
 from bs4 import BeautifulSoup
 
 
 def get_funding_rates(current=True):
     url = "https://defirate.com/funding/"
-    req = requests.get(url)
+    req = transport.get(url)
     soup = BeautifulSoup(req.text, features="lxml")
     if current:
         print("\nDisplaying current Funding Rates\n")
@@ -1,4 +1,4 @@
-import requests
+from moonbag.common import transport
 import time
 from moonbag.common.keys import WALES_API_KEY
 import pandas as pd
@@ -8,7 +8,7 @@ import textwrap
 def _get_wales_stats(min_value=1000000):
     req = f"https://api.whale-alert.io/v1/transactions?api_key={WALES_API_KEY}"
     params = {"min_value": min_value, "start": int(time.time()) - 3000}
-    return requests.get(url=req, params=params).json()
+    return transport.get(req, params=params).json()
 
 
 def get_wales_stats():
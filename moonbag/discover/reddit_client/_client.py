@@ -1,5 +1,5 @@
 import praw
-import requests
+from moonbag.common import transport
 from functools import lru_cache
 from moonbag.common import keys
 from psaw import PushshiftAPI
@@ -32,5 +32,5 @@ class RedditClient:
     def _search_psaw_data(self, data_type, **kwargs):
         base_url = f"https://api.pushshift.io/reddit/{data_type}/search"
         payload = kwargs
-        request = requests.get(base_url, params=payload)
+        request = transport.get(base_url, params=payload)
         return request.json()
@@ -1,9 +1,9 @@
-import time
 import logging
 import pandas as pd
 import textwrap
 from moonbag.discover.reddit_client._client import RedditClient, praw
 from moonbag.common.utils import created_date
+from moonbag.common import aio
 import datetime
 from typing import Union
 
@@ -173,24 +173,31 @@ class Reddit(RedditClient):
                 return pd.DataFrame()
         return df.sort_values(by="created", ascending=False)
 
+    def _get_popular_submissions(self, subreddit):
+        print(f"Searching data for subreddit: {subreddit}")
+        subm = self.psaw.search_submissions(
+            subreddit=subreddit, limit=1000, score=">50", after="7d"
+        )
+        return [
+            dict(
+                created=created_date(s.created_utc),
+                comments=s.num_comments,
+                score=s.score,
+                subreddit=s.subreddit,
+                title=s.title,
+            )
+            for s in subm
+        ]
+
     def get_popular_submissions(self):
         results = []
-        for sub in CRYPTO_SUBREDDITS:
-            print(f"Searching data for subreddit: {sub}")
-            time.sleep(0.3)
-            subm = self.psaw.search_submissions(
-                subreddit=sub, limit=1000, score=">50", after="7d"
-            )
-            for s in subm:
-                results.append(
-                    dict(
-                        created=created_date(s.created_utc),
-                        comments=s.num_comments,
-                        score=s.score,
-                        subreddit=s.subreddit,
-                        title=s.title,
-                    )
-                )
+        for submissions in aio.fan_out(
+            self._get_popular_submissions,
+            CRYPTO_SUBREDDITS,
+            host="api.pushshift.io",
+            partial=True,
+        ):
+            results.extend(submissions)
 
         df = pd.DataFrame(results).sort_values(by="score", ascending=False)
         df["title"] = df["title"].apply(
@@ -1,13 +1,15 @@
 import argparse
-from moonbag.gecko.gecko import get_coin_list, Coin
+from moonbag.gecko.gecko import get_coin_list, Coin, compare_coins
+from moonbag.gecko.registry import get_registry
 import logging
 from moonbag.common import LOGO, MOON, print_table
 from typing import List
 import textwrap
 from inspect import signature
-import difflib
 import pandas as pd
 from argparse import ArgumentError
+from requests.exceptions import RequestException
+from moonbag.common.retries import deadline, COMMAND_DEADLINE
 
 logger = logging.getLogger("gecko-menu")
 
@@ -26,12 +28,14 @@ class Controller:
             "market": self.show_market,
             "social": self.show_socials,
             "ath": self.show_ath,
+            "scores": self.show_scores,
             "atl": self.show_atl,
             "coinlist": self.show_list_of_coins,
             "explorers": self.show_bcexplores,
         }
 
         self.coin = None
+        self.coins = []  # all loaded coins, self.coin is the first one
 
     @staticmethod
     def help():
@@ -45,9 +49,13 @@ class Controller:
             "    similar          don't remember symbol of coin ? Look for closest matches [Coingecko]"
         )
         print("    load             load coin, example: 'load -c uniswap' [Coingecko]")
+        print(
+            "                     or coins to compare: 'load -c bitcoin ethereum solana'"
+        )
         print("    coinlist         show list of all coins available in [Coingecko]")
         print("    info             show info about loaded coin [Coingecko]")
         print("    market           show market info about loaded coin [Coingecko]")
+        print("    scores           show scores of loaded coin [Coingecko]")
         print(
             "    devs             show development information about loaded coins [Coingecko]"
         )
@@ -69,30 +77,47 @@ class Controller:
         parser.add_argument(
             "-c",
             "--coin",
-            help="Coin to get",
+            help="Coin to get, more coins are shown side by side",
             dest="coin",
             required=True,
+            nargs="+",
             type=str,
         )
 
         if not args:
             return
 
-        if "-" not in args[0]:
+        if not args[0].startswith("-"):
             args.insert(0, "-c")
 
         parsy, _ = parser.parse_known_args(args)
         if not parsy:
             return
 
-        try:
-            self.coin = Coin(parsy.coin)
-        except ValueError as e:
-            print(f"{e}, To check list of coins use command: coinlist ")
-            return
-
-        else:
-            print(f"Coin loaded {self.coin.coin_symbol}")
+        loaded = {}  # coin id -> (symbol, coin), symbols of one coin load it once
+        for symbol in dict.fromkeys(parsy.coin):
+            try:
+                coin = Coin(symbol)
+            except ValueError as e:
+                print(f"{e}, To check list of coins use command: coinlist ")
+                return
+            loaded.setdefault(coin.coin_symbol, (symbol, coin))
+        coins = [coin for _, coin in loaded.values()]
+        self.coins, self.coin = coins, coins[0]
+
+        print(f"Coin loaded {', '.join(c.coin_symbol for c in coins)}")
+        for symbol, coin in loaded.values():
+            if coin.alternatives:
+                print(
+                    f"{symbol} matches also: {', '.join(coin.alternatives)}. "
+                    "Use id of coin to load one of them."
+                )
+
+    def _view(self, attribute):
+        """View of loaded coin, or of all loaded coins side by side"""
+        if len(self.coins) > 1:
+            return compare_coins(self.coins, attribute)
+        return getattr(self.coin, attribute)
 
     @property
     def _is_loaded(self):
@@ -120,38 +145,38 @@ class Controller:
         self,
     ):
         if self._is_loaded:
-            df = self.coin.scores
+            df = self._view("scores")
+            width = 200 // (len(df.columns) - 1)
             df = df.applymap(
-                lambda x: "\n".join(textwrap.wrap(x, width=200))
+                lambda x: "\n".join(textwrap.wrap(x, width=width))
                 if isinstance(x, str)
                 else x
             )
-            df.columns = ["Metric", "Value"]
             print_table(df)
 
     def show_market(self):
         if self._is_loaded:
-            df = self.coin.market_data
+            df = self._view("market_data")
             print_table(df)
 
     def show_atl(
         self,
     ):
         if self._is_loaded:
-            print_table(self.coin.all_time_low)
+            print_table(self._view("all_time_low"))
 
     def show_ath(
         self,
     ):
         if self._is_loaded:
-            df = self.coin.all_time_high
+            df = self._view("all_time_high")
             print_table(df)
 
     def show_developers(
         self,
     ):
         if self._is_loaded:
-            print_table(self.coin.developers_data)
+            print_table(self._view("developers_data"))
 
     def show_bcexplores(
         self,
@@ -195,8 +220,7 @@ class Controller:
         if not parsy or parsy.symbol is None:
             return
 
-        coins = get_coin_list().id.to_list()
-        sim = difflib.get_close_matches(parsy.symbol, coins, 10)
+        sim = get_registry().similar(parsy.symbol, 10)
         df = pd.Series(sim).to_frame().reset_index()
         df.columns = ["Index", "Name"]
         print_table(df)
@@ -224,17 +248,21 @@ def main():
                 return False
 
             view = c.mapper.get(cmd)
-            if c.coin:
-                print("\n>>> Loaded coin: ", c.coin, " <<<")
+            if c.coins:
+                print("\n>>> Loaded coin: ", ", ".join(map(str, c.coins)), " <<<")
             if view is None:
                 continue
             elif callable(
                 view
             ):  # If function takes params return func(args), else func()
-                if len(signature(view).parameters) > 0:
-                    view(others)
-                else:
-                    view()
+                with deadline(COMMAND_DEADLINE):
+                    if len(signature(view).parameters) > 0:
+                        view(others)
+                    else:
+                        view()
+        except RequestException as e:
+            print(f"{e}\n")
+            continue
         except ArgumentError:
             print("The command selected doesn't exist")
             print("\n")
@@ -0,0 +1,79 @@
+import logging
+import threading
+import pandas as pd
+from moonbag.common import aio
+from moonbag.common.snapshot import Snapshot
+
+logger = logging.getLogger("gecko-exchanges")
+
+PER_PAGE = 250  # max page size of /exchanges
+BATCH = 4  # pages requested concurrently, next batch only when all of them were full
+MAX_PAGES = 40
+MAX_AGE = 10 * 60  # the same as http cache of /exchanges and /derivatives
+
+
+def fetch_all_pages(fetch_page, per_page=PER_PAGE, batch=BATCH, max_pages=MAX_PAGES):
+    """Records of every page of paginated endpoint. Pages are fetched concurrently in
+    batches, until a page shorter than `per_page` shows the end of the list"""
+    records, first = [], 1
+    while first <= max_pages:
+        pages = range(first, min(first + batch, max_pages + 1))
+        results = aio.fan_out(fetch_page, pages, host="api.coingecko.com")
+        for page in results:
+            records += page
+        if any(len(page) < per_page for page in results):
+            break
+        first += batch
+    return records
+
+
+class Exchanges(Snapshot):
+    """All exchanges listed on CoinGecko, from every page of /exchanges"""
+
+    def __init__(self, path=None, max_age=MAX_AGE):
+        super().__init__("gecko_exchanges", max_age=max_age, path=path)
+
+    def _fetch_page(self, page) -> list:
+        from moonbag.gecko.gecko import GeckoClient
+
+        return GeckoClient().get_exchanges_list(per_page=PER_PAGE, page=page)
+
+    def _fetch(self) -> pd.DataFrame:
+        return pd.DataFrame(fetch_all_pages(self._fetch_page))
+
+
+class Derivatives(Snapshot):
+    """Unexpired derivatives tickers from /derivatives, one slow request"""
+
+    def __init__(self, path=None, max_age=MAX_AGE):
+        super().__init__("gecko_derivatives", max_age=max_age, path=path)
+
+    def _fetch(self) -> pd.DataFrame:
+        from moonbag.gecko.gecko import GeckoClient
+
+        return pd.DataFrame(GeckoClient().get_derivatives(include_tickers="unexpired"))
+
+
+_exchanges = None
+_derivatives = None
+_lock = threading.Lock()
+
+
+def get_exchanges() -> Exchanges:
+    """Return shared exchanges snapshot, create it on first use"""
+    global _exchanges
+    if _exchanges is None:
+        with _lock:
+            if _exchanges is None:
+                _exchanges = Exchanges()
+    return _exchanges
+
+
+def get_derivatives() -> Derivatives:
+    """Return shared derivatives snapshot, create it on first use"""
+    global _derivatives
+    if _derivatives is None:
+        with _lock:
+            if _derivatives is None:
+                _derivatives = Derivatives()
+    return _derivatives
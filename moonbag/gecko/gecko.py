@@ -1,12 +1,18 @@
-import requests
 import pandas as pd
 import numpy as np
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from pycoingecko import CoinGeckoAPI
-import cachetools.func
-from retry import retry
-import math
 import textwrap
+import time
+from moonbag.common import transport, aio
+from moonbag.common.singleflight import coalesce
+from moonbag.gecko.registry import get_registry
+from moonbag.gecko import markets, exchanges
+from moonbag.gecko.markets import get_markets
+from moonbag.gecko.news import get_news_cache, posted_at, posted_ago
+from moonbag.gecko.prices import get_price_service
+from moonbag.gecko.scraper import Table, parse_table, cached_view
+from moonbag.common.identity import get_identity
 from moonbag.common.utils import wrap_text_in_df, underscores_to_newline_replace
 from moonbag.gecko.utils import (
     changes_parser,
@@ -91,38 +97,78 @@ BASE_INFO = [
 
 DENOMINATION = ("usd", "btc", "eth")
 
+# optional sections of /coins/{id}, requested only by views that need them
+SECTIONS = ("market_data", "community_data", "developer_data")
+COIN_TTL = 10 * 60  # the same as http cache of coins/{}
+
+API_URL = "https://api.coingecko.com/api/v3/"
+SCRAPER_TTL = 10 * 60
+
+# How long responses of CoinGecko API endpoints are kept in local cache.
+CACHE_TTL = {
+    "coins/list": 24 * 60 * 60,
+    "coins/markets": 5 * 60,
+    "coins/{}": 10 * 60,
+    "simple/price": 60,
+    "exchanges": 10 * 60,
+    "exchange_rates": 10 * 60,
+    "derivatives": 10 * 60,
+    "finance_platforms": 60 * 60,
+    "finance_products": 60 * 60,
+    "indexes": 10 * 60,
+    "global": 5 * 60,
+    "global/decentralized_finance_defi": 5 * 60,
+}
+transport.register_ttls(API_URL, CACHE_TTL)
+
+
+@aio.async_methods(prefixes=("get_",), host="api.coingecko.com")
+class GeckoClient(CoinGeckoAPI):
+    """CoinGeckoAPI that talks through the shared moonbag transport.
+    Every get_* method has async version: aget_*"""
+
+    def __init__(self):
+        super().__init__()
+        self.session = transport.get_session()
+        self.request_timeout = None  # fallback to transport default timeouts
+
+    @coalesce
+    def get_global(self, **kwargs):
+        # used by several overview views, concurrent calls share one parsed result
+        return super().get_global(**kwargs)
+
 
 def get_coin_list():
-    coins = CoinGeckoAPI().get_coins_list()
-    df = pd.DataFrame(coins)
-    return df
+    return get_registry().to_frame()
 
 
+@aio.async_methods(host="www.coingecko.com")
 class Overview:
     BASE = "https://www.coingecko.com"
 
     def __init__(self):
-        self.client = CoinGeckoAPI()
+        self.client = GeckoClient()
 
     @staticmethod
-    @cachetools.func.ttl_cache(maxsize=128, ttl=10 * 60)
-    def gecko_scraper(url):
-        req = requests.get(url)
-        soup = BeautifulSoup(req.text, features="lxml")
+    def gecko_scraper(url, name=None, class_=None):
+        """Parse page, when `name` is given only matching elements are parsed"""
+        req = transport.get(url, ttl=SCRAPER_TTL)
+        strainer = SoupStrainer(name, class_=class_) if name else None
+        soup = BeautifulSoup(req.text, features="lxml", parse_only=strainer)
         return soup
 
     @staticmethod
-    @cachetools.func.ttl_cache(maxsize=128, ttl=10 * 60)
+    def gecko_table(url, index=0, limit=None) -> Table:
+        """Rows of `index`-th table on page, only first `limit` rows when given"""
+        req = transport.get(url, ttl=SCRAPER_TTL)
+        return parse_table(req.text, index, limit)
+
+    @staticmethod
     def get_btc_price():
-        req = requests.get(
-            "https://api.coingecko.com/api/v3/simple/"
-            "price?ids=bitcoin&vs_currencies=usd&include_market_cap"
-            "=false&include_24hr_vol"
-            "=false&include_24hr_change=false&include_last_updated_at=false"
-        )
-        return req.json()["bitcoin"]["usd"]
+        return get_price_service().price("bitcoin", "usd")
 
-    def _discover_coins(self, category="trending"):
+    @cached_view
+    def _discover_coins(self, category="trending", n=None):
         if category not in CATEGORIES:
             raise ValueError(
                 f"Wrong category name\nPlease chose one from list: {CATEGORIES.keys()}"
@@ -130,21 +176,26 @@ class Overview:
 
         self.BASE = "https://www.coingecko.com"
         url = "https://www.coingecko.com/en/discover"
-        popular = self.gecko_scraper(url).find_all(
-            "div", class_="col-12 col-sm-6 col-md-6 col-lg-4"
-        )[CATEGORIES[category]]
-        rows = popular.find_all("a")
+        box = "col-12 col-sm-6 col-md-6 col-lg-4"
+        soup = self.gecko_scraper(url, "div", box)
+        popular = soup.find_all("div", class_=box)[CATEGORIES[category]]
+        rows = popular.find_all("a", limit=n)
         results = []
 
-        btc_price = self.get_btc_price()
+        # usd prices of all listed coins (and btc) come from one batched request
+        ids = [row["href"].rstrip("/").split("/")[-1] for row in rows]
+        prices = get_price_service().matrix(ids + ["bitcoin"], ["usd"])["usd"]
+        btc_price = prices["bitcoin"]
 
-        for row in rows:
+        for row, coin_id in zip(rows, ids):
             name, *_, price = clean_row(row)
             url = self.BASE + row["href"]
             if price.startswith("BTC"):
                 price = price.replace("BTC", "").replace(",", ".")
 
-            price_usd = (int(btc_price) * float(price)) if btc_price else None
+            price_usd = prices[coin_id.lower()]
+            if np.isnan(price_usd):
+                price_usd = (btc_price * float(price)) if btc_price > 0 else None
             results.append([name, price, price_usd, url])
         return pd.DataFrame(
             results,
@@ -156,9 +207,11 @@ class Overview:
             ],
         )
 
+    @cached_view
     def _get_news(self, page=1):
         url = f"https://www.coingecko.com/en/news?page={page}"
-        rows = self.gecko_scraper(url).find_all(COLUMNS["article"])
+        soup = self.gecko_scraper(url, COLUMNS["article"])
+        rows = soup.find_all(COLUMNS["article"])
         results = []
         for row in rows:
             header = row.find("header")
@@ -167,7 +220,7 @@ class Overview:
             article = row.find("div", class_="post-body").text.strip()
             title, *by_who = text
             author, posted = " ".join(by_who).split("(")
-            posted = posted.strip().replace(")", "")
+            posted = posted_at(posted.strip().replace(")", ""))
             results.append([title, author.strip(), posted, article, link])
         return pd.DataFrame(
             results,
@@ -180,10 +233,11 @@ class Overview:
             ],
         )
 
+    @cached_view
     def _get_holdings_overview(self, endpoint="bitcoin"):
         url = "https://www.coingecko.com/en/public-companies-" + endpoint
-        soup = self.gecko_scraper(url)
-        rows = soup.find_all("span", class_="overview-box d-inline-block p-3 mr-2")
+        box = "overview-box d-inline-block p-3 mr-2"
+        rows = self.gecko_scraper(url, "span", box).find_all("span", class_=box)
         kpis = {}
         for row in rows:
             row_cleaned = clean_row(row)
@@ -193,12 +247,13 @@ class Overview:
                 kpis[name] = value
         return kpis
 
-    def _get_companies_assets(self, endpoint="bitcoin"):
+    @cached_view
+    def _get_companies_assets(self, endpoint="bitcoin", n=None):
         url = "https://www.coingecko.com/en/public-companies-" + endpoint
-        rows = self.gecko_scraper(url).find("tbody").find_all("tr")
+        rows = self.gecko_table(url, limit=n)
         results = []
         for row in rows:
-            link = row.find("a")["href"]
+            link = row.link
             row_cleaned = clean_row(row)
             row_cleaned.append(link)
             results.append(row_cleaned)
@@ -217,7 +272,8 @@ class Overview:
             ],
         ).set_index(COLUMNS["rank"])
 
-    def _get_gainers_and_losers(self, period="1h", typ="gainers"):
+    @cached_view
+    def _get_gainers_and_losers(self, period="1h", typ="gainers", n=None):
         category = {
             "gainers": 0,
             "losers": 1,
@@ -229,12 +285,10 @@ class Overview:
             )
 
         url = f"https://www.coingecko.com/en/coins/trending{PERIODS.get(period)}"
-        rows = (
-            self.gecko_scraper(url).find_all("tbody")[category.get(typ)].find_all("tr")
-        )
+        rows = self.gecko_table(url, category.get(typ), limit=n)
         results = []
         for row in rows:
-            url = self.BASE + row.find("a")["href"]
+            url = self.BASE + row.link
             symbol, name, *_, volume, price, change = clean_row(row)
             results.append([symbol, name, volume, price, change, url])
         return pd.DataFrame(
@@ -249,7 +303,7 @@ class Overview:
             ],
         )
 
-    @retry(tries=2, delay=3, max_delay=5)
+    @cached_view
     def get_top_crypto_categories(self, n=None):
         columns = [
             COLUMNS["rank"],
@@ -263,11 +317,11 @@ class Overview:
             COLUMNS["url"],
         ]
         url = "https://www.coingecko.com/en/categories"
-        rows = self.gecko_scraper(url).find("tbody").find_all("tr")
+        rows = self.gecko_table(url, limit=n)
         results = []
 
         for row in rows:
-            url = self.BASE + row.find("a")["href"]
+            url = self.BASE + row.link
             (
                 rank,
                 *names,
@@ -294,7 +348,7 @@ class Overview:
 
         return pd.DataFrame(results, columns=columns).set_index(COLUMNS["rank"]).head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
+    @cached_view
     def get_recently_added_coins(self, n=None):
         columns = [
             COLUMNS["name"],
@@ -309,11 +363,11 @@ class Overview:
         ]
 
         url = "https://www.coingecko.com/en/coins/recently_added"
-        rows = self.gecko_scraper(url).find("tbody").find_all("tr")
+        rows = self.gecko_table(url, limit=n)
         results = []
 
         for row in rows:
-            url = self.BASE + row.find("a")["href"]
+            url = self.BASE + row.link
 
             row_cleaned = clean_row(row)
             (
@@ -342,7 +396,7 @@ class Overview:
             )
         return replace_qm(pd.DataFrame(results, columns=columns)).head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
+    @cached_view
     def get_stable_coins(self, n=None):
         columns = [
             COLUMNS["rank"],
@@ -356,10 +410,10 @@ class Overview:
             "link",
         ]
         url = "https://www.coingecko.com/en/stablecoins"
-        rows = self.gecko_scraper(url).find("tbody").find_all("tr")
+        rows = self.gecko_table(url, limit=n)
         results = []
         for row in rows:
-            link = self.BASE + row.find("a")["href"]
+            link = self.BASE + row.link
             row_cleaned = clean_row(row)
             if len(row_cleaned) == 8:
                 row_cleaned.append(None)
@@ -392,7 +446,7 @@ class Overview:
             pd.DataFrame(results, columns=columns).set_index("rank")
         ).head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
+    @cached_view
     def get_yield_farms(self, n=None):
         columns = [
             COLUMNS["rank"],
@@ -405,7 +459,7 @@ class Overview:
             "returns_hour",
         ]
         url = "https://www.coingecko.com/en/yield-farming"
-        rows = self.gecko_scraper(url).find("tbody").find_all("tr")
+        rows = self.gecko_table(url, limit=n)
         results = []
         for row in rows:
             row_cleaned = clean_row(row)[:-2]
@@ -440,64 +494,104 @@ class Overview:
             pd.DataFrame(results, columns=columns).set_index("rank").replace({"": None})
         ).head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_top_volume_coins(self, n=None):
-        columns = [
-            COLUMNS["rank"],
-            COLUMNS["name"],
-            COLUMNS["symbol"],
-            COLUMNS["price"],
-            COLUMNS["change_1h"],
-            COLUMNS["change_24h"],
-            COLUMNS["change_7d"],
-            COLUMNS["volume_24h"],
-            COLUMNS["market_cap"],
-        ]
-        url = "https://www.coingecko.com/pl/waluty/high_volume"
-        rows = self.gecko_scraper(url).find("tbody").find_all("tr")
-        results = []
-        for row in rows:
-            row_cleaned = clean_row(row)
-            if len(row_cleaned) == 9:
-                row_cleaned.insert(0, "?")
-            row_cleaned.pop(3)
-            results.append(row_cleaned)
-        return pd.DataFrame(results, columns=columns).set_index(COLUMNS["rank"]).head(n)
+        df = markets.top_volume(get_markets().frame(), n)
+        return self._markets_view(
+            df,
+            {
+                "market_cap_rank": COLUMNS["rank"],
+                "name": COLUMNS["name"],
+                "symbol": COLUMNS["symbol"],
+                "current_price": COLUMNS["price"],
+                markets.PERIODS["1h"]: COLUMNS["change_1h"],
+                markets.PERIODS["1d"]: COLUMNS["change_24h"],
+                markets.PERIODS["7d"]: COLUMNS["change_7d"],
+                "total_volume": COLUMNS["volume_24h"],
+                "market_cap": COLUMNS["market_cap"],
+            },
+            url=False,
+        ).set_index(COLUMNS["rank"])
+
+    def _markets_view(self, df, columns: dict, url=True):
+        """Selected columns of markets snapshot renamed to view columns"""
+        view = df[list(columns)].rename(columns=columns).reset_index(drop=True)
+        view["symbol"] = view["symbol"].astype(str)
+        if url:
+            view[COLUMNS["url"]] = self.BASE + "/en/coins/" + df["id"].to_numpy()
+        return view
+
+    def _market_movers(self, period, typ, n=None):
+        if period not in markets.PERIODS:  # not provided by /coins/markets
+            return self._get_gainers_and_losers(period, typ=typ, n=n)
+        rank = markets.gainers if typ == "gainers" else markets.losers
+        df = rank(get_markets().frame(), period, n)
+        return self._markets_view(
+            df,
+            {
+                "symbol": COLUMNS["symbol"],
+                "name": COLUMNS["name"],
+                "total_volume": "volume",
+                "current_price": COLUMNS["price"],
+                markets.PERIODS[period]: f"change_{period}",
+            },
+        )
+
+    def get_coins_near_ath(self, n=None):
+        df = markets.near_ath(get_markets().frame(), n)
+        return self._markets_view(
+            df,
+            {
+                "symbol": COLUMNS["symbol"],
+                "name": COLUMNS["name"],
+                "current_price": COLUMNS["price"],
+                "ath": "ath",
+                "ath_change_percentage": "from_ath_%",
+                "ath_date": "ath_date",
+            },
+        )
+
+    def get_coins_near_atl(self, n=None):
+        df = markets.near_atl(get_markets().frame(), n)
+        return self._markets_view(
+            df,
+            {
+                "symbol": COLUMNS["symbol"],
+                "name": COLUMNS["name"],
+                "current_price": COLUMNS["price"],
+                "atl": "atl",
+                "atl_change_percentage": "from_atl_%",
+                "atl_date": "atl_date",
+            },
+        )
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_trending_coins(self, n=None):
-        return self._discover_coins("trending").head(n)
+        return self._discover_coins("trending", n=n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_most_voted_coins(self, n=None):
-        return self._discover_coins("most_voted").head(n)
+        return self._discover_coins("most_voted", n=n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_positive_sentiment_coins(self, n=None):
-        return self._discover_coins("positive_sentiment").head(n)
+        return self._discover_coins("positive_sentiment", n=n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_most_visited_coins(self, n=None):
-        return self._discover_coins("most_visited").head(n)
+        return self._discover_coins("most_visited", n=n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_top_losers(self, period="1h", n=None):
-        return self._get_gainers_and_losers(period, typ="losers").head(n)
+        return self._market_movers(period, typ="losers", n=n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_top_gainers(self, period="1h", n=None):
-        return self._get_gainers_and_losers(period, typ="gainers").head(n)
+        return self._market_movers(period, typ="gainers", n=n)
 
-    @retry(tries=2, delay=3, max_delay=5)
+    @cached_view
     def get_top_defi_coins(self, n=None):
         url = "https://www.coingecko.com/en/defi"
-        rows = self.gecko_scraper(url).find("tbody").find_all("tr")
+        rows = self.gecko_table(url, limit=n)
         results = []
         for row in rows:
 
             row_cleaned = clean_row(row)
             row_cleaned.pop(2)
-            url = self.BASE + row.find("a")["href"]
+            url = self.BASE + row.link
             row_cleaned.append(url)
             if len(row_cleaned) == 11:
                 row_cleaned.insert(4, "?")
@@ -532,7 +626,7 @@ class Overview:
         df.columns = underscores_to_newline_replace(list(df.columns), 10)
         return df
 
-    @retry(tries=2, delay=3, max_delay=5)
+    @cached_view
     def get_top_dexes(self, n=None):
         columns = [
             COLUMNS["name"],
@@ -545,7 +639,7 @@ class Overview:
             "market_share_by_volume",
         ]
         url = "https://www.coingecko.com/en/dex"
-        rows = self.gecko_scraper(url).find("tbody").find_all("tr")
+        rows = self.gecko_table(url, limit=n)
         results = []
         for row in rows:
             row_cleaned = clean_row(row)
@@ -570,13 +664,13 @@ class Overview:
         )
         return df.set_index(COLUMNS["rank"]).head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
+    @cached_view
     def get_top_nfts(self, n=None):
         url = "https://www.coingecko.com/en/nft"
-        rows = self.gecko_scraper(url).find("tbody").find_all("tr")
+        rows = self.gecko_table(url, limit=n)
         results = []
         for row in rows:
-            link = self.BASE + row.find("a")["href"]
+            link = self.BASE + row.link
             row_cleaned = clean_row(row)
             if len(row_cleaned) == 9:
                 row_cleaned.insert(5, "N/A")
@@ -602,11 +696,11 @@ class Overview:
         )
         return df
 
-    @retry(tries=2, delay=3, max_delay=5)
+    @cached_view
     def get_nft_of_the_day(self, n=None):
         url = "https://www.coingecko.com/en/nft"
-        soup = self.gecko_scraper(url)
-        row = soup.find("div", class_="tw-px-4 tw-py-5 sm:tw-p-6")
+        box = "tw-px-4 tw-py-5 sm:tw-p-6"
+        row = self.gecko_scraper(url, "div", box).find("div", class_=box)
         try:
             *author, description, _ = clean_row(row)
             if len(author) > 3:
@@ -629,11 +723,11 @@ class Overview:
         df = wrap_text_in_df(df, w=100)
         return df.head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
+    @cached_view
     def get_nft_market_status(self, n=None):
         url = "https://www.coingecko.com/en/nft"
-        soup = self.gecko_scraper(url)
-        rows = soup.find_all("span", class_="overview-box d-inline-block p-3 mr-2")
+        box = "overview-box d-inline-block p-3 mr-2"
+        rows = self.gecko_scraper(url, "span", box).find_all("span", class_=box)
         kpis = {}
         for row in rows:
             value, *kpi = clean_row(row)
@@ -643,57 +737,55 @@ class Overview:
         df.columns = ["Metric", "Value"]
         return df.head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
+    def _get_news_pages(self, pages):
+        # pages are downloaded and parsed concurrently in aio worker threads
+        dfs = aio.fan_out(self._get_news, pages, host="www.coingecko.com", partial=True)
+        return [df.to_dict("records") for df in dfs]
+
     def get_news(self, n=None):
-        n_of_pages = (math.ceil(n / 25) + 1) if n else 2
-        dfs = []
-        for page in range(1, n_of_pages):
-            dfs.append(self._get_news(page))
-        df = pd.concat(dfs, ignore_index=True).head(n)
+        articles = get_news_cache().latest(n, self._get_news_pages)
+        df = pd.DataFrame(
+            articles,
+            columns=[
+                COLUMNS["title"],
+                COLUMNS["author"],
+                COLUMNS["posted"],
+                COLUMNS["article"],
+                COLUMNS["url"],
+            ],
+        )
+        df[COLUMNS["posted"]] = df[COLUMNS["posted"]].map(posted_ago)
         df = wrap_text_in_df(df, w=65)
         df.drop("article", axis=1, inplace=True)
         return df
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_btc_holdings_public_companies_overview(self, n=None):
         df = pd.Series(self._get_holdings_overview("bitcoin")).to_frame().reset_index()
         df.columns = ["Metric", "Value"]
         return df.head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_eth_holdings_public_companies_overview(self, n=None):
         df = pd.Series(self._get_holdings_overview("ethereum")).to_frame().reset_index()
         df.columns = ["Metric", "Value"]
         return df.head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_companies_with_btc(self, n=None):
-        df = self._get_companies_assets("bitcoin").head(n)
+        df = self._get_companies_assets("bitcoin", n=n)
         df.drop("url", axis=1, inplace=True)
         return df
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_companies_with_eth(self, n=None):
-        df = self._get_companies_assets("ethereum").head(n)
+        df = self._get_companies_assets("ethereum", n=n)
         df.drop("url", axis=1, inplace=True)  # For now removed url
         return df
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_coin_list(self, n=None):
-        return (
-            pd.DataFrame(
-                self.client.get_coins_list(),
-                columns=[COLUMNS["id"], COLUMNS["symbol"], COLUMNS["name"]],
-            )
-            .set_index(COLUMNS["id"])
-            .head(n)
-        )
+        return get_registry().to_frame().set_index(COLUMNS["id"]).head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_exchanges(self, n=None):
-        df = pd.DataFrame(self.client.get_exchanges_list(per_page=250))
-        df.replace({float(np.NaN): None}, inplace=True)
-        return (
+        snapshot = exchanges.get_exchanges()
+        df = snapshot.frame().replace({float(np.NaN): None})
+        df = (
             df[
                 [
                     "trust_score_rank",
@@ -709,8 +801,9 @@ class Overview:
             .set_index("trust_score_rank")
             .head(n)
         )
+        df.attrs["as_of"] = snapshot.as_of()
+        return df
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_financial_platforms(self, n=None):
         return (
             pd.DataFrame(self.client.get_finance_platforms())
@@ -718,7 +811,6 @@ class Overview:
             .head(n)
         )
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_finance_products(self, n=None):
         return pd.DataFrame(
             self.client.get_finance_products(per_page=250),
@@ -730,15 +822,12 @@ class Overview:
             ],
         ).head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_indexes(self, n=None):
         return pd.DataFrame(self.client.get_indexes(per_page=250)).head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_derivatives(self, n=None):
-        df = pd.DataFrame(
-            self.client.get_derivatives(include_tickers="unexpired")
-        ).head(n)
+        snapshot = exchanges.get_derivatives()
+        df = snapshot.frame().head(n).copy()
         df.drop(
             ["index", "last_traded_at", "expired_at", "index_id"], axis=1, inplace=True
         )
@@ -746,9 +835,9 @@ class Overview:
         df.rename(
             columns={"price_percentage_change_24h": "%  change 24h"}, inplace=True
         )
+        df.attrs["as_of"] = snapshot.as_of()
         return df
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_exchange_rates(self, n=None):
         return (
             pd.DataFrame(self.client.get_exchange_rates()["rates"])
@@ -756,7 +845,6 @@ class Overview:
             .drop("index", axis=1)
         ).head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_global_info(self, n=None):
         results = self.client.get_global()
         for key in [
@@ -770,7 +858,6 @@ class Overview:
         df.columns = ["Metric", "Value"]
         return df.head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_global_markets_info(self, n=None):
         columns = [
             COLUMNS["total_market_cap"],
@@ -785,7 +872,6 @@ class Overview:
         df.columns = columns
         return df.reset_index().head(n)
 
-    @retry(tries=2, delay=3, max_delay=5)
     def get_global_defi_info(self, n=None):
         results = self.client.get_global_decentralized_finance_defi()
         for key, value in results.items():
@@ -799,39 +885,82 @@ class Overview:
         return df.head(n)
 
 
+class _derived:
+    """Property of Coin computed from given sections of coin data. Value is memoized
+    per instance until sections it depends on are fetched again"""
+
+    def __init__(self, *sections):
+        self.sections = sections
+
+    def __call__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+        return self
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        fetched = instance._require(*self.sections)
+        memo = instance._memo.get(self.name)
+        if memo is None or memo[0] != fetched:
+            memo = instance._memo[self.name] = fetched, self.func(instance)
+        return memo[1]
+
+
 class Coin:
+    """CoinGecko coin. Data is fetched on first use and only sections that are
+    needed (market, community or developer data) are requested, so e.g. `devs`
+    doesn't download market data. Fetched sections are reused for COIN_TTL."""
+
     def __init__(self, symbol):
-        self.client = CoinGeckoAPI()
-        self._coin_list = self.client.get_coins_list()
+        self.client = GeckoClient()
         self.coin_symbol = self._validate_coin(symbol)
-
-        if self.coin_symbol:
-            self.coin = self._get_coin_info()
+        self._data = {}
+        self._fetched = {}  # section -> time it was fetched, "base" for common fields
+        self._memo = {}  # derived property -> (fetch time of its sections, value)
 
     def __str__(self):
         return f"{self.coin_symbol}"
 
     def _validate_coin(self, symbol):
-        coin = None
-        for dct in self._coin_list:
-            if symbol.lower() in list(dct.values()):
-                coin = dct.get("id")
+        # other coins with the same symbol or name
+        self.alternatives = get_registry().candidates(symbol)[1:]
+        # symbol, name, gecko/paprika/CryptoCompare id or contract address
+        coin = get_identity().gecko_id(symbol)
         if not coin:
             raise ValueError(f"Could not find coin with the given id: {symbol}\n")
         return coin
 
     @property
-    @cachetools.func.ttl_cache(maxsize=128, ttl=30 * 60)
     def coin_list(self):
-        return [token.get("id") for token in self._coin_list]
+        return get_registry().ids()
+
+    def _get_coin_info(self, sections=()):
+        flags = {section: str(section in sections).lower() for section in SECTIONS}
+        params = dict(localization="false", tickers="false", sparkline="false")
+        return self.client.get_coin_by_id(self.coin_symbol, **params, **flags)
+
+    def _require(self, *sections) -> float:
+        """Fetch sections that are missing or older than COIN_TTL, return time
+        of the latest fetch among them"""
+        needed = ("base",) + sections
+        now = time.time()
+        stale = [s for s in needed if now - self._fetched.get(s, 0) > COIN_TTL]
+        if stale:
+            fetch = [s for s in stale if s != "base"]
+            self._data.update(self._get_coin_info(fetch))
+            for section in ["base"] + fetch:
+                self._fetched[section] = now
+        return max(self._fetched[s] for s in needed)
 
-    @retry(tries=2, delay=3, max_delay=5)
-    @cachetools.func.ttl_cache(maxsize=128, ttl=30 * 60)
-    def _get_coin_info(self):
-        params = dict(localization="false", tickers="false", sparkline=True)
-        return self.client.get_coin_by_id(self.coin_symbol, **params)
+    @property
+    def coin(self) -> dict:
+        self._require()
+        return self._data
 
-    @cachetools.func.ttl_cache(maxsize=128, ttl=30 * 60)
     def _get_links(self):
         return self.coin.get("links")
 
@@ -839,7 +968,7 @@ class Coin:
     def repositories(self):
         return self._get_links().get("repos_url")
 
-    @property
+    @_derived("developer_data")
     def developers_data(self):
         dev = self.coin.get("developer_data")
         useless_keys = (
@@ -851,7 +980,7 @@ class Coin:
         df.columns = ["Metric", "Value"]
         return df
 
-    @property
+    @_derived()
     def blockchain_explorers(self):
         blockchain = self._get_links().get("blockchain_site")
         if blockchain:
@@ -861,7 +990,7 @@ class Coin:
             return df
         return None
 
-    @property
+    @_derived()
     def social_media(self):
         social_dct = {}
         links = self._get_links()
@@ -879,7 +1008,7 @@ class Coin:
         df.columns = ["Metric", "Value"]
         return df
 
-    @property
+    @_derived()
     def websites(self):
         websites_dct = {}
         links = self._get_links()
@@ -913,7 +1042,7 @@ class Coin:
         market_dct.update(prices)
         return market_dct
 
-    @property
+    @_derived("market_data")
     def base_info(self):
         results = {}
         for attr in BASE_INFO:
@@ -924,7 +1053,7 @@ class Coin:
         results.update(self._get_base_market_data_info())
         return pd.Series(results)
 
-    @property
+    @_derived("market_data")
     def market_data(self):
         market_data = self.coin.get("market_data")
         market_columns_denominated = [
@@ -965,7 +1094,7 @@ class Coin:
         df.columns = ["Metric", "Value"]
         return df
 
-    @property
+    @_derived("market_data")
     def all_time_high(self):
         market_data = self.coin.get("market_data")
         ath_columns = [
@@ -981,7 +1110,7 @@ class Coin:
         df.columns = ["Metric", "Value"]
         return df
 
-    @property
+    @_derived("market_data")
     def all_time_low(self):
         market_data = self.coin.get("market_data")
         ath_columns = [
@@ -997,7 +1126,7 @@ class Coin:
         df.columns = ["Metric", "Value"]
         return df
 
-    @property
+    @_derived("community_data")
     def scores(self):
         score_columns = [
             "coingecko_rank",
@@ -1025,3 +1154,25 @@ class Coin:
         df = df.fillna("")
         df.columns = ["Metric", "Value"]
         return df
+
+
+def compare_coins(coins: list, view: str) -> pd.DataFrame:
+    """Metric/Value frames of many coins (e.g. view="market_data") side by side,
+    one column per coin. Coins are fetched concurrently"""
+    frames = aio.fan_out(
+        lambda coin: getattr(coin, view),
+        coins,
+        host="api.coingecko.com",
+        return_exceptions=True,
+    )
+    columns = []
+    for coin, df in zip(coins, frames):
+        if isinstance(df, Exception):
+            logger.warning(f"Couldn't load {coin}: {df!r}")
+            continue
+        columns.append(df.set_index("Metric")["Value"].rename(str(coin)))
+    if not columns:
+        raise frames[0]
+    df = pd.concat(columns, axis=1, sort=False)
+    df.index.name = "Metric"
+    return df.reset_index()
@@ -0,0 +1,185 @@
+import logging
+import math
+import threading
+import time
+import numpy as np
+import pandas as pd
+from moonbag.common import aio
+from moonbag.common.snapshot import Snapshot
+
+logger = logging.getLogger("gecko-markets")
+
+MARKETS_NAME = "gecko_markets"
+PER_PAGE = 250  # max page size of /coins/markets
+FIRST_PAGES = 4  # fetched synchronously when there is no snapshot yet, top 1000 coins
+MAX_AGE = 10 * 60  # snapshot older than that is refreshed in background
+MIN_VOLUME = 50_000  # coins with lower 24h volume are left out of gainers and losers
+CURRENCY = "usd"
+
+# period of gainers/losers -> column with price change
+PERIODS = {
+    "1h": "price_change_percentage_1h_in_currency",
+    "1d": "price_change_percentage_24h_in_currency",
+    "7d": "price_change_percentage_7d_in_currency",
+    "14d": "price_change_percentage_14d_in_currency",
+    "30d": "price_change_percentage_30d_in_currency",
+    "1y": "price_change_percentage_1y_in_currency",
+}
+
+FLOATS = [
+    "current_price",
+    "market_cap",
+    "fully_diluted_valuation",
+    "total_volume",
+    "high_24h",
+    "low_24h",
+    "price_change_24h",
+    "price_change_percentage_24h",
+    "market_cap_change_24h",
+    "market_cap_change_percentage_24h",
+    "circulating_supply",
+    "total_supply",
+    "max_supply",
+    "ath",
+    "ath_change_percentage",
+    "atl",
+    "atl_change_percentage",
+    *PERIODS.values(),
+]
+INTS = ["market_cap_rank"]
+CATEGORIES = ["symbol"]
+STRINGS = ["id", "name"]
+DATES = ["ath_date", "atl_date", "last_updated"]
+COLUMNS = STRINGS + CATEGORIES + INTS + FLOATS + DATES
+
+
+def to_frame(records: list) -> pd.DataFrame:
+    """Typed columnar frame of /coins/markets records: float64 numbers, nullable
+    Int64 rank, category symbols and UTC dates. Index is coin id"""
+    df = pd.DataFrame.from_records(records, columns=COLUMNS)
+    df = df.drop_duplicates("id").set_index("id", drop=False)
+    for column in FLOATS:
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+    for column in INTS:
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+    for column in CATEGORIES:
+        df[column] = df[column].astype("category")
+    for column in DATES:
+        df[column] = pd.to_datetime(df[column], errors="coerce", utc=True)
+    return df
+
+
+def rank(df: pd.DataFrame, column: str, n=None, ascending=False, mask=None):
+    """Rows of df ordered by column, rows with missing values are left out.
+    Only top `n` rows are fully sorted"""
+    values = df[column].to_numpy(dtype="float64", na_value=np.nan)
+    keep = ~np.isnan(values)
+    if mask is not None:
+        keep &= mask
+    positions = np.flatnonzero(keep)
+    keys = values[positions] if ascending else -values[positions]
+    if n is not None and n < len(positions):
+        top = np.argpartition(keys, n)[:n]
+        positions, keys = positions[top], keys[top]
+    return df.iloc[positions[np.argsort(keys, kind="stable")]]
+
+
+def _liquid(df, min_volume=MIN_VOLUME):
+    return df["total_volume"].to_numpy(dtype="float64", na_value=0) >= min_volume
+
+
+def gainers(df, period="1h", n=None, min_volume=MIN_VOLUME) -> pd.DataFrame:
+    return rank(df, PERIODS[period], n, mask=_liquid(df, min_volume))
+
+
+def losers(df, period="1h", n=None, min_volume=MIN_VOLUME) -> pd.DataFrame:
+    return rank(df, PERIODS[period], n, ascending=True, mask=_liquid(df, min_volume))
+
+
+def top_volume(df, n=None) -> pd.DataFrame:
+    return rank(df, "total_volume", n)
+
+
+def near_ath(df, n=None) -> pd.DataFrame:
+    """Coins closest to their all time high"""
+    return rank(df, "ath_change_percentage", n)
+
+
+def near_atl(df, n=None) -> pd.DataFrame:
+    """Coins closest to their all time low"""
+    return rank(df, "atl_change_percentage", n, ascending=True)
+
+
+class Markets(Snapshot):
+    """Market data of all CoinGecko coins from paginated /coins/markets.
+
+    Pages of 250 coins are fetched concurrently (`aio.fan_out`, so per-host limits
+    and rate limiting apply) into one typed frame, kept as Snapshot in moonbag data
+    directory. Without any snapshot only the first pages (top coins by market cap)
+    are fetched synchronously, the rest follows in background, so commands don't
+    wait for the whole market.
+    """
+
+    def __init__(self, path=None, max_age=MAX_AGE, pages=None):
+        super().__init__(MARKETS_NAME, max_age=max_age, path=path)
+        self.pages = pages  # None: as many as needed for all coins in registry
+
+    def _page_count(self) -> int:
+        if self.pages:
+            return self.pages
+        from moonbag.gecko.registry import get_registry
+
+        return max(FIRST_PAGES, math.ceil(len(get_registry()) / PER_PAGE))
+
+    def _fetch_page(self, page) -> list:
+        from moonbag.gecko.gecko import GeckoClient
+
+        return GeckoClient().get_coins_markets(
+            vs_currency=CURRENCY,
+            per_page=PER_PAGE,
+            page=page,
+            price_change_percentage=",".join(PERIODS).replace("1d", "24h"),
+        )
+
+    def _fetch_pages(self, pages):
+        """Frame of pages and whether all of them were fetched"""
+        results = aio.fan_out(
+            self._fetch_page, pages, host="api.coingecko.com", return_exceptions=True
+        )
+        failed = [r for r in results if isinstance(r, Exception)]
+        if failed and len(failed) == len(results):
+            raise failed[0]
+        for e in failed:
+            logger.warning(f"Markets page failed: {e!r}")
+        records = [r for page in results if isinstance(page, list) for r in page]
+        return to_frame(records), not failed
+
+    def _fetch(self) -> pd.DataFrame:
+        return self._fetch_pages(range(1, self._page_count() + 1))[0]
+
+    def _fetch_refresh(self):
+        df, complete = self._fetch_pages(range(1, self._page_count() + 1))
+        if complete:
+            return df, time.time()
+        if self.updated:
+            # complete snapshot, even if older, is better than one missing coins
+            raise IOError("some pages failed, keeping previous snapshot")
+        return df, 0  # partial, refreshed again on next use
+
+    def _fetch_initial(self):
+        pages = min(FIRST_PAGES, self._page_count())
+        return self._fetch_pages(range(1, pages + 1))[0], 0  # partial, refreshed now
+
+
+_markets = None
+_markets_lock = threading.Lock()
+
+
+def get_markets() -> Markets:
+    """Return shared markets snapshot, create it on first use"""
+    global _markets
+    if _markets is None:
+        with _markets_lock:
+            if _markets is None:
+                _markets = Markets()
+    return _markets
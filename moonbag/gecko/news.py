@@ -0,0 +1,149 @@
+import logging
+import math
+import re
+import threading
+import time
+from requests.exceptions import RequestException
+from moonbag.common import cache
+
+logger = logging.getLogger("gecko-news")
+
+NEWS_FILE = "gecko_news.json"
+PAGE_SIZE = 25  # articles on one page of https://www.coingecko.com/en/news
+MAX_ARTICLES = 1000  # articles kept on disk
+MAX_REFRESH_PAGES = 10  # refresh fetches pages one by one until it meets known ones
+UNITS = [
+    ("year", 365 * 24 * 60 * 60),
+    ("month", 30 * 24 * 60 * 60),
+    ("week", 7 * 24 * 60 * 60),
+    ("day", 24 * 60 * 60),
+    ("hour", 60 * 60),
+    ("minute", 60),
+]
+AGE = re.compile(r"(\d+|an?)\s+(year|month|week|day|hour|minute|second)s?\s+ago")
+
+
+def posted_at(posted: str, now=None):
+    """Epoch seconds of relative age shown by CoinGecko, like "about 3 hours ago".
+    Articles are kept on disk, so they store the time, not the age. Unknown text
+    is returned unchanged"""
+    now = time.time() if now is None else now
+    match = AGE.search(posted.lower())
+    if "less than" in posted.lower():
+        return now
+    if not match:
+        return posted
+    count = 1 if match.group(1) in ("a", "an") else int(match.group(1))
+    return now - count * dict(UNITS, second=1)[match.group(2)]
+
+
+def posted_ago(posted, now=None) -> str:
+    """Age of article like "3 hours ago", from time stored by `posted_at`"""
+    if not isinstance(posted, (int, float)):
+        return posted  # saved before times were stored
+    age = (time.time() if now is None else now) - posted
+    for unit, seconds in UNITS:
+        count = int(age // seconds)
+        if count:
+            return f"{count} {unit}{'s' if count > 1 else ''} ago"
+    return "just now"
+
+
+class NewsCache:
+    """CoinGecko news articles seen so far, newest first, kept on disk.
+
+    On the first run all pages needed for `n` articles are fetched concurrently.
+    Later only page 1 is fetched (then 2, 3 ...) until a page contains an article
+    that is already known, older articles come from disk. Pages are fetched only
+    when more articles are asked for than known. Articles are deduplicated by url.
+
+    `fetch_pages(pages)` should return list of articles (dicts with "url") for
+    every page that was downloaded successfully.
+    """
+
+    def __init__(self, path=None, max_articles=MAX_ARTICLES):
+        self.path = path or cache.data_path(NEWS_FILE)
+        self.max_articles = max_articles
+        self._articles = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> list:
+        if self._articles is None:
+            data = cache.load_json(self.path) or {}
+            self._articles = data.get("articles", [])
+        return self._articles
+
+    def _save(self, articles):
+        self._articles = articles[: self.max_articles]
+        try:
+            cache.dump_json(
+                self.path, {"updated": time.time(), "articles": self._articles}
+            )
+        except OSError as e:
+            logger.warning(f"Couldn't save news: {e}")
+
+    @staticmethod
+    def _merge(*lists) -> list:
+        seen, merged = set(), []
+        for articles in lists:
+            for article in articles:
+                if article["url"] not in seen:
+                    seen.add(article["url"])
+                    merged.append(article)
+        return merged
+
+    def _refresh(self, known, fetch_pages):
+        """New articles from the first pages, number of pages read and whether they
+        reached known articles"""
+        urls = {a["url"] for a in known}
+        fresh = []
+        for page in range(1, MAX_REFRESH_PAGES + 1):
+            try:
+                pages = fetch_pages([page])
+            except RequestException as e:  # known articles are still served
+                logger.warning(f"News refresh failed: {e}")
+                return fresh, page - 1, True
+            if not pages or not pages[0]:
+                return fresh, page - 1, True
+            articles = pages[0]
+            new = [a for a in articles if a["url"] not in urls]
+            fresh += new
+            if len(new) < len(articles):
+                logger.info(f"{len(fresh)} new articles on {page} pages")
+                return fresh, page, True
+        return fresh, page, False
+
+    def latest(self, n, fetch_pages) -> list:
+        """`n` newest articles (one page when n is None)"""
+        n = n or PAGE_SIZE
+        with self._lock:
+            known = self._load()
+            read = 0
+            if known:
+                fresh, read, overlaps = self._refresh(known, fetch_pages)
+                # without overlap there would be a gap between fresh and known ones
+                articles = self._merge(fresh, known) if overlaps else fresh
+            else:
+                articles = []
+
+            missing = n - len(articles)
+            if missing > 0:
+                first = max(read + 1, len(articles) // PAGE_SIZE + 1)
+                pages = range(first, first + math.ceil(missing / PAGE_SIZE))
+                articles = self._merge(articles, *fetch_pages(list(pages)))
+            self._save(articles)
+            return articles[:n]
+
+
+_news = None
+_news_lock = threading.Lock()
+
+
+def get_news_cache() -> NewsCache:
+    """Return shared news cache, create it on first use"""
+    global _news
+    if _news is None:
+        with _news_lock:
+            if _news is None:
+                _news = NewsCache()
+    return _news
@@ -1,9 +1,12 @@
 import argparse
 import pandas as pd
 from moonbag.gecko.gecko import Overview
+from moonbag.gecko import exchanges
 import logging
 from moonbag.common import LOGO, MOON, print_table
 from typing import List
+from requests.exceptions import RequestException
+from moonbag.common.retries import deadline, COMMAND_DEADLINE
 
 logger = logging.getLogger("parser")
 
@@ -33,6 +36,9 @@ class Controller:
         self.parser = argparse.ArgumentParser(prog="overview", add_help=False)
         self.parser.add_argument("cmd")
         self.o = Overview()
+        # slow endpoints are refreshed in background, views read their snapshots
+        exchanges.get_exchanges().schedule()
+        exchanges.get_derivatives().schedule()
         self.base = {
             "help": self.help,
             "r": self.returner,
@@ -57,6 +63,8 @@ class Controller:
             "btc_comp": self.o.get_companies_with_btc,
             "eth_comp": self.o.get_companies_with_eth,
             "losers": self.o.get_top_losers,
+            "ath": self.o.get_coins_near_ath,
+            "atl": self.o.get_coins_near_atl,
             "ex_rates": self.o.get_exchange_rates,
             "exchanges": self.o.get_exchanges,
             "derivatives": self.o.get_derivatives,
@@ -86,6 +94,8 @@ class Controller:
 
         print("   gainers           show top gainers in last 1h [Coingecko]")
         print("   losers            show top losers in last 1h [Coingecko]")
+        print("   ath               show coins closest to all time high [Coingecko]")
+        print("   atl               show coins closest to all time low [Coingecko]")
 
         print(
             "   top_sentiment      show coins with most positive sentiment [Coingecko]"
@@ -104,9 +114,7 @@ class Controller:
         print("   nft_of_day        show nft of a day [Coingecko]")
 
         print("   categories        show top crypto categories [Coingecko]")
-        print(
-            "   derivatives       show derivatives [Coingecko] !Waiting time ~ 10-15 sec!"
-        )
+        print("   derivatives       show derivatives [Coingecko]")
         print("   indexes           show indexes [Coingecko]")
         print("   fin_products      show financial products [Coingecko]")
         print("   fin_platforms     show financial platforms [Coingecko]")
@@ -123,11 +131,16 @@ class Controller:
         return
 
     @staticmethod
-    def quit():
+    def _stop_refresh():
+        exchanges.get_exchanges().stop()
+        exchanges.get_derivatives().stop()
+
+    def quit(self):
+        self._stop_refresh()
         return True
 
-    @staticmethod
-    def returner():
+    def returner(self):
+        self._stop_refresh()
         return False
 
     def get_view(self, an_input):
@@ -154,14 +167,21 @@ def main():
     while True:
         an_input = input(f"{MOON}> (gecko_view) ")
         try:
-            view = c.get_view(an_input)
+            with deadline(COMMAND_DEADLINE):
+                view = c.get_view(an_input)
             if view is None:
                 continue
             elif isinstance(view, pd.DataFrame):
                 print_table(view)
+                if view.attrs.get("as_of"):
+                    print(f"{view.attrs['as_of']}\n")
             else:
                 return view
 
+        except RequestException as e:
+            print(f"{e}\n")
+            continue
+
         except SystemExit:
             print("The command selected doesn't exist")
             print("\n")
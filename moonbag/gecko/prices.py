@@ -0,0 +1,109 @@
+import logging
+import threading
+from typing import Iterable
+import cachetools
+import numpy as np
+import pandas as pd
+from moonbag.common import aio
+
+logger = logging.getLogger("gecko-prices")
+
+PRICE_TTL = 60  # seconds, the same as http cache of simple/price
+MAX_CACHED_PRICES = 100_000
+MAX_URL_LENGTH = 2000  # safe length of url for proxies and CoinGecko itself
+URL = "https://api.coingecko.com/api/v3/simple/price?ids=&vs_currencies="
+
+
+def chunk_ids(ids: list, vs_currencies: list, max_length=MAX_URL_LENGTH) -> list:
+    """Split ids into chunks, so url of every request stays below max_length"""
+    budget = max_length - len(URL) - len("%2C".join(vs_currencies))
+    chunks, chunk, length = [], [], 0
+    for coin_id in ids:
+        size = len(coin_id) + 3  # comma is url encoded as %2C
+        if chunk and length + size > budget:
+            chunks.append(chunk)
+            chunk, length = [], 0
+        chunk.append(coin_id)
+        length += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class PriceService:
+    """Prices of many CoinGecko coins from batched /simple/price requests.
+
+    Ids are split into chunks that keep urls short enough, chunks are fetched
+    concurrently. Prices are kept in memory for PRICE_TTL seconds per (id, currency),
+    so callers asking for overlapping coins share them and only missing ones
+    are requested.
+    """
+
+    def __init__(self, ttl=PRICE_TTL, maxsize=MAX_CACHED_PRICES):
+        self._prices = cachetools.TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def _fetch_chunk(self, ids, vs_currencies) -> dict:
+        from moonbag.gecko.gecko import GeckoClient
+
+        return GeckoClient().get_price(ids=ids, vs_currencies=vs_currencies)
+
+    def _fetch(self, ids, vs_currencies):
+        chunks = chunk_ids(ids, vs_currencies)
+        results = aio.fan_out(
+            self._fetch_chunk,
+            [(chunk, vs_currencies) for chunk in chunks],
+            host="api.coingecko.com",
+            return_exceptions=True,
+        )
+        failed = [r for r in results if isinstance(r, Exception)]
+        if failed and len(failed) == len(results):
+            raise failed[0]
+        with self._lock:
+            for chunk, result in zip(chunks, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Prices of {len(chunk)} coins failed: {result!r}")
+                    continue
+                for coin_id in chunk:
+                    prices = result.get(coin_id) or {}
+                    for currency in vs_currencies:
+                        # coins unknown to CoinGecko are cached as missing too
+                        self._prices[coin_id, currency] = prices.get(currency)
+
+    def matrix(self, ids: Iterable[str], vs_currencies=("usd",)) -> pd.DataFrame:
+        """Prices as float64 frame: ids in rows, currencies in columns, NaN if missing"""
+        ids = list(dict.fromkeys(str(i).lower() for i in ids))
+        vs_currencies = [c.lower() for c in vs_currencies]
+        with self._lock:
+            missing = [
+                i for i in ids if any((i, c) not in self._prices for c in vs_currencies)
+            ]
+        if missing:
+            self._fetch(missing, vs_currencies)
+
+        values = np.full((len(ids), len(vs_currencies)), np.nan)
+        with self._lock:
+            for row, coin_id in enumerate(ids):
+                for col, currency in enumerate(vs_currencies):
+                    price = self._prices.get((coin_id, currency))
+                    if price is not None:
+                        values[row, col] = price
+        return pd.DataFrame(values, index=ids, columns=vs_currencies)
+
+    def price(self, coin_id: str, vs_currency="usd") -> float or None:
+        value = self.matrix([coin_id], [vs_currency]).iat[0, 0]
+        return None if np.isnan(value) else float(value)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_price_service() -> PriceService:
+    """Return shared price service, create it on first use"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = PriceService()
+    return _service
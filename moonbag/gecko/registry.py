@@ -0,0 +1,177 @@
+import logging
+import os
+import threading
+import time
+from moonbag.common import cache
+from moonbag.common.fuzzy import FuzzyIndex
+
+logger = logging.getLogger("gecko-registry")
+
+SEED_FILE = os.path.join(os.path.dirname(__file__), "data", "gecko_coins.json")
+SNAPSHOT_FILE = "gecko_coins.json"
+REFRESH_INTERVAL = 24 * 60 * 60  # snapshot older than that is refreshed in background
+
+
+class CoinRegistry:
+    """List of all CoinGecko coins kept on disk with dict indexes by id, symbol and name.
+
+    Snapshot is read from moonbag data directory, on first run it's seeded with list
+    bundled in moonbag/gecko/data. When snapshot is older than `max_age`, fresh list
+    is downloaded in background thread and swapped in when ready, so lookups never
+    wait for network.
+
+    Symbols (and names) are not unique on CoinGecko, e.g. many tokens use `uni`
+    symbol. Lookups by id are exact, for ambiguous symbol the best candidate
+    is chosen (see _rank) and others are available with `candidates`.
+    """
+
+    def __init__(self, path=None, seed=SEED_FILE, max_age=REFRESH_INTERVAL):
+        self.path = path or cache.data_path(SNAPSHOT_FILE)
+        self.seed = seed
+        self.max_age = max_age
+        self.updated = None
+        self._by_id = None
+        self._by_symbol = {}
+        self._by_name = {}
+        self._fuzzy = None
+        self._lock = threading.Lock()
+        self._refreshing = None
+
+    def _load(self):
+        if self._by_id is not None:
+            return
+        with self._lock:
+            if self._by_id is not None:
+                return
+            data = cache.load_json(self.path) if self.path else None
+            if data is None and self.seed:
+                data = cache.load_json(self.seed)
+            if data is None:
+                data = {"updated": 0, "coins": []}
+
+            if isinstance(data, list):  # seed file is raw api response
+                data = {"updated": 0, "coins": data}
+            self._build(data["coins"], data["updated"])
+
+        if self.max_age is not None and time.time() - self.updated > self.max_age:
+            self.refresh()
+
+    def _build(self, coins, updated):
+        by_id, by_symbol, by_name = {}, {}, {}
+        for coin in coins:
+            by_id[coin["id"]] = coin
+        for coin in sorted(by_id.values(), key=self._rank):
+            by_symbol.setdefault(coin["symbol"].lower(), []).append(coin["id"])
+            by_name.setdefault(coin["name"].lower(), []).append(coin["id"])
+        self._by_id, self._by_symbol, self._by_name = by_id, by_symbol, by_name
+        self._fuzzy = None
+        self.updated = updated
+
+    @staticmethod
+    def _rank(coin):
+        # projects whose id is just their name (e.g. uniswap) first, then shorter ids
+        # (copycats get suffixes like -token or -2), then coins with own chain
+        canonical = coin["id"] == coin["name"].lower().replace(" ", "-")
+        platforms = [p for p in (coin.get("platforms") or {}) if p]
+        return not canonical, len(coin["id"]), bool(platforms), coin["id"]
+
+    def _fetch(self) -> list:
+        from moonbag.gecko.gecko import GeckoClient
+
+        return GeckoClient().get_coins_list(include_platform="true")
+
+    def _refresh(self):
+        try:
+            coins = self._fetch()
+            if not coins:
+                return
+            updated = time.time()
+            cache.dump_json(self.path, {"updated": updated, "coins": coins})
+            with self._lock:
+                self._build(coins, updated)
+            logger.info(f"Coin list refreshed, {len(coins)} coins")
+        except Exception as e:
+            logger.warning(f"Coin list refresh failed: {e}")
+
+    def refresh(self, block=False):
+        """Download fresh coin list. By default it's done in background thread"""
+        if self._refreshing is not None and self._refreshing.is_alive():
+            thread = self._refreshing
+        else:
+            thread = threading.Thread(
+                target=self._refresh, name="gecko-registry", daemon=True
+            )
+            self._refreshing = thread
+            thread.start()
+        if block:
+            thread.join()
+
+    def __len__(self):
+        self._load()
+        return len(self._by_id)
+
+    def __contains__(self, coin_id):
+        self._load()
+        return coin_id in self._by_id
+
+    def get(self, coin_id) -> dict or None:
+        self._load()
+        return self._by_id.get(coin_id)
+
+    def ids(self) -> list:
+        self._load()
+        return list(self._by_id)
+
+    def coins(self) -> list:
+        self._load()
+        return list(self._by_id.values())
+
+    def candidates(self, query: str) -> list:
+        """Ids of all coins that match query by id, symbol or name. Best match first"""
+        self._load()
+        query = query.lower()
+        found = [query] if query in self._by_id else []
+        for index in (self._by_symbol, self._by_name):
+            found += [i for i in index.get(query, []) if i not in found]
+        return found
+
+    def resolve(self, query: str) -> str:
+        """Id of coin by its id, symbol or name. Raises ValueError if there is none"""
+        found = self.candidates(query)
+        if not found:
+            raise ValueError(f"Could not find coin with the given id: {query}\n")
+        if len(found) > 1:
+            logger.info(f"{query} is ambiguous, using {found[0]}, other: {found[1:]}")
+        return found[0]
+
+    def similar(self, query: str, limit=10) -> list:
+        """Ids closest to query, for typos and half remembered names. Fuzzy index is
+        built on first search and rebuilt only when coin list snapshot changes"""
+        self._load()
+        index = self._fuzzy
+        if index is None:
+            with self._lock:
+                if self._fuzzy is None:
+                    ranked = sorted(self._by_id.values(), key=self._rank)
+                    self._fuzzy = FuzzyIndex(coin["id"] for coin in ranked)
+                index = self._fuzzy
+        return index.matches(query, limit)
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.coins(), columns=["id", "symbol", "name"])
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> CoinRegistry:
+    """Return shared coin registry, create it on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CoinRegistry()
+    return _registry
@@ -0,0 +1,195 @@
+import functools
+import inspect
+import logging
+import pickle
+import re
+import threading
+from typing import Iterator, List, NamedTuple, Optional
+import cachetools
+import lxml.etree
+
+logger = logging.getLogger("gecko-scraper")
+
+# bump when parsing of pages changes, so cached results of old parser are not reused
+PARSE_VERSION = 1
+VIEW_TTL = 10 * 60
+VIEW_CACHE_SIZE = 16 * 1024 * 1024  # bytes of parsed views kept in memory
+
+# tags inside scripts and comments don't count, those are skipped as whole
+_SKIP = {"script": re.compile(r"</script\s*>", re.IGNORECASE), "!--": re.compile("-->")}
+_TBODY = re.compile(r"<(?:(script)\b|(!--)|(/?)(tbody)\b)", re.IGNORECASE)
+_ROWS = re.compile(r"<(?:(script)\b|(!--)|(/?)(tr|table|tbody)\b)", re.IGNORECASE)
+_PARSER = lxml.etree.HTMLParser(remove_comments=True, remove_pis=True)
+
+
+class Row(NamedTuple):
+    text: str  # the same as BeautifulSoup tag.text, works with utils.clean_row
+    link: Optional[str]  # href of first link in row
+
+
+class Table:
+    """Rows of html table kept as two column arrays: texts and links"""
+
+    def __init__(self, texts: List[str], links: List[Optional[str]]):
+        self.texts = texts
+        self.links = links
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __iter__(self) -> Iterator[Row]:
+        return map(Row, self.texts, self.links)
+
+
+def _scan(html: str, pattern, pos=0):
+    """Yield (match, closing, tag) of tags matched by pattern, skipping scripts and
+    comments"""
+    while True:
+        match = pattern.search(html, pos)
+        if match is None:
+            return
+        pos = match.end()
+        skip = match.group(1) or match.group(2)
+        if skip:
+            end = _SKIP[skip.lower()].search(html, pos)
+            if end is None:
+                return
+            pos = end.end()
+        else:
+            yield match, bool(match.group(3)), match.group(4).lower()
+
+
+def _rows_end(html: str, start: int, limit: int) -> int:
+    """Position where `limit` rows of table body starting at `start` end"""
+    depth, rows = 0, 0  # depth of tables nested in rows
+    for match, closing, tag in _scan(html, _ROWS, start):
+        if tag == "table":
+            depth += -1 if closing else 1
+            if depth < 0:  # end of our table, </tbody> was omitted
+                return match.start()
+        elif tag == "tbody" and closing and depth == 0:
+            return match.start()
+        elif tag == "tr" and not closing and depth == 0:
+            rows += 1
+            if rows > limit:
+                return match.start()
+    return len(html)
+
+
+def table_region(html: str, index=0, limit=None) -> Optional[str]:
+    """Raw html of `index`-th <tbody> element (counting only top level ones) or None.
+    With `limit` region ends after that many rows and rest of document isn't scanned"""
+    depth, start, found = 0, None, -1
+    for match, closing, _ in _scan(html, _TBODY):
+        if not closing:
+            if depth == 0:
+                found += 1
+                start = match.start()
+                if found == index and limit is not None:
+                    return html[start : _rows_end(html, match.end(), limit)]
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0 and found == index:
+                return html[start : html.find(">", match.end()) + 1]
+    if start is not None and found == index:  # not closed, take rest of document
+        return html[start:]
+    return None
+
+
+def parse_table(html: str, index=0, limit=None) -> Table:
+    """Parse rows of `index`-th table body of page.
+
+    Only the <tbody> part of document is handed to lxml, rest of the page (scripts,
+    navigation, footers) is never parsed. With `limit` only first `limit` rows are
+    cut out and parsed. Each row is reduced to its text and first link, which is all
+    Overview views need.
+    """
+    region = table_region(html, index, limit)
+    texts, links = [], []
+    if region is None:
+        return Table(texts, links)
+    root = lxml.etree.fromstring(f"<table>{region}</table>", _PARSER)
+    if root is None:
+        return Table(texts, links)
+    lxml.etree.strip_elements(root, "script", "style", with_tail=False)
+    for row in root.iter("tr"):
+        texts.append("".join(row.itertext()))
+        link = next(row.iter("a"), None)
+        links.append(link.get("href") if link is not None else None)
+    return Table(texts, links)
+
+
+def sizeof(value) -> int:
+    """Approximate memory used by parsed view, in bytes"""
+    if hasattr(value, "memory_usage"):  # pandas DataFrame or Series
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    try:
+        return len(pickle.dumps(value))
+    except Exception:
+        return 1024
+
+
+def _entry_size(entry) -> int:
+    return sizeof(entry[0])
+
+
+_views = cachetools.TTLCache(VIEW_CACHE_SIZE, ttl=VIEW_TTL, getsizeof=_entry_size)
+_views_lock = threading.Lock()
+
+
+def cached_view(func):
+    """Cache final result of scraping view method.
+
+    Result is kept under key made of view name, its arguments (other than `n`) and
+    PARSE_VERSION. Views that accept `n` parse only that many rows; entry made for
+    smaller `n` is recomputed when more rows are asked for, otherwise calls with
+    any `n` are served from cache. Cache evicts by total size of results
+    (VIEW_CACHE_SIZE), so repeated views are a dictionary lookup and memory stays
+    flat. Callers get a copy.
+    """
+    signature = inspect.signature(func)
+    limited = "n" in signature.parameters
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        # positional and keyword calls are bound to the same arguments and entry
+        n = None if limited else kwargs.pop("n", None)
+        bound = signature.bind(self, *args, **kwargs)
+        if limited:
+            n = bound.arguments.pop("n", None)
+        bound.apply_defaults()
+        arguments = tuple(bound.arguments.items())[1:]  # without self
+        key = (PARSE_VERSION, func.__qualname__, arguments)
+        with _views_lock:
+            result, complete = _views.get(key, (None, False))
+        if result is None or not (complete or (n is not None and n <= len(result))):
+            if limited:
+                bound.arguments["n"] = n
+                result = func(*bound.args, **bound.kwargs)
+                complete = n is None or len(result) < n
+            else:
+                result, complete = func(*bound.args, **bound.kwargs), True
+            with _views_lock:
+                try:
+                    _views[key] = result, complete
+                except ValueError:  # bigger than whole cache
+                    logger.info(f"{func.__qualname__} result too big to cache")
+        if hasattr(result, "head"):
+            return result.head(n).copy()
+        return result.copy() if hasattr(result, "copy") else result
+
+    wrapper.cache_clear = clear_views
+    return wrapper
+
+
+def clear_views():
+    with _views_lock:
+        _views.clear()
+
+
+def views_size() -> int:
+    """Bytes used by cached views"""
+    with _views_lock:
+        return int(_views.currsize)
@@ -1,6 +1,9 @@
 import pandas as pd
 import json
-import requests
+from moonbag.common import transport
+from moonbag.common.aio import async_methods
+from moonbag.common.singleflight import coalesce
+from moonbag.common.identity import to_contract
 import logging
 from moonbag.onchain.ethereum.utils import (
     manual_replace,
@@ -10,14 +13,17 @@ from moonbag.onchain.ethereum.utils import (
 from datetime import datetime
 
 
+@async_methods()
 class EthplorerClient:
+    BASE_URL = "https://api.ethplorer.io"
+
     def __init__(self, api_key=None):
         self.api_key = api_key if api_key else "freekey"
         self.api_query = f"?apiKey={self.api_key}"
 
     @staticmethod
     def _request_call(x):
-        response = requests.request("GET", x)
+        response = transport.get(x)
         return json.loads(response.text)
 
     def _get_address_info(self, address):
@@ -25,6 +31,7 @@ class EthplorerClient:
         return self._request_call(url)
 
     def _get_token_info(self, address):
+        address = to_contract(address)
         url = f"https://api.ethplorer.io/getTokenInfo/{address}{self.api_query}"
         return self._request_call(url)
 
@@ -33,6 +40,7 @@ class EthplorerClient:
         return self._request_call(url)
 
     def _get_token_history(self, address):
+        address = to_contract(address)
         url = f"https://api.ethplorer.io/getTokenHistory/{address}{self.api_query}&limit=1000"
         return self._request_call(url)
 
@@ -46,17 +54,21 @@ class EthplorerClient:
         )
         return self._request_call(url)
 
+    @coalesce
     def _get_token_price_history_grouped(self, address):
+        address = to_contract(address)
         url = f"https://api.ethplorer.io/getTokenPriceHistoryGrouped/{address}{self.api_query}"
         return self._request_call(url)
 
     def _get_token_history_grouped(self, address):
+        address = to_contract(address)
         url = (
             f"https://api.ethplorer.io/getTokenHistoryGrouped/{address}{self.api_query}"
         )
         return self._request_call(url)
 
     def _get_top_token_holders(self, address):
+        address = to_contract(address)
         url = f"https://api.ethplorer.io/getTopTokenHolders/{address}{self.api_query}&limit=100"
         return self._request_call(url)
 
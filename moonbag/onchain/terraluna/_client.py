@@ -1,24 +1,22 @@
-import requests
-from retry import retry
-from requests.adapters import HTTPAdapter
+from moonbag.common import transport
+from moonbag.common.aio import async_methods
 
 
+@async_methods()
 class TerraClient:
     BASE_URL = "https://fcd.terra.dev/"
 
     def __init__(self):
         self.header = {"Accept": "application/json", "User-Agent": "moonbag"}
-        self.s = requests.Session()
-        self.s.mount(self.BASE_URL, HTTPAdapter(max_retries=5))
+        self.s = transport.get_session()
 
-    @retry(tries=2, max_delay=5)
     def _make_request(self, endpoint, payload=None, **kwargs):
         url = self.BASE_URL + endpoint
         if payload is None:
             payload = {}
         if kwargs:
             payload.update(kwargs)
-        return requests.get(url, params=payload).json()
+        return self.s.get(url, params=payload, headers=self.header).json()
 
     def _get_tx(self, address):
         return self._make_request(f"txs/{address}")
@@ -6,7 +6,9 @@ import logging
 from moonbag.common import LOGO, MOON, print_table
 from argparse import ArgumentError
 from inspect import signature
+from requests.exceptions import RequestException
 from moonbag.common.utils import MoonParser
+from moonbag.common.retries import deadline, COMMAND_DEADLINE
 from moonbag.onchain.terraluna.terra import Terra
 
 logger = logging.getLogger("terra-menu")
@@ -147,10 +149,15 @@ def main():
             elif callable(
                 view
             ):  # If function takes params return func(args), else func()
-                if len(signature(view).parameters) > 0:
-                    view(others)
-                else:
-                    view()
+                with deadline(COMMAND_DEADLINE):
+                    if len(signature(view).parameters) > 0:
+                        view(others)
+                    else:
+                        view()
+
+        except RequestException as e:
+            print(f"{e}\n")
+            continue
 
         except ArgumentError:
             print("The command selected doesn't exist")
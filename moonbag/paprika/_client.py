@@ -1,8 +1,8 @@
 import datetime
 
-import requests
-from retry import retry
-from requests.adapters import HTTPAdapter
+from moonbag.common import transport
+from moonbag.common.aio import async_methods
+from moonbag.common.identity import to_paprika
 
 
 ENDPOINTS = {
@@ -25,23 +25,47 @@ ENDPOINTS = {
     "search": "/search",
 }
 
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# How long responses of given ENDPOINTS are kept in local cache.
+# Endpoints that are not listed here are never cached.
+CACHE_TTL = {
+    "global": 5 * MINUTE,
+    "coins": 24 * HOUR,
+    "coin_tweeter": 15 * MINUTE,
+    "coin_events": HOUR,
+    "coin_exchanges": HOUR,
+    "coin_markets": 5 * MINUTE,
+    "ohlcv": 5 * MINUTE,
+    "ohlcv_hist": HOUR,
+    "people": 24 * HOUR,
+    "tickers": 5 * MINUTE,
+    "ticker_info": MINUTE,
+    "exchanges": 10 * MINUTE,
+    "exchange_info": 10 * MINUTE,
+    "exchange_markets": 5 * MINUTE,
+    "contract_platforms": 24 * HOUR,
+    "contract_platform_addresses": 6 * HOUR,
+    "search": HOUR,
+}
+
 
+@async_methods()
 class Client:
     BASE_URL = "https://api.coinpaprika.com/v1"
 
     def __init__(self):
         self.header = {"Accept": "application/json", "User-Agent": "moonbag"}
-        self.s = requests.Session()
-        self.s.mount(self.BASE_URL, HTTPAdapter(max_retries=5))
+        self.s = transport.get_session()
 
-    @retry(tries=2, max_delay=5)
     def _make_request(self, endpoint, payload=None, **kwargs):
         url = self.BASE_URL + endpoint
         if payload is None:
             payload = {}
         if kwargs:
             payload.update(kwargs)
-        return requests.get(url, params=payload).json()
+        return self.s.get(url, params=payload, headers=self.header).json()
 
     def _get_global_market(self):
         return self._make_request(ENDPOINTS["global"])
@@ -50,23 +74,23 @@ class Client:
         return self._make_request(ENDPOINTS["coins"])
 
     def _get_coin_twitter_timeline(self, coin_id="eth-ethereum"):
-        return self._make_request(ENDPOINTS["coin_tweeter"].format(coin_id))
+        return self._make_request(ENDPOINTS["coin_tweeter"].format(to_paprika(coin_id)))
 
     def _get_coin_events_by_id(self, coin_id="eth-ethereum"):
-        return self._make_request(ENDPOINTS["coin_events"].format(coin_id))
+        return self._make_request(ENDPOINTS["coin_events"].format(to_paprika(coin_id)))
 
     def _get_coin_exchanges_by_id(self, coin_id="eth-ethereum"):
-        return self._make_request(ENDPOINTS["coin_exchanges"].format(coin_id))
+        return self._make_request(ENDPOINTS["coin_exchanges"].format(to_paprika(coin_id)))
 
     def _get_coin_markets_by_id(self, coin_id="eth-ethereum", quotes="USD,BTC"):
         return self._make_request(
-            ENDPOINTS["coin_markets"].format(coin_id), quotes=quotes
+            ENDPOINTS["coin_markets"].format(to_paprika(coin_id)), quotes=quotes
         )
 
     def _get_ohlc_last_day(self, coin_id="eth-ethereum", quotes="USD"):
         """ "string Default: "usd"
         returned data quote (available values: usd btc)"""
-        return self._make_request(ENDPOINTS["ohlcv"].format(coin_id), quotes=quotes)
+        return self._make_request(ENDPOINTS["ohlcv"].format(to_paprika(coin_id)), quotes=quotes)
 
     def _get_ohlc_historical(
         self, coin_id="eth-ethereum", quotes="USD", start=None, end=None
@@ -81,7 +105,7 @@ class Client:
         """"string Default: "usd"
         returned data quote (available values: usd btc)"""
         return self._make_request(
-            ENDPOINTS["ohlcv_hist"].format(coin_id), quotes=quotes, start=start, end=end
+            ENDPOINTS["ohlcv_hist"].format(to_paprika(coin_id)), quotes=quotes, start=start, end=end
         )
 
     def _get_people(self, person_id="vitalik-buterin"):
@@ -92,7 +116,7 @@ class Client:
 
     def _get_tickers_for_coin(self, coin_id="btc-bitcoin", quotes="USD,BTC"):
         return self._make_request(
-            ENDPOINTS["ticker_info"].format(coin_id), quotes=quotes
+            ENDPOINTS["ticker_info"].format(to_paprika(coin_id)), quotes=quotes
         )
 
     def _get_exchanges(self, quotes="USD,BTC"):
@@ -134,3 +158,8 @@ class Client:
         return self._make_request(
             ENDPOINTS["contract_platform_addresses"].format(platform_id)
         )
+
+
+transport.register_ttls(
+    Client.BASE_URL, {ENDPOINTS[endpoint]: ttl for endpoint, ttl in CACHE_TTL.items()}
+)
@@ -1,14 +1,15 @@
 import pandas as pd
 import logging
 import textwrap
+from functools import cached_property
 from moonbag.paprika._client import Client
 from moonbag.common.utils import wrap_headers_in_dataframe as header_wrapper
 
 
 class CoinPaprika(Client):
-    def __init__(self):
-        super().__init__()
-        self._coins_list = self._get_coins()
+    @cached_property
+    def _coins_list(self):
+        return self._get_coins()
 
     def _get_coins_info(self, quotes="USD"):
         tickers = self._get_tickers_for_all_coins(quotes)
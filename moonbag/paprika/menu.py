@@ -7,7 +7,9 @@ import logging
 from moonbag.common import LOGO, MOON, print_table
 from argparse import ArgumentError
 from inspect import signature
+from requests.exceptions import RequestException
 from moonbag.common.utils import MoonParser
+from moonbag.common.retries import deadline, COMMAND_DEADLINE
 from moonbag.paprika.coinpaprika import CoinPaprika
 
 logger = logging.getLogger("paprika-menu")
@@ -326,10 +328,15 @@ def main():
             elif callable(
                 view
             ):  # If function takes params return func(args), else func()
-                if len(signature(view).parameters) > 0:
-                    view(others)
-                else:
-                    view()
+                with deadline(COMMAND_DEADLINE):
+                    if len(signature(view).parameters) > 0:
+                        view(others)
+                    else:
+                        view()
+
+        except RequestException as e:
+            print(f"{e}\n")
+            continue
 
         except ArgumentError:
             print("The command selected doesn't exist")
@@ -0,0 +1,52 @@
+import asyncio
+import time
+from moonbag.common import aio
+
+
+@aio.async_methods(prefixes=("_get_", "run_query"))
+class FakeClient:
+    BASE_URL = "https://fake.api"
+
+    def _get_value(self, value, multiplier=1):
+        time.sleep(0.05)
+        return value * multiplier
+
+    @staticmethod
+    def run_query(url, query):
+        return url, query
+
+
+def test_async_methods_are_added():
+    client = FakeClient()
+    assert hasattr(client, "_aget_value")
+    assert hasattr(client, "arun_query")
+    assert aio.run(client._aget_value(2, multiplier=3)) == 6
+    assert aio.run(client.arun_query("https://a.b", "q")) == ("https://a.b", "q")
+
+
+def test_fan_out_keeps_order_and_runs_concurrently():
+    client = FakeClient()
+    start = time.time()
+    results = aio.fan_out(client._get_value, range(8), host="fake.api")
+    assert results == list(range(8))
+    # 8 calls, 4 at once -> ~2 round trips instead of 8
+    assert time.time() - start < 0.05 * 6
+
+
+def test_fan_out_with_kwargs_and_exceptions():
+    def func(value):
+        if value == 1:
+            raise ValueError("boom")
+        return value
+
+    results = aio.fan_out(func, [{"value": 0}, {"value": 1}], return_exceptions=True)
+    assert results[0] == 0
+    assert isinstance(results[1], ValueError)
+
+
+def test_host_semaphore_limits():
+    async def check():
+        return aio.host_semaphore("api.ethplorer.io")._value
+
+    assert aio.run(check()) == aio.HOST_LIMITS["api.ethplorer.io"]
+    assert asyncio.iscoroutinefunction(FakeClient._aget_value)
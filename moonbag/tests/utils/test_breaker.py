@@ -0,0 +1,82 @@
+import pytest
+import requests
+from moonbag.common import breaker
+from moonbag.common.breaker import CircuitBreaker, Breakers, CircuitOpen
+from moonbag.common.retries import DeadlineExceeded, deadline
+from moonbag.tests.utils.test_retries import FakeAdapter, make_session
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_states():
+    clock = FakeClock()
+    circuit = CircuitBreaker(
+        "a.com", failure_threshold=2, recovery_timeout=10, clock=clock
+    )
+    circuit.record_failure()
+    assert circuit.state == breaker.CLOSED and circuit.allow()
+    circuit.record_failure()
+    assert circuit.state == breaker.OPEN and not circuit.allow()
+
+    clock.now = 10
+    assert circuit.state == breaker.HALF_OPEN
+    assert circuit.allow()
+    assert not circuit.allow()  # only single probe
+    circuit.record_failure()
+    assert circuit.state == breaker.OPEN
+
+    clock.now = 20
+    assert circuit.allow()
+    circuit.record_success()
+    assert circuit.state == breaker.CLOSED and circuit.failures == 0
+
+
+def test_breakers_record_events():
+    breakers = Breakers(failure_threshold=1)
+    breakers.get("a.com").record_failure("boom")
+    assert [(e["host"], e["to"]) for e in breakers.events] == [("a.com", "open")]
+    assert breakers.status()[0]["state"] == breaker.OPEN
+
+
+def test_open_circuit_short_circuits_requests():
+    session, adapter = make_session([500, 500, 500, 200])
+    session.breakers.configure_host("fake", 2)
+    assert session.get("http://fake/x").status_code == 500
+    assert adapter.statuses == [500, 200]
+    with pytest.raises(CircuitOpen):
+        session.get("http://fake/x")
+    assert adapter.statuses == [500, 200]
+
+
+class RaisingAdapter(FakeAdapter):
+    def __init__(self, error):
+        super().__init__([])
+        self.error = error
+
+    def send(self, request, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        raise self.error
+
+
+def test_probe_is_released_when_request_is_cut_short():
+    session, _ = make_session([])
+    circuit = session.breakers.get("fake")
+    circuit.failure_threshold = 1
+    circuit.record_failure()
+    circuit.opened_at -= circuit.recovery_timeout
+    session.mount("http://fake/", RaisingAdapter(KeyboardInterrupt()))
+    with pytest.raises(KeyboardInterrupt):
+        session.get("http://fake/x")
+    assert circuit.allow()  # probe wasn't left taken
+    circuit.release()
+
+    session.mount("http://fake/", RaisingAdapter(requests.exceptions.ReadTimeout()))
+    with deadline(0.5), pytest.raises((DeadlineExceeded, requests.Timeout)):
+        session.get("http://fake/x", timeout=5)
+    assert circuit.state == breaker.HALF_OPEN and circuit.total_failures == 1
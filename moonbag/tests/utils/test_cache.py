@@ -0,0 +1,99 @@
+import time
+import requests
+from requests.adapters import BaseAdapter
+from moonbag.common import cache, transport
+from moonbag.common.cache import ResponseCache, make_key
+from moonbag.common.transport import MoonSession, register_ttls, get_ttl
+
+
+def test_make_key():
+    assert make_key("get", "https://a.com/x?a=1") == make_key(
+        "GET", "https://a.com/x?a=1"
+    )
+    assert make_key("GET", "https://a.com/x?a=1") != make_key(
+        "GET", "https://a.com/x?a=2"
+    )
+    assert make_key("POST", "https://a.com/x", b"q1") != make_key(
+        "POST", "https://a.com/x", b"q2"
+    )
+    assert make_key("GET", "https://a.com/x", None, [("Authorization", "a")]) != (
+        make_key("GET", "https://a.com/x", None, [("authorization", "b")])
+    )
+
+
+def test_cache_set_get_and_expire(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite"))
+    cache.set("key", "https://a.com/x", 200, {"Content-Type": "json"}, b"body", 60)
+    entry = cache.get("key")
+    assert entry["body"] == b"body"
+    assert entry["headers"] == {"Content-Type": "json"}
+
+    cache.set("old", "https://a.com/y", 200, {}, b"old", -1)
+    assert cache.get("old") is None
+    assert cache.get("old", allow_stale=True)["stale"] is True
+    assert cache.stats()["entries"] == 2
+    assert cache.clear(expired_only=True) == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite"), max_size=300)
+    body = bytes(range(256))  # not compressible
+    cache.set("first", "u", 200, {}, body, 60)
+    time.sleep(0.01)
+    cache.set("second", "u", 200, {}, body, 60)
+    assert cache.get("first") is None
+    assert cache.get("second")["body"] == body
+
+
+def test_register_ttls(monkeypatch):
+    monkeypatch.setattr(transport, "_TTLS", [])
+    register_ttls("https://test.api/v1", {"/coins/{}/events": 100, "/tickers": 5})
+    assert get_ttl("https://test.api/v1/coins/eth-ethereum/events") == 100
+    assert get_ttl("https://test.api/v1/tickers?quotes=USD") == 5
+    assert get_ttl("https://test.api/v1/coins/eth-ethereum") is None
+
+
+class BodyAdapter(BaseAdapter):
+    def __init__(self, bodies):
+        super().__init__()
+        self.bodies = list(bodies)
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = self.bodies.pop(0)
+        return response
+
+    def close(self):
+        pass
+
+
+def test_rejected_responses_are_not_cached(tmp_path, monkeypatch):
+    responses = ResponseCache(path=str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(cache, "get_cache", lambda: responses)
+    monkeypatch.setattr(transport, "_CACHEABLE", {})
+    transport.register_cacheable(
+        "http://fake/", lambda response: b"Error" not in response.content
+    )
+    session = MoonSession(hosts={})
+    session.mount("http://fake/", BodyAdapter([b"Error", b"ok", b"new"]))
+    assert session.get("http://fake/x", ttl=60).content == b"Error"
+    assert session.get("http://fake/x", ttl=60).content == b"ok"
+    assert session.get("http://fake/x", ttl=60).content == b"ok"  # cached
+
+
+def test_requests_with_other_credentials_are_not_shared(tmp_path, monkeypatch):
+    responses = ResponseCache(path=str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(cache, "get_cache", lambda: responses)
+    session = MoonSession(hosts={})
+    session.mount("http://fake/", BodyAdapter([b"a", b"b"]))
+    key_a, key_b = {"authorization": "Apikey a"}, {"authorization": "Apikey b"}
+    assert session.get("http://fake/x", ttl=60, headers=key_a).content == b"a"
+    assert session.get("http://fake/x", ttl=60, headers=key_b).content == b"b"
+    assert session.get("http://fake/x", ttl=60, headers=key_a).content == b"a"
+    # headers that don't change response still share it
+    other = {**key_a, "Accept": "*/*"}
+    assert session.get("http://fake/x", ttl=60, headers=other).content == b"a"
@@ -1,8 +1,12 @@
+import pytest
 from moonbag.cryptocompare.utils import (
     get_closes_matches_by_name,
     get_closes_matches_by_symbol,
     create_dct_mapping_from_df,
+    chunk_symbols,
 )
+from moonbag.cryptocompare import cryptocomp, _client
+from moonbag.cryptocompare.cryptocomp import CryptoCompare
 import pandas as pd
 
 
@@ -12,3 +16,63 @@ def test_create_dct_mapping_for_df():
         "one": "abc",
         "two": "cde",
     }
+
+
+def test_closes_matches():
+    coins = {
+        "BTC": "Bitcoin (BTC)",
+        "BCH": "Bitcoin Cash (BCH)",
+        "ETH": "Ethereum (ETH)",
+    }
+    assert list(get_closes_matches_by_name("etherum", coins)) == ["ETH"]
+    assert get_closes_matches_by_symbol("btc", coins) == {"BTC": "Bitcoin (BTC)"}
+
+
+def test_chunk_symbols():
+    symbols = ["BTC", "ETH", "DOGE", "SHIB"]
+    assert chunk_symbols(symbols, 100) == ["BTC,ETH,DOGE,SHIB"]
+    chunks = chunk_symbols(symbols, 8)
+    assert chunks == ["BTC,ETH", "DOGE", "SHIB"]
+    assert all(len(c) <= 8 for c in chunks)
+
+
+def test_price_matrix(monkeypatch):
+    client = CryptoCompare(api_key="")
+    calls = []
+
+    def get_price(symbol, currency, **kwargs):
+        calls.append((symbol, currency))
+        raw = {
+            fsym: {
+                t: {"PRICE": len(fsym) * 10.0, "MKTCAP": "1e9"}
+                for t in currency.split(",")
+            }
+            for fsym in symbol.split(",")
+            if fsym != "NOPE"
+        }
+        return {"RAW": raw}
+
+    monkeypatch.setattr(client, "_get_price", get_price)
+    monkeypatch.setattr(cryptocomp, "FSYMS_MAX_LENGTH", 8)
+    df = client.get_price_matrix(["BTC", "ETH", "DOGE", "NOPE"], ["usd", "eur"])
+    assert len(calls) == 3
+    assert df.index.names == ["fsym", "tsym"]
+    assert df.loc[("DOGE", "EUR"), "PRICE"] == 40.0
+    assert df["MKTCAP"].dtype == "float64"
+    assert ("NOPE", "USD") not in df.index
+    assert len(df) == 6
+
+
+def test_coin_id_falls_back_to_coin_list(monkeypatch):
+    class EmptyIdentity:
+        def cryptocompare_id(self, coin):
+            return None
+
+    monkeypatch.setattr(_client, "get_identity", EmptyIdentity)
+    client = CryptoCompare(api_key="")
+    client.coin_list = pd.DataFrame(
+        {"Id": ["1182", "7605"], "Symbol": ["BTC", "ETH"], "FullName": ["", ""]}
+    )
+    assert client._coin_id("btc") == 1182
+    with pytest.raises(ValueError):
+        client._coin_id("NOPE")
@@ -0,0 +1,54 @@
+import numpy as np
+from moonbag.cryptocompare import history
+from moonbag.cryptocompare.history import backfill, windows
+
+DAY = history.INTERVALS["day"]
+END = 1_700_000_000 - 1_700_000_000 % DAY
+
+
+def candles(to_ts, limit, first=END - 9_999 * DAY):
+    """Fake /data/histoday response: limit + 1 candles ending at to_ts, zeros before
+    first traded day"""
+    times = range(to_ts - limit * DAY, to_ts + 1, DAY)
+    return [
+        {
+            "time": t,
+            "open": 1.0 if t >= first else 0,
+            "high": 2.0 if t >= first else 0,
+            "low": 0.5 if t >= first else 0,
+            "close": float(t) if t >= first else 0,
+            "volumefrom": 1,
+            "volumeto": 10,
+        }
+        for t in times
+    ]
+
+
+def test_windows_cover_points_without_overlap():
+    calls = windows(END + 100, 4500, DAY)
+    assert calls == [(END, 1999), (END - 2000 * DAY, 1999), (END - 4000 * DAY, 499)]
+
+
+def test_backfill_is_contiguous():
+    requested = []
+
+    def fetch_window(to_ts, limit):
+        requested.append(to_ts)
+        return candles(to_ts, limit)
+
+    df = backfill(fetch_window, "day", points=5000, end=END)
+    assert len(requested) == 3
+    assert len(df) == 5000
+    assert df["time"].dtype == np.int64 and df["close"].dtype == np.float64
+    assert (np.diff(df["time"]) == DAY).all()
+    assert df["time"].iloc[-1] == END
+
+
+def test_backfill_drops_duplicates_and_empty_candles():
+    def fetch_window(to_ts, limit):
+        # overlapping windows and history shorter than asked for
+        return candles(to_ts, limit + 5, first=END - 2999 * DAY)
+
+    df = backfill(fetch_window, "day", points=6000, end=END)
+    assert len(df) == 3000
+    assert df["time"].is_unique and df["time"].is_monotonic_increasing
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from moonbag.cryptocompare.cryptocomp import CryptoCompare
+from moonbag.cryptocompare.resample import parse_interval, resample, source_interval
+
+
+def minutes(n, start=1_700_000_000 - 1_700_000_000 % 86400 - 90 * 60):
+    rng = np.random.default_rng(1)
+    close = 100 + rng.standard_normal(n).cumsum()
+    return pd.DataFrame(
+        {
+            "time": start + 60 * np.arange(n, dtype="int64"),
+            "open": close + rng.standard_normal(n),
+            "high": close + 2,
+            "low": close - 2 - rng.random(n),
+            "close": close,
+            "volumeto": rng.random(n) * 1000,
+        }
+    )
+
+
+def test_parse_interval():
+    assert parse_interval("15m") == 900
+    assert parse_interval("4H") == 4 * 3600
+    assert parse_interval("w") == 7 * 86400
+    assert source_interval(parse_interval("4h")) == "hour"
+    assert source_interval(parse_interval("1w")) == "day"
+    assert source_interval(parse_interval("90m")) == "minute"
+    for wrong in ("0h", "4x", ""):
+        with pytest.raises(ValueError):
+            parse_interval(wrong)
+
+
+@pytest.mark.parametrize("interval", ["5m", "1h", "4h", "1d"])
+def test_resample_matches_pandas(interval):
+    df = minutes(5000).drop(index=[10, 11, 700])  # gaps
+    seconds = parse_interval(interval)
+    result = resample(df, seconds)
+
+    expected = (
+        df.set_index(pd.to_datetime(df["time"], unit="s"))
+        .resample(f"{seconds}s")
+        .agg(
+            {
+                "open": "first",
+                "high": "max",
+                "low": "min",
+                "close": "last",
+                "volumeto": "sum",
+            }
+        )
+        .dropna()
+    )
+    assert len(result) == len(expected)
+    assert (pd.to_datetime(result["time"], unit="s") == expected.index).all()
+    for column in expected.columns:
+        np.testing.assert_allclose(result[column], expected[column])
+
+
+def test_weeks_start_on_monday():
+    df = minutes(60 * 24 * 20)
+    df = resample(df, parse_interval("1d"))
+    weeks = resample(df, parse_interval("1w"))
+    assert (pd.to_datetime(weeks["time"], unit="s").dt.dayofweek == 0).all()
+    assert weeks["volumeto"].sum() == pytest.approx(df["volumeto"].sum())
+
+
+def test_ohlcv_is_built_from_coarsest_dividing_interval(monkeypatch):
+    client = CryptoCompare(api_key="")
+    asked = []
+
+    def get_historical_ohlcv(symbol, currency, interval, limit):
+        asked.append((interval, limit))
+        return minutes(limit)
+
+    monkeypatch.setattr(client, "get_historical_ohlcv", get_historical_ohlcv)
+    df = client.get_ohlcv("BTC", "USD", "15m", limit=10)
+    assert asked == [("minute", 11 * 15)]
+    assert len(df) == 10 and (np.diff(df["time"]) == 900).all()
+    client.get_ohlcv("BTC", "USD", "4h", limit=10)
+    assert asked[-1] == ("hour", 11 * 4)
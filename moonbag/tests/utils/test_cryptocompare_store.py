@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+from moonbag.cryptocompare.history import INTERVALS
+from moonbag.cryptocompare import cryptocomp
+from moonbag.cryptocompare.cryptocomp import CryptoCompare
+from moonbag.cryptocompare.store import CandleStore
+
+HOUR = INTERVALS["hour"]
+NOW = 1_700_000_000 - 1_700_000_000 % HOUR + 600  # 10 minutes into open candle
+
+
+class Exchange:
+    """Fake /data/histohour, close of every candle is its time"""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, to_ts, limit):
+        self.requests.append((to_ts, limit))
+        return [
+            {"time": t, "open": 1.0, "high": 2.0, "low": 0.5, "close": float(t)}
+            for t in range(to_ts - limit * HOUR, to_ts + 1, HOUR)
+        ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandleStore(root=str(tmp_path))
+
+
+def test_first_load_stores_closed_candles(store):
+    fetch = Exchange()
+    df = store.load(fetch, "btc", "usd", "hour", 100, now=NOW)
+    assert len(df) == 100
+    assert df["time"].iloc[-1] == NOW - 600
+    assert (np.diff(df["time"]) == HOUR).all()
+    assert len(store.read("BTC", "USD", "hour")) == 99  # open candle isn't stored
+
+
+def test_refresh_fetches_only_new_candles(store, tmp_path):
+    fetch = Exchange()
+    store.load(fetch, "BTC", "USD", "hour", 100, now=NOW)
+    fetch.requests.clear()
+
+    df = CandleStore(root=str(tmp_path)).load(
+        fetch, "BTC", "USD", "hour", 100, now=NOW + 3 * HOUR
+    )
+    assert fetch.requests == [(NOW - 600 + 3 * HOUR, 3)]
+    assert len(df) == 100 and df["time"].is_unique
+    assert df["time"].iloc[-1] == NOW - 600 + 3 * HOUR
+    assert len(store.read("BTC", "USD", "hour")) == 102
+
+
+def test_longer_history_is_fetched_once(store):
+    fetch = Exchange()
+    store.load(fetch, "BTC", "USD", "hour", 10, now=NOW)
+    df = store.load(fetch, "BTC", "USD", "hour", 50, now=NOW)
+    assert len(df) == 50 and (np.diff(df["time"]) == HOUR).all()
+    fetch.requests.clear()
+    store.load(fetch, "BTC", "USD", "hour", 50, now=NOW)
+    assert fetch.requests == [(NOW - 600, 0)]  # only the open candle
+
+
+def test_gap_after_long_pause_is_never_stored(store):
+    fetch = Exchange()
+    store.load(fetch, "BTC", "USD", "hour", 100, now=NOW)
+    later = NOW + 240 * HOUR
+    assert len(store.load(fetch, "BTC", "USD", "hour", 24, now=later)) == 24
+    df = store.load(fetch, "BTC", "USD", "hour", 500, now=later)
+    assert len(df) == 500
+    assert (np.diff(df["time"]) == HOUR).all()
+    assert (np.diff(store.read("BTC", "USD", "hour")["time"]) == HOUR).all()
+
+
+def test_short_gap_is_filled_from_high_water_mark(store):
+    fetch = Exchange()
+    store.load(fetch, "BTC", "USD", "hour", 100, now=NOW)
+    df = store.load(fetch, "BTC", "USD", "hour", 24, now=NOW + 30 * HOUR)
+    assert len(df) == 24
+    stored = store.read("BTC", "USD", "hour")
+    assert len(stored) == 129 and (np.diff(stored["time"]) == HOUR).all()
+
+
+def test_exchange_series_bypass_store(monkeypatch):
+    client = CryptoCompare(api_key="")
+    monkeypatch.setattr(cryptocomp, "get_candle_store", pytest.fail)
+    monkeypatch.setattr(
+        client,
+        "_get_historical_hour_prices",
+        lambda symbol, currency, limit, toTs, **kwargs: {
+            "Data": Exchange()(toTs, limit)
+        },
+    )
+    df = client.get_historical_ohlcv("BTC", "USD", "hour", 10, e="Binance")
+    assert len(df) == 10
+
+
+class Holes(Exchange):
+    """Exchange without candles at `missing` times"""
+
+    def __init__(self, missing):
+        super().__init__()
+        self.missing = set(missing)
+
+    def __call__(self, to_ts, limit):
+        candles = super().__call__(to_ts, limit)
+        return [c for c in candles if c["time"] not in self.missing]
+
+
+def test_candles_after_hole_are_returned_but_not_stored(store):
+    store.load(Exchange(), "BTC", "USD", "hour", 10, now=NOW)
+    last = int(store.read("BTC", "USD", "hour")["time"][-1])
+
+    # first new candle is missing
+    df = store.load(Holes([last + HOUR]), "BTC", "USD", "hour", 10, now=NOW + 6 * HOUR)
+    assert len(df) == 9 and last + HOUR not in set(df["time"])
+    assert df["time"].iloc[-1] == NOW - 600 + 6 * HOUR
+    assert store.read("BTC", "USD", "hour")["time"][-1] == last
+
+    # hole further into new candles, candles before it are stored
+    hole = last + 3 * HOUR
+    df = store.load(Holes([hole]), "BTC", "USD", "hour", 10, now=NOW + 6 * HOUR)
+    assert len(df) == 9 and hole not in set(df["time"])
+    stored = store.read("BTC", "USD", "hour")
+    assert stored["time"][-1] == hole - HOUR
+    assert (np.diff(stored["time"]) == HOUR).all()
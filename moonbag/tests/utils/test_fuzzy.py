@@ -0,0 +1,34 @@
+from moonbag.common.fuzzy import FuzzyIndex, ngrams
+
+COINS = [
+    "bitcoin",
+    "bitcoin-cash",
+    "wrapped-bitcoin",
+    "ethereum",
+    "ethereum-classic",
+    "uniswap",
+    "unicorn-token",
+    "dogecoin",
+    "polkadot",
+]
+
+
+def test_ngrams_are_padded():
+    assert ngrams("BTC") == {"  b", " bt", "btc", "tc "}
+    assert ngrams("a") == {"  a", " a "}
+
+
+def test_search_ranks_typos():
+    index = FuzzyIndex(COINS)
+    assert index.matches("etherium")[0] == "ethereum"
+    assert index.matches("uniswp")[0] == "uniswap"
+    assert index.matches("bitcoin")[:2] == ["bitcoin", "bitcoin-cash"]
+    assert index.matches("polkadot", limit=1) == ["polkadot"]
+
+
+def test_search_scores_and_cutoff():
+    index = FuzzyIndex(COINS)
+    (position, score), *_ = index.search("dogecoin")
+    assert COINS[position] == "dogecoin" and score == 1
+    assert index.matches("zzzzzz") == []
+    assert len(index.matches("coin", limit=20, cutoff=0)) > 3
@@ -0,0 +1,107 @@
+from unittest import mock
+import pytest
+from moonbag.gecko import gecko
+
+BASE = {
+    "id": "uniswap",
+    "links": {"repos_url": {"github": ["https://github.com/Uniswap"]}},
+    "categories": ["DeFi"],
+}
+MARKET = {
+    "current_price": {"usd": 20.0, "btc": 0.0005, "eth": 0.01},
+    "ath": {"usd": 44.0, "btc": 0.001, "eth": 0.02},
+    "ath_date": {"usd": "2021-05-03", "btc": "2020-09-18", "eth": "2020-09-18"},
+    "ath_change_percentage": {"usd": -55.0, "btc": -50.0, "eth": -50.0},
+    **{
+        column: {"usd": 1.0, "btc": 1.0, "eth": 1.0}
+        for column in [
+            "market_cap",
+            "fully_diluted_valuation",
+            "total_volume",
+            "high_24h",
+            "low_24h",
+        ]
+    },
+}
+DEVELOPER = {"forks": 100, "stars": 1000, "last_4_weeks_commit_activity_series": []}
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def get_coin_by_id(self, coin_id, **params):
+        self.calls.append(params)
+        data = dict(BASE)
+        if params["market_data"] == "true":
+            data["market_data"] = dict(MARKET)
+        if params["developer_data"] == "true":
+            data["developer_data"] = dict(DEVELOPER)
+        return data
+
+
+@pytest.fixture
+def coin():
+    with mock.patch.object(gecko, "GeckoClient", FakeClient), mock.patch.object(
+        gecko.Coin, "_validate_coin", return_value="uniswap"
+    ):
+        coin = gecko.Coin("uni")
+    return coin
+
+
+def test_sections_are_fetched_lazily(coin):
+    assert coin.client.calls == []
+    assert coin.categories == ["DeFi"]
+    assert coin.client.calls[0]["market_data"] == "false"
+    assert coin.client.calls[0]["sparkline"] == "false"
+
+    df = coin.all_time_high
+    assert coin.all_time_high is df
+    assert coin.market_data is coin.market_data
+    assert len(coin.client.calls) == 2
+    assert coin.client.calls[1]["market_data"] == "true"
+    assert coin.client.calls[1]["developer_data"] == "false"
+
+    assert "stars" in list(coin.developers_data["Metric"])
+    assert len(coin.client.calls) == 3
+    assert coin.client.calls[2]["market_data"] == "false"
+
+
+def test_stale_sections_are_fetched_again(coin):
+    df = coin.all_time_high
+    with mock.patch.object(gecko.time, "time", return_value=gecko.time.time() + 3600):
+        assert coin.all_time_high is not df
+    assert len(coin.client.calls) == 2
+
+
+def test_compare_coins_side_by_side():
+    with mock.patch.object(gecko, "GeckoClient", FakeClient):
+        coins = []
+        for coin_id in ["uniswap", "sushi"]:
+            with mock.patch.object(gecko.Coin, "_validate_coin", return_value=coin_id):
+                coins.append(gecko.Coin(coin_id))
+    df = gecko.compare_coins(coins, "all_time_high")
+    assert list(df.columns) == ["Metric", "uniswap", "sushi"]
+    assert df.set_index("Metric").loc["ath_usd"].tolist() == [44.0, 44.0]
+    assert all(len(coin.client.calls) == 1 for coin in coins)
+
+
+def test_load_skips_symbols_of_loaded_coin(capsys):
+    from moonbag.gecko.coin_menu import Controller
+
+    ids = {"btc": "bitcoin", "bitcoin": "bitcoin", "eth": "ethereum"}
+    alternatives = {"btc": ["bitcoin-cash"], "bitcoin": [], "eth": ["ethereum-pow"]}
+
+    def validate(self, symbol):
+        self.alternatives = alternatives[symbol]
+        return ids[symbol]
+
+    with mock.patch.object(gecko, "GeckoClient", FakeClient), mock.patch.object(
+        gecko.Coin, "_validate_coin", validate
+    ):
+        menu = Controller()
+        menu.load_coin(["btc", "bitcoin", "btc", "eth"])
+    assert [coin.coin_symbol for coin in menu.coins] == ["bitcoin", "ethereum"]
+    out = capsys.readouterr().out
+    assert "btc matches also: bitcoin-cash" in out
+    assert "eth matches also: ethereum-pow" in out
@@ -0,0 +1,108 @@
+from unittest import mock
+import numpy as np
+import pytest
+from moonbag.gecko import gecko, markets
+from moonbag.gecko.markets import Markets, to_frame
+
+
+def record(i, change, volume=1e6, ath_change=-50.0):
+    return {
+        "id": f"coin-{i}",
+        "symbol": f"c{i}",
+        "name": f"Coin {i}",
+        "current_price": 1.5 * i,
+        "market_cap": 1e9 / i,
+        "market_cap_rank": i,
+        "total_volume": volume,
+        "ath": 10.0 * i,
+        "ath_change_percentage": ath_change,
+        "ath_date": "2021-11-10T14:24:11.849Z",
+        "atl_change_percentage": 100.0 * i,
+        "price_change_percentage_1h_in_currency": change,
+        "price_change_percentage_24h_in_currency": None,
+    }
+
+
+RECORDS = [
+    record(1, 5.0),
+    record(2, -3.0, ath_change=-1.0),
+    record(3, 50.0, volume=10),  # illiquid
+    record(4, None),
+    record(5, 1.0),
+]
+
+
+def test_to_frame_types():
+    df = to_frame(RECORDS + [record(1, 5.0)])
+    assert len(df) == 5 and df.index[0] == "coin-1"
+    assert df["current_price"].dtype == np.float64
+    assert str(df["market_cap_rank"].dtype) == "Int64"
+    assert str(df["symbol"].dtype) == "category"
+    assert str(df["ath_date"].dtype) == "datetime64[ns, UTC]"
+    assert np.isnan(df.loc["coin-1", "max_supply"])
+
+
+def test_local_rankings():
+    df = to_frame(RECORDS)
+    assert list(markets.gainers(df, "1h").id) == ["coin-1", "coin-5", "coin-2"]
+    assert list(markets.gainers(df, "1h", n=1).id) == ["coin-1"]
+    assert list(markets.losers(df, "1h", n=2).id) == ["coin-2", "coin-5"]
+    assert markets.gainers(df, "1d").empty
+    assert list(markets.top_volume(df, n=2).id) == ["coin-1", "coin-2"]
+    assert markets.near_ath(df, n=1).id[0] == "coin-2"
+    assert markets.near_atl(df, n=1).id[0] == "coin-1"
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    snapshot = Markets(path=str(tmp_path / "markets.pkl"), pages=2)
+    snapshot._fetch_page = lambda page: RECORDS[(page - 1) * 3 : page * 3]
+    return snapshot
+
+
+def test_snapshot_is_fetched_and_persisted(snapshot):
+    snapshot.refresh(block=True)
+    assert len(snapshot.frame()) == 5
+    reloaded = Markets(path=snapshot.path, pages=2)
+    reloaded._fetch_page = mock.Mock(side_effect=AssertionError("fetched"))
+    assert list(reloaded.frame().id) == list(snapshot.frame().id)
+
+
+def test_partial_refresh_is_not_fresh(snapshot):
+    def second_page_fails(page):
+        if page == 2:
+            raise ConnectionError("timeout")
+        return RECORDS[:3]
+
+    snapshot.max_age = None  # refreshed only by the test
+    fetch_page = snapshot._fetch_page
+    snapshot._fetch_page = second_page_fails
+    snapshot.refresh(block=True)
+    assert len(snapshot.frame()) == 3 and snapshot.updated == 0
+
+    snapshot._fetch_page = fetch_page
+    snapshot.refresh(block=True)
+    assert len(snapshot.frame()) == 5 and snapshot.updated > 0
+
+    snapshot._fetch_page = second_page_fails
+    snapshot.refresh(block=True)
+    assert len(snapshot.frame()) == 5  # complete one is kept
+
+
+def test_overview_views_use_snapshot(snapshot):
+    snapshot.refresh(block=True)
+    with mock.patch.object(gecko, "get_markets", return_value=snapshot):
+        overview = gecko.Overview()
+        df = overview.get_top_gainers(n=2)
+        assert list(df.columns) == [
+            "symbol",
+            "name",
+            "volume",
+            "price",
+            "change_1h",
+            "url",
+        ]
+        assert list(df.symbol) == ["c1", "c5"]
+        assert df.url[0] == "https://www.coingecko.com/en/coins/coin-1"
+        assert list(overview.get_top_volume_coins(n=1).name) == ["Coin 1"]
+        assert overview.get_coins_near_ath(n=1).name[0] == "Coin 2"
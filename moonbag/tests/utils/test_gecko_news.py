@@ -0,0 +1,79 @@
+import pytest
+from requests.exceptions import ConnectionError
+from moonbag.gecko.news import NewsCache, PAGE_SIZE, posted_at, posted_ago
+
+
+class FakeSite:
+    def __init__(self, total):
+        self.articles = [{"url": f"/news/{i}"} for i in range(total, 0, -1)]
+        self.requested = []
+        self.offline = False
+
+    def publish(self, count):
+        newest = len(self.articles)
+        self.articles[:0] = [
+            {"url": f"/news/{i}"} for i in range(newest + count, newest, -1)
+        ]
+
+    def fetch_pages(self, pages):
+        if self.offline:
+            raise ConnectionError("offline")
+        self.requested += pages
+        return [
+            self.articles[(p - 1) * PAGE_SIZE : p * PAGE_SIZE]
+            for p in pages
+            if (p - 1) * PAGE_SIZE < len(self.articles)
+        ]
+
+
+@pytest.fixture
+def news(tmp_path):
+    return NewsCache(path=str(tmp_path / "news.json"))
+
+
+def test_first_run_fetches_needed_pages(news):
+    site = FakeSite(200)
+    articles = news.latest(60, site.fetch_pages)
+    assert [a["url"] for a in articles[:2]] == ["/news/200", "/news/199"]
+    assert len(articles) == 60
+    assert site.requested == [1, 2, 3]
+
+
+def test_refresh_fetches_only_new_pages(news, tmp_path):
+    site = FakeSite(200)
+    news.latest(75, site.fetch_pages)
+    site.publish(30)
+    site.requested = []
+    articles = news.latest(75, site.fetch_pages)
+    assert site.requested == [1, 2]
+    assert [a["url"] for a in articles[:2]] == ["/news/230", "/news/229"]
+    assert len({a["url"] for a in articles}) == 75
+
+    # older pages are only fetched when more articles are asked for than known
+    site.requested = []
+    assert len(news.latest(150, site.fetch_pages)) == 150
+    assert site.requested[0] == 1 and min(site.requested[1:]) >= 5
+
+    reopened = NewsCache(path=news.path)
+    site.offline = True
+    assert len(reopened.latest(100, site.fetch_pages)) == 100
+
+
+def test_known_articles_without_overlap_are_dropped(news):
+    site = FakeSite(100)
+    news.latest(25, site.fetch_pages)
+    site.publish(400)
+    articles = news.latest(300, site.fetch_pages)
+    assert [a["url"] for a in articles] == [a["url"] for a in site.articles[:300]]
+
+
+def test_posted_time_is_stored_and_age_rendered():
+    now = 1_700_000_000
+    assert posted_at("about 3 hours ago", now) == now - 3 * 3600
+    assert posted_at("a day ago", now) == now - 86400
+    assert posted_at("less than a minute ago", now) == now
+    assert posted_at("Jan 3", now) == "Jan 3"
+    # age is counted from the stored time, not from when page was scraped
+    assert posted_ago(now - 3 * 3600, now + 2 * 86400) == "2 days ago"
+    assert posted_ago(now - 3600, now) == "1 hour ago"
+    assert posted_ago("3 hours ago", now) == "3 hours ago"
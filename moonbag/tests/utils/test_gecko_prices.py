@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from requests.exceptions import ConnectionError
+from moonbag.gecko.prices import URL, PriceService, chunk_ids
+
+IDS = [f"coin-number-{i}" for i in range(3000)]
+
+
+def test_chunks_keep_urls_short():
+    chunks = chunk_ids(IDS, ["usd", "btc"], max_length=2000)
+    assert [i for chunk in chunks for i in chunk] == IDS
+    for chunk in chunks:
+        url = URL + "%2C".join(chunk) + "usd%2Cbtc"
+        assert len(url) <= 2000
+    assert chunk_ids([], ["usd"]) == []
+
+
+class FakePrices(PriceService):
+    def __init__(self, fail=()):
+        super().__init__()
+        self.requested = []
+        self.fail = fail
+
+    def _fetch_chunk(self, ids, vs_currencies):
+        self.requested.append(list(ids))
+        if any(i in self.fail for i in ids):
+            raise ConnectionError("chunk failed")
+        return {
+            i: {c: float(i.split("-")[-1]) for c in vs_currencies}
+            for i in ids
+            if i != "unknown"
+        }
+
+
+def test_matrix_is_batched_and_cached():
+    service = FakePrices()
+    df = service.matrix(IDS + ["unknown"], ["usd", "eur"])
+    assert df.shape == (3001, 2) and df.dtypes.unique() == [np.float64]
+    assert df.loc["coin-number-7", "eur"] == 7
+    assert np.isnan(df.loc["unknown", "usd"])
+    assert len(service.requested) > 1
+    assert sum(map(len, service.requested)) == 3001
+
+    service.requested = []
+    assert service.price("coin-number-42", "usd") == 42
+    assert service.price("unknown") is None
+    assert service.requested == []
+
+
+def test_failed_chunks_are_missing():
+    service = FakePrices(fail={"coin-number-0"})
+    df = service.matrix(IDS, ["usd"])
+    assert np.isnan(df.loc["coin-number-0", "usd"])
+    assert df.loc["coin-number-2999", "usd"] == 2999
+    with pytest.raises(ConnectionError):
+        FakePrices(fail=set(IDS)).matrix(IDS[:5])
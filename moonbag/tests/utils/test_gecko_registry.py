@@ -0,0 +1,51 @@
+import json
+import pytest
+from moonbag.gecko.registry import CoinRegistry
+
+COINS = [
+    {
+        "id": "uniswap",
+        "symbol": "uni",
+        "name": "Uniswap",
+        "platforms": {"ethereum": "0x1"},
+    },
+    {"id": "unicorn-token", "symbol": "uni", "name": "UNICORN Token", "platforms": {}},
+    {"id": "ethereum", "symbol": "eth", "name": "Ethereum", "platforms": {}},
+]
+
+
+@pytest.fixture
+def registry(tmp_path):
+    seed = tmp_path / "seed.json"
+    seed.write_text(json.dumps(COINS))
+    return CoinRegistry(
+        path=str(tmp_path / "snapshot.json"), seed=str(seed), max_age=None
+    )
+
+
+def test_resolve_by_id_symbol_and_name(registry):
+    assert len(registry) == 3
+    assert registry.resolve("ethereum") == "ethereum"
+    assert registry.resolve("ETH") == "ethereum"
+    assert registry.resolve("Uniswap") == "uniswap"
+    with pytest.raises(ValueError):
+        registry.resolve("not-a-coin")
+
+
+def test_ambiguous_symbol(registry):
+    assert registry.candidates("uni") == ["uniswap", "unicorn-token"]
+    assert registry.resolve("uni") == "uniswap"
+    assert registry.resolve("unicorn-token") == "unicorn-token"
+
+
+def test_refresh_writes_snapshot(registry, tmp_path):
+    registry._fetch = lambda: COINS[:1]
+    registry.refresh(block=True)
+    assert registry.ids() == ["uniswap"]
+    fresh = CoinRegistry(path=registry.path, seed=None, max_age=None)
+    assert fresh.ids() == ["uniswap"] and fresh.updated > 0
+
+
+def test_similar(registry):
+    assert registry.similar("uniswp")[0] == "uniswap"
+    assert registry.similar("etherium", limit=1) == ["ethereum"]
@@ -0,0 +1,144 @@
+from unittest import mock
+from bs4 import BeautifulSoup
+from moonbag.gecko import gecko
+import cachetools
+import pandas as pd
+from moonbag.gecko import scraper
+from moonbag.gecko.scraper import clear_views, parse_table, table_region, views_size
+
+PAGE = """<html><head><script>var rows = "<tbody>";</script></head><body>
+<table><tbody>
+<tr><td>1</td>
+<td><a href="/en/categories/defi">Decentralized Finance</a></td>
+<td>1.2%</td>
+<td>-0.5%</td>
+<td>7.1%</td>
+<td>$1,234</td>
+<td>$98</td>
+<td>120</td></tr>
+<tr><td>2<!-- note --></td>
+<td><a href="/en/categories/nft">NFT</a><script>x=1</script></td>
+<td>2.2%</td>
+<td>0.5%</td>
+<td>-7.1%</td>
+<td>$4,321</td>
+<td>$89</td>
+<td>20</td></tr>
+</tbody></table>
+<table><tbody><tr><td><a href="/second">Second</a></td></tr></tbody></table>
+</body></html>"""
+
+
+def test_table_region():
+    assert table_region(PAGE, 1) == (
+        '<tbody><tr><td><a href="/second">Second</a></td></tr></tbody>'
+    )
+    assert table_region(PAGE, 2) is None
+    assert table_region("<tbody><tr><td>open") == "<tbody><tr><td>open"
+
+
+def test_parse_table_matches_soup():
+    table = parse_table(PAGE)
+    rows = BeautifulSoup(PAGE, features="lxml").find("tbody").find_all("tr")
+    assert table.texts == [r.text for r in rows]
+    assert table.links == ["/en/categories/defi", "/en/categories/nft"]
+    assert [row.link for row in parse_table(PAGE, 1)] == ["/second"]
+    assert len(parse_table("<html></html>")) == 0
+
+
+def test_view_from_table():
+    clear_views()
+    with mock.patch.object(gecko.transport, "get", return_value=mock.Mock(text=PAGE)):
+        df = gecko.Overview().get_top_crypto_categories()
+    assert list(df["name"]) == ["Decentralized Finance", "NFT"]
+    assert df.loc["2", "url"] == "https://www.coingecko.com/en/categories/nft"
+
+
+def test_view_is_cached_with_any_n():
+    clear_views()
+    response = mock.Mock(text=PAGE)
+    with mock.patch.object(gecko.transport, "get", return_value=response) as get:
+        overview = gecko.Overview()
+        df = overview.get_top_crypto_categories()
+        df["name"] = "changed"
+        assert len(overview.get_top_crypto_categories(n=1)) == 1
+        assert list(overview.get_top_crypto_categories()["name"]) == [
+            "Decentralized Finance",
+            "NFT",
+        ]
+    assert get.call_count == 1
+    assert views_size() > 0
+
+
+def test_positional_and_keyword_calls_share_view():
+    clear_views()
+    response = mock.Mock(text=PAGE)
+    with mock.patch.object(gecko.transport, "get", return_value=response) as get:
+        overview = gecko.Overview()
+        assert len(overview.get_top_crypto_categories(1)) == 1
+        assert len(overview.get_top_crypto_categories(n=1)) == 1
+    assert get.call_count == 1
+
+    calls = []
+
+    @scraper.cached_view
+    def view(self, category="trending", n=None):
+        calls.append((category, n))
+        return pd.DataFrame({"x": range(3)})
+
+    assert len(view(None, "trending", 2)) == 2
+    assert len(view(None, category="trending", n=2)) == 2
+    assert len(view(None, n=1)) == 1
+    assert calls == [("trending", 2)]
+
+
+def test_view_cache_is_bounded_by_size():
+    view = scraper.cached_view(lambda self, i: pd.DataFrame({"x": range(1000 * i)}))
+    clear_views()
+    small = cachetools.TTLCache(100_000, ttl=60, getsizeof=scraper._entry_size)
+    with mock.patch.object(scraper, "_views", small):
+        for i in range(1, 10):
+            view(None, i)
+        assert views_size() <= 100_000
+
+
+def test_limit_cuts_rows_before_parsing():
+    region = table_region(PAGE, limit=1)
+    assert region.count("<tr>") == 1 and "NFT" not in region
+    assert len(parse_table(PAGE, limit=1)) == 1
+    assert len(parse_table(PAGE, limit=5)) == 2
+    assert (
+        table_region(PAGE, 1, limit=5)
+        == '<tbody><tr><td><a href="/second">Second</a></td></tr>'
+    )
+
+
+def test_view_parses_more_rows_only_when_needed():
+    clear_views()
+    with mock.patch.object(
+        gecko.Overview, "gecko_table", wraps=gecko.Overview.gecko_table
+    ) as table, mock.patch.object(
+        gecko.transport, "get", return_value=mock.Mock(text=PAGE)
+    ):
+        overview = gecko.Overview()
+        assert len(overview.get_top_crypto_categories(n=1)) == 1
+        assert len(overview.get_top_crypto_categories(n=1)) == 1
+        assert len(overview.get_top_crypto_categories(n=5)) == 2
+        assert len(overview.get_top_crypto_categories(n=2)) == 2
+        assert len(overview.get_top_crypto_categories()) == 2
+    assert [c.kwargs["limit"] for c in table.call_args_list] == [1, 5]
+
+
+def test_positional_n_limits_parsed_rows():
+    clear_views()
+    with mock.patch.object(
+        gecko.Overview, "gecko_table", wraps=gecko.Overview.gecko_table
+    ) as table, mock.patch.object(
+        gecko.transport, "get", return_value=mock.Mock(text=PAGE)
+    ):
+        overview = gecko.Overview()
+        assert len(overview.get_top_crypto_categories(1)) == 1
+        assert len(overview.get_top_crypto_categories(1)) == 1
+        assert len(overview.get_top_crypto_categories(5)) == 2
+        assert len(overview.get_top_crypto_categories()) == 2
+    assert [c.kwargs["limit"] for c in table.call_args_list] == [1, 5]
@@ -0,0 +1,74 @@
+import json
+import pytest
+from moonbag.common.identity import IdentityMap
+from moonbag.gecko.registry import CoinRegistry
+
+GECKO = [
+    {"id": "ethereum", "symbol": "eth", "name": "Ethereum", "platforms": {}},
+    {
+        "id": "uniswap",
+        "symbol": "uni",
+        "name": "Uniswap",
+        "platforms": {"ethereum": "0x1f9840a85d5af5bf1d1762f925bdaddc4201f984"},
+    },
+    {"id": "unicorn-token", "symbol": "uni", "name": "UNICORN Token", "platforms": {}},
+]
+PAPRIKA = [
+    {"id": "eth-ethereum", "symbol": "ETH", "name": "Ethereum", "is_active": True},
+    {"id": "uni-uniswap", "symbol": "UNI", "name": "Uniswap", "is_active": True},
+    {"id": "uni-unknown", "symbol": "UNI", "name": "Unknown", "is_active": True},
+]
+CRYPTOCOMPARE = {
+    "ETH": {"Id": "7605", "Symbol": "ETH", "FullName": "Ethereum (ETH)"},
+    "UNI": {
+        "Id": "935705",
+        "Symbol": "UNI",
+        "FullName": "Uniswap Protocol Token (UNI)",
+    },
+}
+
+
+@pytest.fixture
+def identity(tmp_path):
+    seed = tmp_path / "seed.json"
+    seed.write_text(json.dumps(GECKO))
+    registry = CoinRegistry(
+        path=str(tmp_path / "coins.json"), seed=str(seed), max_age=None
+    )
+    identity = IdentityMap(
+        path=str(tmp_path / "ids.json"), max_age=None, registry=registry
+    )
+    identity._fetch = lambda: (PAPRIKA, CRYPTOCOMPARE)
+    identity.refresh(block=True)
+    return identity
+
+
+def test_build_matches_by_symbol_and_name(identity):
+    assert identity.ids("ethereum") == {
+        "gecko": "ethereum",
+        "symbol": "eth",
+        "name": "Ethereum",
+        "paprika": "eth-ethereum",
+        "cc_symbol": "ETH",
+        "cc_id": 7605,
+        "platforms": {},
+    }
+    assert identity.paprika_id("uniswap") == "uni-uniswap"
+    # ambiguous symbol with name that doesn't match any gecko coin
+    assert identity.cryptocompare_id("uniswap") is None
+
+
+def test_any_identifier_resolves(identity):
+    address = "0x1f9840a85d5af5bf1d1762f925bdaddc4201f984"
+    for query in ["ethereum", "ETH", "eth-ethereum", "7605"]:
+        assert identity.gecko_id(query) == "ethereum"
+    assert identity.gecko_id(address.upper().replace("0X", "0x")) == "uniswap"
+    assert identity.contract("uni-uniswap") == address
+    assert identity.cryptocompare_symbol("eth-ethereum") == "ETH"
+    assert identity.cryptocompare_symbol("uni") == "UNI"
+    assert identity.paprika_id("not-a-coin") is None
+
+
+def test_map_is_persisted(identity):
+    fresh = IdentityMap(path=identity.path, max_age=None, registry=identity.registry)
+    assert fresh.paprika_id("eth") == "eth-ethereum"
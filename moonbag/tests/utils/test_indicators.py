@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from moonbag.common import indicators
+
+
+@pytest.fixture
+def candles():
+    rng = np.random.default_rng(7)
+    close = 30_000 * np.exp(rng.normal(0, 0.01, 5000).cumsum())
+    return pd.DataFrame(
+        {
+            "open": close * (1 + rng.normal(0, 0.002, 5000)),
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+        }
+    )
+
+
+def test_moving_averages_match_pandas(candles):
+    close = candles["close"]
+    np.testing.assert_allclose(
+        indicators.sma(close, 20), close.rolling(20).mean(), rtol=1e-9
+    )
+    np.testing.assert_allclose(
+        indicators.ema(close, 20), close.ewm(span=20, adjust=False).mean()
+    )
+    middle, upper, lower = indicators.bollinger(close, 20, 2)
+    np.testing.assert_allclose(upper - middle, 2 * close.rolling(20).std(ddof=0))
+    assert np.isnan(middle[:19]).all() and not np.isnan(middle[19:]).any()
+
+
+def test_moving_averages_recover_after_nan():
+    close = pd.Series(np.arange(100.0))
+    close[10] = np.nan
+    expected = close.rolling(20).mean()
+    np.testing.assert_allclose(indicators.sma(close, 20), expected, rtol=1e-9)
+    assert np.isnan(indicators.sma(close, 20)[10:30]).all()
+    assert not np.isnan(indicators.sma(close, 20)[30:]).any()
+    middle, upper, _ = indicators.bollinger(close, 20)
+    np.testing.assert_allclose(middle, expected, rtol=1e-9)
+    assert not np.isnan(upper[30:]).any()
+
+
+def test_volatility_is_nan_around_missing_close():
+    close = pd.Series(np.exp(np.sin(np.arange(100.0))))
+    close[50] = np.nan
+    returns = np.log(close).diff()
+    expected = returns.rolling(30).std(ddof=0) * np.sqrt(365)
+    out = indicators.volatility(close, 30, 365)
+    np.testing.assert_allclose(out, expected, rtol=1e-9)
+    # 30 leading, then 31 windows with one of the two returns next to missing close
+    assert np.isnan(out).sum() == 61 and not np.isnan(out[81:]).any()
+
+
+def test_rsi():
+    rising = np.arange(1.0, 50.0)
+    assert indicators.rsi(rising)[-1] == 100
+    assert indicators.rsi(rising[::-1])[-1] == 0
+    zigzag = np.tile([1.0, 2.0], 50)
+    assert indicators.rsi(zigzag)[-1] == pytest.approx(50, abs=5)
+    assert np.isnan(indicators.rsi(rising)[:14]).all()
+
+
+def test_macd_and_atr(candles):
+    line, signal, hist = indicators.macd(candles["close"])
+    np.testing.assert_allclose(hist, line - signal)
+    tr = indicators.true_range([3.0, 4.0], [1.0, 3.5], [2.0, 3.8])
+    assert list(tr) == [2.0, 2.0]
+    atr = indicators.atr(candles["high"], candles["low"], candles["close"])
+    assert np.isnan(atr[:13]).all() and (atr[13:] > 0).all()
+
+
+def test_volatility_and_frame(candles):
+    vol = indicators.volatility(candles["close"], 30, periods_per_year=365)
+    assert vol[-1] == pytest.approx(0.01 * np.sqrt(365), rel=0.3)
+    df = indicators.add_indicators(candles)
+    assert {"rsi_14", "macd", "bb_upper", "atr_14", "volatility"} <= set(df.columns)
+    assert len(df) == len(candles)
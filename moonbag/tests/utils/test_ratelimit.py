@@ -0,0 +1,36 @@
+from moonbag.common.ratelimit import TokenBucket, retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_burst_and_queue():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=lambda s: None)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    # callers after burst are queued one after another
+    assert [bucket.reserve() for _ in range(3)] == [0.5, 1.0, 1.5]
+    clock.now = 10
+    assert bucket.tokens == 3
+
+
+def test_token_bucket_pause():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, burst=5, clock=clock, sleep=lambda s: None)
+    bucket.pause(4)
+    assert bucket.reserve() == 5
+    clock.now = 4
+    assert bucket.reserve() == 2
+
+
+def test_retry_after_headers():
+    assert retry_after({"Retry-After": "7"}) == 7
+    assert retry_after({}) is None
+    assert retry_after({"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": "9"}) is None
+    assert retry_after({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "9"}) == 9
+    assert retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0
@@ -0,0 +1,75 @@
+import time
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from moonbag.common import retries
+from moonbag.common.retries import RetryPolicy, DeadlineExceeded, deadline
+from moonbag.common.transport import MoonSession
+
+
+class FakeAdapter(BaseAdapter):
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.timeouts = []
+
+    def send(self, request, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response.url = request.url
+        response.request = request
+        response._content = b"{}"
+        return response
+
+    def close(self):
+        pass
+
+
+def make_session(statuses):
+    session = MoonSession(hosts={})
+    session.retry_policy = RetryPolicy(tries=3, base_delay=0.01, jitter=False)
+    adapter = FakeAdapter(statuses)
+    session.mount("http://fake/", adapter)
+    return session, adapter
+
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(base_delay=1, max_delay=5, jitter=False)
+    assert [policy.backoff(i) for i in range(5)] == [1, 2, 4, 5, 5]
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+    assert all(0 <= policy.backoff(i) <= 5 for i in range(10))
+
+
+def test_deadline_nesting_and_clamp():
+    assert retries.remaining() is None
+    assert retries.clamp_timeout((5, 30)) == (5, 30)
+    with deadline(10):
+        with deadline(60):
+            assert retries.remaining() <= 10
+        assert retries.clamp_timeout((5, 30))[1] <= 10
+    with deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            retries.clamp_timeout(5)
+
+
+def test_retryable_status_is_repeated():
+    session, adapter = make_session([503, 502, 200])
+    assert session.get("http://fake/x").status_code == 200
+    assert adapter.statuses == []
+
+
+def test_not_retryable_status_is_returned():
+    session, adapter = make_session([404, 200])
+    assert session.get("http://fake/x").status_code == 404
+    assert adapter.statuses == [200]
+
+
+def test_deadline_stops_retries():
+    session, adapter = make_session([503, 200])
+    session.retry_policy = RetryPolicy(tries=3, base_delay=10, jitter=False)
+    start = time.monotonic()
+    with deadline(1):
+        assert session.get("http://fake/x").status_code == 503
+        assert adapter.timeouts[0][1] <= 1
+    assert time.monotonic() - start < 1
@@ -0,0 +1,48 @@
+import threading
+import time
+from moonbag.common import aio
+from moonbag.common.singleflight import SingleFlight, coalesce
+
+
+def test_concurrent_calls_share_result():
+    calls = []
+
+    @coalesce
+    def slow(x):
+        calls.append(x)
+        time.sleep(0.2)
+        return {"x": x}
+
+    results = aio.fan_out(slow, [1, 1, 1, 2])
+    assert results == [{"x": 1}, {"x": 1}, {"x": 1}, {"x": 2}]
+    assert sorted(calls) == [1, 2]
+    # every caller gets own copy
+    assert results[0] is not results[1]
+    assert slow.flights.in_flight() == 0
+
+
+def test_error_is_shared_and_not_remembered():
+    flights = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    def call():
+        try:
+            flights.do("k", fail)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2 and errors[0] is errors[1]
+    assert flights.do("k", lambda: 1) == 1
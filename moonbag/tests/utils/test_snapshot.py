@@ -0,0 +1,97 @@
+import threading
+import time
+import pandas as pd
+from moonbag.common.snapshot import Snapshot
+from moonbag.gecko.exchanges import fetch_all_pages
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return pd.DataFrame({"value": [self.calls]})
+
+
+def test_snapshot_fetches_once_and_persists(tmp_path):
+    fetch = Counter()
+    path = str(tmp_path / "snap.pkl")
+    snapshot = Snapshot("test", fetch=fetch, path=path)
+    assert snapshot.frame()["value"][0] == 1
+    assert snapshot.frame()["value"][0] == 1
+    assert fetch.calls == 1
+    assert snapshot.as_of().startswith("as of 20")
+
+    # new session reads snapshot from disk
+    other = Snapshot("test", fetch=fetch, path=path)
+    assert other.frame()["value"][0] == 1
+    assert fetch.calls == 1
+
+
+def test_stale_snapshot_is_served_and_refreshed_in_background(tmp_path):
+    fetch = Counter()
+    snapshot = Snapshot("test", fetch=fetch, path=str(tmp_path / "snap.pkl"))
+    snapshot.frame()
+    snapshot.updated = time.time() - 3600
+    assert snapshot.stale
+    assert snapshot.frame()["value"][0] == 1  # old one, without waiting
+    snapshot._refreshing.join()  # refresh started by frame()
+    assert snapshot.frame()["value"][0] == 2
+    assert not snapshot.stale
+
+
+def test_failed_refresh_keeps_snapshot(tmp_path):
+    snapshot = Snapshot("test", fetch=Counter(), path=str(tmp_path / "snap.pkl"))
+    snapshot.frame()
+
+    def fail():
+        raise ConnectionError("offline")
+
+    snapshot._fetch_func = fail
+    snapshot.refresh(block=True)
+    assert snapshot.frame()["value"][0] == 1
+
+
+def test_partial_initial_frame(tmp_path):
+    released = threading.Event()
+
+    class Partial(Snapshot):
+        def _fetch(self):
+            released.wait(5)
+            return pd.DataFrame({"value": [1, 2, 3]})
+
+        def _fetch_initial(self):
+            return pd.DataFrame({"value": [1]}), 0
+
+    snapshot = Partial("test", path=str(tmp_path / "snap.pkl"))
+    assert len(snapshot.frame()) == 1
+    assert "partial" in snapshot.as_of()
+    released.set()
+    snapshot.refresh(block=True)
+    assert len(snapshot.frame()) == 3
+
+
+def test_fetch_all_pages_stops_at_short_page():
+    requested = []
+
+    def fetch_page(page):
+        requested.append(page)
+        return [page] * (3 if page < 6 else 1) if page <= 6 else []
+
+    records = fetch_all_pages(fetch_page, per_page=3, batch=4)
+    assert sorted(requested) == list(range(1, 9))
+    assert records == [1] * 3 + [2] * 3 + [3] * 3 + [4] * 3 + [5] * 3 + [6]
+
+
+def test_schedule_can_be_stopped(tmp_path):
+    fetch = Counter()
+    snapshot = Snapshot("test", fetch=fetch, max_age=0, path=str(tmp_path / "s.pkl"))
+    snapshot.schedule(interval=0.01)
+    time.sleep(0.1)
+    snapshot.stop()
+    time.sleep(0.05)
+    calls = fetch.calls
+    assert calls > 1
+    time.sleep(0.1)
+    assert fetch.calls == calls